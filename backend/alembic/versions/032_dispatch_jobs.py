@@ -0,0 +1,56 @@
+"""Add dispatch_jobs table (background notification dispatch queue)
+
+Push yayını, deprem bildirim taraması ve geofence alarmları HTTP isteği
+yerine bu tablodan iş çeken worker tarafından yürütülür.
+
+Revision ID: 032_dispatch_jobs
+Revises: 031_missing_persons
+Create Date: 2026-06-08 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "032_dispatch_jobs"
+down_revision = "031_missing_persons"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "dispatch_jobs" in set(inspector.get_table_names()):
+        return
+
+    op.create_table(
+        "dispatch_jobs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("kind", sa.String(length=50), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="queued"),
+        sa.Column("payload", sa.JSON(), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="3"),
+        sa.Column("progress_done", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("progress_total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("run_after", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.Column("created_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.Column("started_at", sa.DateTime(), nullable=True),
+        sa.Column("finished_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+    )
+    op.create_index("ix_dispatch_jobs_status", "dispatch_jobs", ["status"])
+    op.create_index("ix_dispatch_jobs_status_run_after", "dispatch_jobs", ["status", "run_after"])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "dispatch_jobs" in set(inspector.get_table_names()):
+        op.drop_index("ix_dispatch_jobs_status_run_after", "dispatch_jobs")
+        op.drop_index("ix_dispatch_jobs_status", "dispatch_jobs")
+        op.drop_table("dispatch_jobs")
@@ -0,0 +1,103 @@
+"""Add hot-path composite, covering and geography GIST indexes
+
+Admin keyset listeleri (created_at, id), durum filtreleri, ısı haritası ve KPI
+sayımları ile spatial.py'deki ST_DWithin/ST_Distance ifadeleri için indeksler.
+Tüm indeksler CREATE INDEX CONCURRENTLY ile (yazmaları kilitlemeden) kurulur;
+yeni bir indeksin ön eki olan eski tek kolonlu indeksler kaldırılır.
+
+Revision ID: 033_hot_path_indexes
+Revises: 032_dispatch_jobs
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from sqlalchemy import text
+
+from alembic import op
+
+revision = "033_hot_path_indexes"
+down_revision = "032_dispatch_jobs"
+branch_labels = None
+depends_on = None
+
+# spatial.py konumları metin kolonlara da dayanıklı olsun diye geometry → geography
+# CAST zinciriyle sorgular; indeks ifadesi bu zincirle birebir aynı olmalı.
+_GEOG = "((location::geometry(POINT,4326))::geography(POINT,4326))"
+
+# (indeks adı, tablo, tanım)
+_INDEXES = [
+    # Admin listesi keyset + ısı haritası (created_at >= since) — satıra gitmeden
+    ("ix_emergency_reports_created_at_id", "emergency_reports",
+     "(created_at, id) INCLUDE (status, enlem, boylam)"),
+    # Durum filtreli admin listesi + KPI durum sayımları
+    ("ix_emergency_reports_status_created_at_id", "emergency_reports", "(status, created_at, id)"),
+    ("ix_safe_checkins_created_at_latlon", "safe_checkins", "(created_at) INCLUDE (lat, lon)"),
+    ("ix_inventory_movements_timestamp_id", "inventory_movements", '("timestamp", id)'),
+    ("ix_audit_logs_created_at_id", "audit_logs", "(created_at, id)"),
+    ("ix_audit_logs_resource_type_created_at_id", "audit_logs", "(resource_type, created_at, id)"),
+    ("ix_volunteer_tasks_created_at_id", "volunteer_tasks", "(created_at, id)"),
+    ("ix_volunteer_tasks_status_created_at_id", "volunteer_tasks", "(status, created_at, id)"),
+    ("ix_volunteer_applications_created_at_id", "volunteer_applications", "(created_at, id)"),
+    ("ix_volunteer_applications_status_created_at_id", "volunteer_applications",
+     "(status, created_at, id)"),
+    ("ix_shelter_offers_created_at_id", "shelter_offers", "(created_at, id)"),
+    ("ix_announcements_created_at_id", "announcements", "(created_at, id)"),
+    ("ix_zone_needs_status_created_at", "zone_needs", "(status, created_at)"),
+    ("ix_zone_needs_safe_zone_id_status", "zone_needs", "(safe_zone_id, status)"),
+    ("ix_missing_persons_status_created_at", "missing_persons", "(status, created_at)"),
+    ("ix_warehouses_location_geog", "warehouses", f"USING GIST {_GEOG}"),
+    ("ix_safe_zones_location_geog", "safe_zones", f"USING GIST {_GEOG}"),
+]
+
+# Yukarıdaki bir indeksin ön eki olan (artık gereksiz) indeksler; downgrade geri kurar
+_SUPERSEDED = [
+    ("ix_safe_checkins_created_at", "safe_checkins", "(created_at)"),
+    ("ix_audit_logs_created_at", "audit_logs", "(created_at)"),
+    ("ix_volunteer_tasks_status", "volunteer_tasks", "(status)"),
+    ("ix_zone_needs_status", "zone_needs", "(status)"),
+    ("ix_zone_needs_safe_zone_id", "zone_needs", "(safe_zone_id)"),
+    ("ix_missing_persons_status", "missing_persons", "(status)"),
+]
+
+
+def _existing_tables() -> set[str]:
+    rows = op.get_bind().execute(
+        text("SELECT tablename FROM pg_tables WHERE schemaname = current_schema()")
+    )
+    return {r[0] for r in rows}
+
+
+def _create(name: str, table: str, definition: str) -> None:
+    # Yarıda kalmış bir CONCURRENTLY kurulumu INVALID indeks bırakır; IF NOT EXISTS
+    # onu "var" sayardı, bu yüzden önce temizlenir.
+    invalid = op.get_bind().execute(
+        text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).first()
+    if invalid:
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+    op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} {definition}")
+
+
+def upgrade() -> None:
+    tables = _existing_tables()
+    # CONCURRENTLY bir transaction bloğu içinde çalışamaz
+    with op.get_context().autocommit_block():
+        for name, table, definition in _INDEXES:
+            if table in tables:
+                _create(name, table, definition)
+        for name, table, _definition in _SUPERSEDED:
+            if table in tables:
+                op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
+
+
+def downgrade() -> None:
+    tables = _existing_tables()
+    with op.get_context().autocommit_block():
+        for name, table, definition in _SUPERSEDED:
+            if table in tables:
+                _create(name, table, definition)
+        for name, _table, _definition in reversed(_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
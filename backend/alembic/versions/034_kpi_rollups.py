@@ -0,0 +1,65 @@
+"""Add kpi_rollups / kpi_rollup_watermarks tables (bucketed KPI time series)
+
+Dakika/saat/gün kovalarına toplanmış KPI sayaçları; app/core/kpi_rollup.py
+tarafından artımlı güncellenir, GET /kpi/timeseries yalnızca bu tablodan okur.
+Görev tamamlama serisi için volunteer_tasks(updated_at) WHERE status='done'
+kısmi indeksi de eklenir (CONCURRENTLY, yazmaları kilitlemeden).
+
+Revision ID: 034_kpi_rollups
+Revises: 033_hot_path_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "034_kpi_rollups"
+down_revision = "033_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+_TASKS_DONE_INDEX = "ix_volunteer_tasks_done_updated_at"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = set(inspect(bind).get_table_names())
+
+    if "kpi_rollups" not in tables:
+        op.create_table(
+            "kpi_rollups",
+            sa.Column("metric", sa.String(length=50), nullable=False),
+            sa.Column("bucket", sa.String(length=10), nullable=False),
+            sa.Column("bucket_start", sa.DateTime(), nullable=False),
+            sa.Column("dimension", sa.String(length=100), nullable=False, server_default=""),
+            sa.Column("count", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.Column("amount", sa.BigInteger(), nullable=False, server_default="0"),
+            sa.PrimaryKeyConstraint("metric", "bucket", "bucket_start", "dimension"),
+        )
+    if "kpi_rollup_watermarks" not in tables:
+        op.create_table(
+            "kpi_rollup_watermarks",
+            sa.Column("metric", sa.String(length=50), primary_key=True),
+            sa.Column("rolled_until", sa.DateTime(), nullable=False),
+        )
+
+    if "volunteer_tasks" in tables:
+        with op.get_context().autocommit_block():
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_TASKS_DONE_INDEX} "
+                "ON volunteer_tasks (updated_at) WHERE status = 'done'"
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_TASKS_DONE_INDEX}")
+
+    bind = op.get_bind()
+    tables = set(inspect(bind).get_table_names())
+    if "kpi_rollup_watermarks" in tables:
+        op.drop_table("kpi_rollup_watermarks")
+    if "kpi_rollups" in tables:
+        op.drop_table("kpi_rollups")
@@ -0,0 +1,56 @@
+"""Add emergency_reports_archive table (bulk archive target)
+
+Toplu temizlik işi (emergency_purge) raporları silmek yerine bu tabloya
+taşıyabilir: DELETE … RETURNING ile aynı ifadede INSERT … SELECT.
+Kolonlar emergency_reports ile birebir aynı, ek olarak archived_at.
+
+Revision ID: 035_emergency_reports_archive
+Revises: 034_kpi_rollups
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "035_emergency_reports_archive"
+down_revision = "034_kpi_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "emergency_reports_archive" in set(inspector.get_table_names()):
+        return
+
+    op.create_table(
+        "emergency_reports_archive",
+        # Orijinal id korunur (sequence yok); arşivden geri yüklemede çakışmaz
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("durum", sa.String(), nullable=False),
+        sa.Column("saat", sa.String(), nullable=False),
+        sa.Column("harita_link", sa.String(), nullable=True),
+        sa.Column("enlem", sa.Float(), nullable=False),
+        sa.Column("boylam", sa.Float(), nullable=False),
+        sa.Column("kategori", sa.String(length=100), nullable=True),
+        sa.Column("aciklama", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=50), nullable=False),
+        sa.Column("image_url", sa.String(length=500), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_emergency_reports_archive_archived_at", "emergency_reports_archive", ["archived_at"]
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "emergency_reports_archive" in set(inspector.get_table_names()):
+        op.drop_index("ix_emergency_reports_archive_archived_at", "emergency_reports_archive")
+        op.drop_table("emergency_reports_archive")
@@ -0,0 +1,29 @@
+"""Index geofence_subscriptions.updated_at (grid index incremental refresh)
+
+app/core/geofence_index her eşleştirmeden önce son işaretten sonra değişen
+abonelikleri okur; bu aralık sorgusu tabloyu taramasın. CONCURRENTLY ile
+(yazmaları kilitlemeden) kurulur.
+
+Revision ID: 036_geofence_updated_at_index
+Revises: 035_emergency_reports_archive
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "036_geofence_updated_at_index"
+down_revision = "035_emergency_reports_archive"
+branch_labels = None
+depends_on = None
+
+_INDEX = "ix_geofence_subscriptions_updated_at"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {_INDEX} ON geofence_subscriptions (updated_at)")
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {_INDEX}")
@@ -0,0 +1,43 @@
+"""Add earthquake_poller_state table (shared feed high-water mark)
+
+Deprem feed yoklayıcısının yüksek su işareti ve geç gelme penceresindeki
+anahtarlar süreç belleği yerine burada tutulur; advisory kilidi alan her
+worker aynı durumu okuyup günceller. Tek satırlık tablo (id = 1).
+
+Revision ID: 037_earthquake_poller_state
+Revises: 036_geofence_updated_at_index
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "037_earthquake_poller_state"
+down_revision = "036_geofence_updated_at_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "earthquake_poller_state" in set(inspector.get_table_names()):
+        return
+
+    op.create_table(
+        "earthquake_poller_state",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("high_water", sa.String(length=255), nullable=True),
+        sa.Column("recent", sa.JSON(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    inspector = inspect(bind)
+    if "earthquake_poller_state" in set(inspector.get_table_names()):
+        op.drop_table("earthquake_poller_state")
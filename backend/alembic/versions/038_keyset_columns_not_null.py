@@ -0,0 +1,90 @@
+"""Make the admin keyset pagination timestamps NOT NULL
+
+Admin listeleri (created_at, id) DESC ile sayfalanır (app/api/pagination.py).
+Sütunlar nullable idi; DESC sıralamada NULL'lar başa gelir ve satır karşılaştırması
+NULL ile hiçbir zaman doğru olmaz — NULL created_at'li bir satır cursor'ı bozar.
+Varsa NULL değerler 1970-01-01 ile doldurulur (yaşı bilinmeyen satırlar listenin
+sonuna düşer) ve sütunlar NOT NULL yapılır.
+
+emergency_reports / audit_logs / inventory_movements büyük ve yazması sürekli
+tablolardır; düz `SET NOT NULL` tüm tabloyu ACCESS EXCLUSIVE kilit altında tarar
+ve bu sürede acil durum POST'unu bile bekletir. Bu yüzden 033 gibi
+autocommit_block içinde, her adım kendi kısa transaction'ında:
+  1. NULL'lar parça parça (BACKFILL_BATCH satır) doldurulur,
+  2. CHECK (sütun IS NOT NULL) NOT VALID eklenir (yalnızca anlık kilit),
+  3. VALIDATE CONSTRAINT — yazmaları engellemeyen kilitle tarar,
+  4. SET NOT NULL — doğrulanmış CHECK sayesinde tarama yapmaz (PostgreSQL 12+),
+  5. artık gereksiz CHECK kaldırılır.
+
+Revision ID: 038_keyset_columns_not_null
+Revises: 037_earthquake_poller_state
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+import sqlalchemy as sa
+from sqlalchemy import inspect
+
+from alembic import op
+
+revision = "038_keyset_columns_not_null"
+down_revision = "037_earthquake_poller_state"
+branch_labels = None
+depends_on = None
+
+_BACKFILL = "1970-01-01 00:00:00"
+BACKFILL_BATCH = 5000
+
+# (tablo, keyset zaman sütunu)
+_COLUMNS = (
+    ("announcements", "created_at"),
+    ("audit_logs", "created_at"),
+    ("emergency_reports", "created_at"),
+    ("inventory_movements", "timestamp"),
+    ("shelter_offers", "created_at"),
+    ("volunteer_applications", "created_at"),
+    ("volunteer_tasks", "created_at"),
+)
+
+
+def _nullable_columns(bind) -> list[tuple[str, str]]:
+    inspector = inspect(bind)
+    tables = set(inspector.get_table_names())
+    pending = []
+    for table, column in _COLUMNS:
+        if table not in tables:
+            continue
+        info = {c["name"]: c for c in inspector.get_columns(table)}
+        if column in info and info[column]["nullable"]:
+            pending.append((table, column))
+    return pending
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    pending = _nullable_columns(bind)
+    # Her ifade kendi transaction'ında commit edilir; kilitler kısa kalır
+    with op.get_context().autocommit_block():
+        for table, column in pending:
+            check = f"ck_{table}_{column}_not_null"
+            while True:
+                updated = bind.execute(
+                    sa.text(
+                        f"UPDATE {table} SET \"{column}\" = TIMESTAMP '{_BACKFILL}' WHERE id IN ("
+                        f"SELECT id FROM {table} WHERE \"{column}\" IS NULL LIMIT {BACKFILL_BATCH})"
+                    )
+                ).rowcount
+                if not updated:
+                    break
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {check}")
+            op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {check} CHECK ("{column}" IS NOT NULL) NOT VALID')
+            op.execute(f"ALTER TABLE {table} VALIDATE CONSTRAINT {check}")
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN "{column}" SET NOT NULL')
+            op.execute(f"ALTER TABLE {table} DROP CONSTRAINT {check}")
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    tables = set(inspect(bind).get_table_names())
+    for table, column in _COLUMNS:
+        if table in tables:
+            op.alter_column(table, column, existing_type=sa.DateTime(), nullable=True)
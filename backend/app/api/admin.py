@@ -4,11 +4,12 @@ Admin-only global endpoints: abuse metrics + activity timeline (GS-083).
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import desc, select
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.rate_limit import (
     emergency_limiter,
     public_form_dedup,
@@ -42,25 +43,24 @@ async def get_abuse_metrics(
 
 @router.get("/audit-log")
 async def get_audit_log(
-    page: int = Query(default=1, ge=1),
-    limit: int = Query(default=50, ge=1, le=200),
+    response: Response,
+    page: PageParams = Depends(),
     resource_type: Optional[str] = Query(default=None),
     action: Optional[str] = Query(default=None),
     db: AsyncSession = Depends(get_db),
     _: User = Depends(require_roles("admin")),
 ):
-    """Paginated audit log for the activity timeline (GS-083)."""
-    stmt = select(AuditLog).order_by(desc(AuditLog.created_at))
+    """Cursor-paginated audit log for the activity timeline (GS-083)."""
+    stmt = select(AuditLog)
     if resource_type:
         stmt = stmt.where(AuditLog.resource_type == resource_type)
     if action:
         stmt = stmt.where(AuditLog.action == action)
 
-    offset = (page - 1) * limit
-    stmt = stmt.offset(offset).limit(limit)
-
-    result = await db.execute(stmt)
-    entries = result.scalars().all()
+    entries = await keyset_page(
+        db, stmt, page, response,
+        created_col=AuditLog.created_at, id_col=AuditLog.id,
+    )
 
     return success_response(
         data=[
@@ -75,5 +75,5 @@ async def get_audit_log(
             }
             for e in entries
         ],
-        message=f"Audit log page {page}",
+        message=f"{len(entries)} audit log entries",
     )
@@ -7,14 +7,16 @@ Admin: full CRUD — create, list all, partial update, delete.
 from datetime import datetime
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import sse as sse_broadcaster
 from app.api.auth import require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.response import success_response
 from app.db import get_db
+from app.db.writes import insert_returning, update_returning
 from app.models.announcement import Announcement
 from app.models.user import User
 from app.schemas import (
@@ -71,31 +73,31 @@ async def create_announcement(
         status="draft",
         created_by=current_user.id,
     )
-    db.add(ann)
-    await db.flush()
-    ann_id = ann.id
-    await db.commit()
-    result = await db.execute(select(Announcement).where(Announcement.id == ann_id))
-    ann = result.scalar_one()
+    ann = await insert_returning(db, ann)
     return success_response(data=_serialize_admin(ann), message="Duyuru oluşturuldu")
 
 
 # ── Admin: list all announcements (any status) ───────────────────────────────
 @router.get("/admin")
 async def list_announcements_admin(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
     status: Optional[str] = Query(default=None, description="Filter by status"),
     kategori: Optional[str] = Query(default=None, description="Filter by category"),
+    page: PageParams = Depends(),
 ):
-    stmt = select(Announcement).order_by(Announcement.id.desc())
+    stmt = select(Announcement)
     if status is not None:
         stmt = stmt.where(Announcement.status == status)
     if kategori is not None:
         stmt = stmt.where(Announcement.kategori == kategori)
-    result = await db.execute(stmt)
+    anns = await keyset_page(
+        db, stmt, page, response,
+        created_col=Announcement.created_at, id_col=Announcement.id,
+    )
     return success_response(
-        data=[_serialize_admin(ann) for ann in result.scalars().all()],
+        data=[_serialize_admin(ann) for ann in anns],
         message="Tüm duyurular listelendi",
     )
 
@@ -115,25 +117,15 @@ async def update_announcement(
     if ann is None:
         raise HTTPException(status_code=404, detail="Duyuru bulunamadı")
 
-    if payload.title is not None:
-        ann.title = payload.title
-    if payload.content is not None:
-        ann.content = payload.content
-    if payload.kategori is not None:
-        ann.kategori = payload.kategori
-    if payload.priority is not None:
-        ann.priority = payload.priority
+    changes = payload.model_dump(exclude_none=True, include={"title", "content", "kategori", "priority"})
     was_published = ann.status == "published"
     if payload.status is not None:
         if payload.status == "published" and ann.published_at is None:
-            ann.published_at = datetime.utcnow()
-        ann.status = payload.status
+            changes["published_at"] = datetime.utcnow()
+        changes["status"] = payload.status
 
-    await db.flush()
-    ann_id = ann.id
-    await db.commit()
-    result = await db.execute(select(Announcement).where(Announcement.id == ann_id))
-    ann = result.scalar_one()
+    if changes:
+        ann = await update_returning(db, Announcement, Announcement.id == ann.id, **changes)
 
     # Push to SSE clients when an announcement transitions to published
     if not was_published and ann.status == "published":
@@ -17,6 +17,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import get_current_user, get_optional_current_user, require_roles
 from app.api.response import success_response
 from app.db import get_db
+from app.db.writes import insert_returning
 from app.models.safe_checkin import SafeCheckin
 from app.models.user import User
 
@@ -61,12 +62,7 @@ async def create_checkin(
         note=payload.note,
         source=payload.source,
     )
-    db.add(checkin)
-    await db.flush()
-    checkin_id = checkin.id
-    await db.commit()
-    result = await db.execute(select(SafeCheckin).where(SafeCheckin.id == checkin_id))
-    checkin = result.scalar_one()
+    checkin = await insert_returning(db, checkin)
     return success_response(
         data=CheckinResponse.model_validate(checkin).model_dump(),
         message="Güvendeyim bildirimi alındı",
@@ -1,38 +1,64 @@
 import asyncio
+import logging
+import os
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, ConfigDict, Field, model_validator
-from sqlalchemy import select
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import push
 from app.api.auth import get_current_user, require_roles
 from app.api.observability import collector
 from app.api.response import success_response
-from app.core import cache
+from app.core import cache, jobs
 from app.core.eq_notify import dispatch_earthquake_notifications
 from app.db import get_db
 from app.models.earthquake_notification_pref import EarthquakeNotificationPref
 from app.models.user import User
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["earthquakes"])
 
 _CACHE_KEY = "earthquakes:feed"
-_CACHE_TTL_SECONDS = 300
 
-# In-memory fallback (used when Redis is unavailable)
-_cache_lock = asyncio.Lock()
-_cached_payload: dict | None = None
-_cache_expires_at: float = 0.0
+
+def _env_seconds(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+# Stale-while-revalidate: yaş < soft → taze; soft ≤ yaş < hard → bayat veri hemen
+# döner, tek bir arka plan görevi yeniler; yaş ≥ hard → istek upstream'i bekler.
+_SOFT_TTL_SECONDS = _env_seconds("EARTHQUAKE_FEED_SOFT_TTL_SECONDS", 300)
+_HARD_TTL_SECONDS = max(_SOFT_TTL_SECONDS, _env_seconds("EARTHQUAKE_FEED_HARD_TTL_SECONDS", 3600))
+
+# Son başarılı kayıt; upstream hatasında sert süre dolmuş olsa bile sunulur.
+# Kayıt: {"payload": ..., "fetched_at": epoch saniye} — worker'lar arası paylaşılan
+# Redis kaydıyla aynı biçim, yaş duvar saatinden hesaplanır.
+_cached_entry: dict | None = None
+_refresh_task: Optional[asyncio.Task] = None
 
 KANDILLI_BASE = "https://api.orhanaydogdu.com.tr/deprem/kandilli/archive"
 MAGNITUDE_THRESHOLD = 3.5
 LOOKBACK_DAYS = 3
 
+# Geçmiş günlerin arşiv sayfaları değişmez; ayrı anahtarda uzun süre tutulur.
+_DAY_CACHE_PREFIX = "earthquakes:day:"
+_SEALED_DAY_TTL_SECONDS = (LOOKBACK_DAYS + 1) * 86400
+# Gece yarısından sonra geç yayımlanan kayıtlar için dünü bir süre daha canlı say.
+_SEALED_GRACE = timedelta(minutes=30)
+_DAY_FETCH_DEADLINE_SECONDS = 8.0
+_sealed_days: dict[str, list[dict]] = {}
+
 
 def _extract_coords(eq: dict) -> tuple[Optional[float], Optional[float]]:
     """Kandilli kaydından (lat, lon) çıkar; geojson.coordinates [lon, lat] önce,
@@ -54,25 +80,83 @@ def _extract_coords(eq: dict) -> tuple[Optional[float], Optional[float]]:
     return None, None
 
 
+def _day_cache_key(date: str) -> str:
+    return f"{_DAY_CACHE_PREFIX}{date}"
+
+
+def _is_sealed(date: str, now: datetime) -> bool:
+    """Gün bitip geç yayın payı da geçtiyse arşiv sayfası artık değişmez."""
+    day_end = datetime.strptime(date, "%Y-%m-%d") + timedelta(days=1)
+    return now >= day_end + _SEALED_GRACE
+
+
+async def _get_sealed_day(date: str) -> Optional[list[dict]]:
+    if date in _sealed_days:
+        return _sealed_days[date]
+    hit = await cache.get(_day_cache_key(date))
+    if hit is not None:
+        _sealed_days[date] = hit
+    return hit
+
+
+async def _store_sealed_day(date: str, results: list[dict]) -> None:
+    _sealed_days[date] = results
+    await cache.set(_day_cache_key(date), results, ttl=_SEALED_DAY_TTL_SECONDS)
+
+
+async def _fetch_day(client: httpx.AsyncClient, date: str) -> list[dict]:
+    """Tek arşiv gününü çek; süre sınırı aşılırsa asyncio.TimeoutError."""
+    response = await asyncio.wait_for(
+        client.get(f"{KANDILLI_BASE}?date={date}&limit=500"),
+        timeout=_DAY_FETCH_DEADLINE_SECONDS,
+    )
+    response.raise_for_status()
+    return response.json().get("result", [])
+
+
 async def _fetch_fresh() -> dict:
-    """Fetch the last LOOKBACK_DAYS of earthquake data from Kandilli and filter."""
+    """Fetch the last LOOKBACK_DAYS of earthquake data from Kandilli and filter.
+
+    Geçmiş (mühürlü) günler uzun TTL ile ayrı önbelleklenir; yalnızca önbellekte
+    olmayan günler eşzamanlı çekilir, böylece sıcak durumda tek round-trip
+    (bugün) kalır. Hata/zaman aşımı veren gün atlanır, diğerleri birleştirilir.
+    """
+    now = datetime.now()
+    dates = [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(LOOKBACK_DAYS)]
+    for stale in [d for d in _sealed_days if d not in dates]:
+        del _sealed_days[stale]
+
     all_results: list[dict] = []
     fetch_errors: list[str] = []
+    missing: list[str] = []
+    for date in dates:
+        cached = await _get_sealed_day(date) if _is_sealed(date, now) else None
+        if cached is None:
+            missing.append(date)
+        else:
+            all_results.extend(cached)
+
+    if missing:
+        async with httpx.AsyncClient(timeout=_DAY_FETCH_DEADLINE_SECONDS) as client:
+            fetched = await asyncio.gather(
+                *(_fetch_day(client, date) for date in missing), return_exceptions=True
+            )
+        for date, outcome in zip(missing, fetched):
+            if isinstance(outcome, BaseException):
+                fetch_errors.append(f"{date}: {outcome!r}")
+                continue
+            all_results.extend(outcome)
+            if _is_sealed(date, now):
+                await _store_sealed_day(date, outcome)
+
+    return {"result": _normalize_feed(all_results), "partial_errors": fetch_errors}
 
-    async with httpx.AsyncClient(timeout=15) as client:
-        for i in range(LOOKBACK_DAYS):
-            date = (datetime.now() - timedelta(days=i)).strftime("%Y-%m-%d")
-            try:
-                response = await client.get(f"{KANDILLI_BASE}?date={date}&limit=500")
-                response.raise_for_status()
-                data = response.json()
-                all_results.extend(data.get("result", []))
-            except Exception as exc:
-                fetch_errors.append(f"{date}: {exc}")
 
+def _normalize_feed(raw: list[dict]) -> list[dict]:
+    """Ham Kandilli kayıtlarını eşik/pencereye göre süz, sade sözlüğe çevir, yeniden eskiye sırala."""
     cutoff = datetime.now() - timedelta(days=LOOKBACK_DAYS)
     filtered: list[dict] = []
-    for eq in all_results:
+    for eq in raw:
         try:
             mag = float(eq["mag"])
             eq_date = datetime.strptime(eq["date_time"], "%Y-%m-%d %H:%M:%S")
@@ -90,49 +174,87 @@ async def _fetch_fresh() -> dict:
             continue
 
     filtered.sort(key=lambda x: x["date"], reverse=True)
-    return {"result": filtered, "partial_errors": fetch_errors}
+    return filtered
 
 
-@router.get("")
-async def get_earthquakes():
-    global _cached_payload, _cache_expires_at
+async def _refresh_feed() -> dict:
+    """Upstream'den çek, iki katmana yaz, yeni kaydı döndür."""
+    global _cached_entry
+    payload = await _fetch_fresh()
+    entry = {"payload": payload, "fetched_at": time.time()}
+    await cache.set(_CACHE_KEY, entry, ttl=_HARD_TTL_SECONDS)
+    _cached_entry = entry
+    return entry
+
 
-    # Fast path: Redis hit (checked before acquiring lock)
-    redis_hit = await cache.get(_CACHE_KEY)
-    if redis_hit is not None:
-        collector.record_cache_hit("earthquakes")
-        return success_response(data={**redis_hit, "cached": True}, message="Earthquake feed (cached)")
+async def _background_refresh() -> None:
+    global _refresh_task
+    try:
+        await cache.single_flight(_CACHE_KEY, _refresh_feed)
+    except Exception as exc:
+        logger.warning("Earthquake feed background refresh failed: %s", exc)
+    finally:
+        _refresh_task = None
 
-    now = time.monotonic()
 
-    async with _cache_lock:
-        # Under lock: re-check in-memory so only one coroutine fetches upstream
-        now = time.monotonic()
-        if _cached_payload is not None and now < _cache_expires_at:
+def _schedule_refresh() -> None:
+    """Süreç başına en fazla bir arka plan yenilemesi."""
+    global _refresh_task
+    if _refresh_task is None:
+        _refresh_task = asyncio.get_running_loop().create_task(_background_refresh())
+
+
+async def _read_entry() -> Optional[dict]:
+    hit = await cache.get(_CACHE_KEY)
+    if isinstance(hit, dict) and "fetched_at" in hit:
+        return hit
+    return _cached_entry
+
+
+def _feed_response(entry: dict, *, stale: bool, message: str, cached: bool = True) -> dict:
+    """Feed yanıtı; `age_seconds` verinin upstream'den çekildiğinden beri geçen süre."""
+    age = max(0, int(time.time() - entry["fetched_at"]))
+    data = {
+        **entry["payload"],
+        "cached": cached,
+        "stale": stale,
+        "age_seconds": age,
+        "fetched_at": datetime.fromtimestamp(entry["fetched_at"], timezone.utc).isoformat(),
+    }
+    return success_response(data=data, message=message)
+
+
+@router.get("")
+async def get_earthquakes():
+    # Fast path: taze ya da yumuşak süresi dolmuş (ama sert süresi dolmamış) kayıt
+    entry = await _read_entry()
+    if entry is not None:
+        age = time.time() - entry["fetched_at"]
+        if age < _SOFT_TTL_SECONDS:
             collector.record_cache_hit("earthquakes")
-            return success_response(
-                data={**_cached_payload, "cached": True},
-                message="Earthquake feed (cached)",
-            )
+            return _feed_response(entry, stale=False, message="Earthquake feed (cached)")
+        if age < _HARD_TTL_SECONDS:
+            collector.record_cache_hit("earthquakes")
+            _schedule_refresh()
+            return _feed_response(entry, stale=True, message="Earthquake feed (revalidating)")
 
-        collector.record_cache_miss("earthquakes")
-        try:
-            payload = await _fetch_fresh()
-            await cache.set(_CACHE_KEY, payload, ttl=_CACHE_TTL_SECONDS)
-            _cached_payload = payload
-            _cache_expires_at = now + _CACHE_TTL_SECONDS
-            return success_response(data=payload, message="Earthquake feed fetched")
-        except Exception as exc:
-            if _cached_payload is not None:
-                return success_response(
-                    data={**_cached_payload, "cached": True, "stale": True},
-                    message=f"Upstream error — serving stale cache: {exc}",
-                )
-            return {
-                "status": "error",
-                "data": {"result": []},
-                "message": f"Earthquake feed failed: {exc}",
-            }
+    # Eşzamanlı kaçırmalar tek upstream çekimini paylaşır (arka plan yenilemesi dahil).
+    collector.record_cache_miss("earthquakes")
+    try:
+        entry = await cache.single_flight(_CACHE_KEY, _refresh_feed)
+        return _feed_response(entry, stale=False, cached=False, message="Earthquake feed fetched")
+    except Exception as exc:
+        if _cached_entry is not None:
+            return _feed_response(
+                _cached_entry,
+                stale=True,
+                message=f"Upstream error — serving stale cache: {exc}",
+            )
+        return {
+            "status": "error",
+            "data": {"result": []},
+            "message": f"Earthquake feed failed: {exc}",
+        }
 
 
 # ── Bildirim tercihleri (GS-100) ────────────────────────────────────────────
@@ -222,35 +344,21 @@ async def upsert_preferences(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(
-        select(EarthquakeNotificationPref).where(
-            EarthquakeNotificationPref.user_id == current_user.id
+    # Tek ifade: INSERT ... ON CONFLICT (user_id) DO UPDATE ... RETURNING
+    values = payload.model_dump()
+    stmt = (
+        pg_insert(EarthquakeNotificationPref)
+        .values(user_id=current_user.id, **values)
+        .on_conflict_do_update(
+            index_elements=[EarthquakeNotificationPref.user_id],
+            set_={**values, "updated_at": func.now()},
         )
+        .returning(EarthquakeNotificationPref)
     )
-    pref = result.scalars().first()
-
-    if pref is None:
-        pref = EarthquakeNotificationPref(user_id=current_user.id)
-        db.add(pref)
-
-    pref.enabled = payload.enabled
-    pref.min_magnitude = payload.min_magnitude
-    pref.max_depth_km = payload.max_depth_km
-    pref.reference_lat = payload.reference_lat
-    pref.reference_lon = payload.reference_lon
-    pref.radius_km = payload.radius_km
-    pref.quiet_hours_start = payload.quiet_hours_start
-    pref.quiet_hours_end = payload.quiet_hours_end
-    pref.critical_override_magnitude = payload.critical_override_magnitude
-
-    await db.flush()
-    pref_id = pref.id
+    pref = (
+        await db.execute(stmt, execution_options={"populate_existing": True})
+    ).scalar_one()
     await db.commit()
-
-    result = await db.execute(
-        select(EarthquakeNotificationPref).where(EarthquakeNotificationPref.id == pref_id)
-    )
-    pref = result.scalar_one()
     return success_response(
         data=EarthquakePreferenceResponse.model_validate(pref).model_dump(),
         message="Deprem bildirim tercihleri kaydedildi",
@@ -259,20 +367,31 @@ async def upsert_preferences(
 
 # ── Eşleştirme & sevkiyat (GS-101) ───────────────────────────────────────────
 
-@router.post("/dispatch-notifications")
+@jobs.handler("earthquake_dispatch")
+async def _run_dispatch_job(db: AsyncSession, payload: dict, ctx: jobs.JobContext) -> dict:
+    # Poller yalnızca yeni depremleri payload'da taşır; elle tetiklemede tüm feed çekilir.
+    earthquakes = payload.get("earthquakes")
+    if earthquakes is None:
+        feed = await _fetch_fresh()
+        earthquakes = feed.get("result", [])
+    return await dispatch_earthquake_notifications(db, earthquakes, on_progress=ctx.report)
+
+
+@router.post("/dispatch-notifications", status_code=202)
 async def dispatch_notifications(
     db: AsyncSession = Depends(get_db),
     _: User = Depends(require_roles("admin")),
 ):
-    """Bir tarama turu: güncel depremleri kullanıcı tercihleriyle eşleştirip
-    eşleşen kullanıcılara Web Push gönderir. Harici zamanlayıcı/admin tetikler."""
+    """Bir tarama turunu kuyruğa alır: güncel depremleri kullanıcı tercihleriyle
+    eşleştirip eşleşen kullanıcılara Web Push gönderir. Harici zamanlayıcı/admin
+    tetikler; ilerleme GET /api/v1/jobs/{id} ile izlenir."""
     if not push._vapid_configured():
         raise HTTPException(
             status_code=503,
             detail="VAPID anahtarları yapılandırılmamış (VAPID_PUBLIC_KEY, VAPID_PRIVATE_KEY, VAPID_SUBJECT)",
         )
 
-    feed = await _fetch_fresh()
-    earthquakes = feed.get("result", [])
-    summary = await dispatch_earthquake_notifications(db, earthquakes)
-    return success_response(data=summary, message="Deprem bildirim taraması tamamlandı")
+    job = await jobs.enqueue(db, "earthquake_dispatch")
+    return success_response(
+        data=jobs.serialize_job(job), message="Deprem bildirim taraması kuyruğa alındı"
+    )
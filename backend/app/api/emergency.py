@@ -1,22 +1,26 @@
 """
 Emergency report API endpoints.
 Public: POST (rate-limited, no auth).
-Admin: GET (list + filter), PATCH /{id}/status, DELETE (bulk clear).
+Admin: GET (list + filter), PATCH /{id}/status, DELETE (bulk clear/archive, background job).
 """
 
+from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, func, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.rate_limit import emergency_limiter, public_form_dedup
 from app.api.response import success_response
 from app.api.storage import ALLOWED_TYPES, MAX_UPLOAD_BYTES, upload_image
+from app.core import jobs
 from app.db import get_db
-from app.models.emergency_report import EmergencyReport
+from app.db.writes import insert_returning, update_returning
+from app.models.emergency_report import EmergencyReport, EmergencyReportArchive
 from app.models.user import User
 from app.schemas import EmergencyAdminResponse, EmergencyStatusUpdate
 
@@ -28,6 +32,9 @@ router = APIRouter(tags=["emergency"])
 # Prevents re-opening confirmed fake/spam submissions.
 _TERMINAL_STATUSES = frozenset({"spam", "dismissed"})
 
+# Bulk clear: rows deleted (or moved to the archive) per statement/transaction
+PURGE_CHUNK_SIZE = 5000
+
 
 class EmergencyCreate(BaseModel):
     durum: str
@@ -62,17 +69,11 @@ async def acil_bildirim_gonder(
         boylam=payload.boylam,
         status="new",
     )
-    db.add(bildirim)
-    await db.flush()
-    bildirim_id = bildirim.id
-    await db.commit()
-    result = await db.execute(
-        select(EmergencyReport).where(EmergencyReport.id == bildirim_id)
-    )
-    bildirim = result.scalar_one()
+    bildirim = await insert_returning(db, bildirim)
 
     # GS-023: yakındaki geofence abonelerini best-effort uyar. Push yapılandırılmamışsa
-    # veya herhangi bir hata olursa rapor akışını ASLA bozma.
+    # veya herhangi bir hata olursa rapor akışını ASLA bozma. Sevkiyat arka plan
+    # işidir; yanıt abone sayısından bağımsız olarak hemen döner.
     await _notify_geofenced_subscribers(db, bildirim)
 
     # Intentionally minimal response — avoids giving false confidence to sender.
@@ -82,12 +83,12 @@ async def acil_bildirim_gonder(
 async def _notify_geofenced_subscribers(
     db: AsyncSession, report: EmergencyReport
 ) -> None:
-    """GS-023: acil bildirim konumunun yakınındaki abonelere Web Push gönder.
+    """GS-023: acil bildirim konumunun yakınındaki abonelere Web Push işini kuyruğa al.
 
     Best-effort: VAPID yoksa veya herhangi bir hata olursa sessizce geç."""
     try:
         from app.api.push import _vapid_configured
-        from app.core.geofence import dispatch_geofenced_alert
+        from app.core import jobs
 
         if not _vapid_configured():
             return
@@ -95,14 +96,17 @@ async def _notify_geofenced_subscribers(
             return
 
         kategori = report.kategori or report.durum or "Acil durum"
-        await dispatch_geofenced_alert(
+        await jobs.enqueue(
             db,
-            lat=float(report.enlem),
-            lon=float(report.boylam),
-            title="Yakınınızda acil durum",
-            body=f"{kategori} bildirimi yakınınızda alındı.",
-            url="/",
-            tag="geosafe-geofence",
+            "geofence_alert",
+            {
+                "lat": float(report.enlem),
+                "lon": float(report.boylam),
+                "title": "Yakınınızda acil durum",
+                "body": f"{kategori} bildirimi yakınınızda alındı.",
+                "url": "/",
+                "tag": "geosafe-geofence",
+            },
         )
     except Exception:
         # Bildirim sevkiyatı asla acil rapor kaydını etkilemez.
@@ -113,16 +117,21 @@ async def _notify_geofenced_subscribers(
 @router.get("")
 @router.get("/admin")
 async def bildirimleri_getir(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
     status: Optional[str] = Query(default=None, description="Filter by status"),
+    page: PageParams = Depends(),
 ):
-    stmt = select(EmergencyReport).order_by(EmergencyReport.id.desc())
+    stmt = select(EmergencyReport)
     if status is not None:
         stmt = stmt.where(EmergencyReport.status == status)
-    result = await db.execute(stmt)
+    reports = await keyset_page(
+        db, stmt, page, response,
+        created_col=EmergencyReport.created_at, id_col=EmergencyReport.id,
+    )
     return success_response(
-        data=[_serialize_admin(report) for report in result.scalars().all()],
+        data=[_serialize_admin(report) for report in reports],
         message="Bildirimler listelendi",
     )
 
@@ -135,28 +144,22 @@ async def update_emergency_status(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
 ):
-    result = await db.execute(
-        select(EmergencyReport).where(EmergencyReport.id == report_id)
-    )
-    report = result.scalars().first()
+    # Reopening a terminal report is blocked by the UPDATE itself (no read-then-write race)
+    criteria = [EmergencyReport.id == report_id]
+    if payload.status not in _TERMINAL_STATUSES:
+        criteria.append(EmergencyReport.status.notin_(_TERMINAL_STATUSES))
+    report = await update_returning(db, EmergencyReport, *criteria, status=payload.status)
     if report is None:
-        raise HTTPException(status_code=404, detail="Emergency report not found")
-
-    if report.status in _TERMINAL_STATUSES and payload.status not in _TERMINAL_STATUSES:
+        exists = await db.scalar(
+            select(EmergencyReport.id).where(EmergencyReport.id == report_id)
+        )
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Emergency report not found")
         raise HTTPException(
             status_code=422,
             detail="Bu bildirim terminal durumda (spam/reddedildi). Yeniden açılamaz.",
         )
 
-    report.status = payload.status
-    await db.flush()
-    report_id = report.id
-    await db.commit()
-    result = await db.execute(
-        select(EmergencyReport).where(EmergencyReport.id == report_id)
-    )
-    report = result.scalar_one()
-
     return success_response(
         data=_serialize_admin(report),
         message="Emergency status updated",
@@ -194,27 +197,90 @@ async def upload_emergency_image(
 
     image_url = await upload_image(file_bytes, content_type)
     report.image_url = image_url
-    await db.flush()
+    # No onupdate columns on this model, so the committed object is complete
     await db.commit()
-    result = await db.execute(
-        select(EmergencyReport).where(EmergencyReport.id == report_id)
-    )
-    report = result.scalar_one()
     return success_response(
         data={"id": report.id, "image_url": report.image_url},
         message="Image uploaded",
     )
 
 
-# ── Admin: bulk-clear all emergency reports ─────────────────────────────────
-@router.delete("")
+# ── Admin: bulk-clear / archive emergency reports (background job) ──────────
+def _purge_chunk_stmt(criteria: list, after_id: int, archive: bool):
+    """One chunk as a single statement; returns the ids it removed.
+
+    Chunks walk the primary key (id > after_id) so each one is an index range
+    scan that never revisits the dead tuples of earlier chunks. With archive the
+    DELETE ... RETURNING feeds INSERT ... SELECT in the same statement, so rows
+    never leave the database.
+    """
+    chunk = (
+        select(EmergencyReport.id)
+        .where(EmergencyReport.id > after_id, *criteria)
+        .order_by(EmergencyReport.id)
+        .limit(PURGE_CHUNK_SIZE)
+    )
+    removed = delete(EmergencyReport).where(EmergencyReport.id.in_(chunk))
+    if not archive:
+        return removed.returning(EmergencyReport.id)
+
+    columns = [c.name for c in EmergencyReport.__table__.columns]
+    moved = removed.returning(*EmergencyReport.__table__.columns).cte("moved")
+    return (
+        insert(EmergencyReportArchive)
+        .from_select(columns, select(*(moved.c[name] for name in columns)))
+        .returning(EmergencyReportArchive.id)
+    )
+
+
+@jobs.handler("emergency_purge")
+async def _run_purge_job(db: AsyncSession, payload: dict, ctx: jobs.JobContext) -> dict:
+    # Only the reports that existed when the purge was requested; reports
+    # submitted while it runs are above max_id and survive.
+    max_id = payload.get("max_id")
+    if max_id is None:
+        return {"deleted": 0, "archived": 0}
+    criteria = [EmergencyReport.id <= max_id]
+    if payload.get("status") is not None:
+        criteria.append(EmergencyReport.status == payload["status"])
+    if payload.get("before") is not None:
+        criteria.append(EmergencyReport.created_at < datetime.fromisoformat(payload["before"]))
+    archive = bool(payload.get("archive"))
+
+    total = await db.scalar(select(func.count()).select_from(EmergencyReport).where(*criteria))
+    ctx.report(0, total)
+    done, after_id = 0, 0
+    while True:
+        # Each chunk commits on its own: short transactions, only ids held in memory
+        ids = (await db.execute(_purge_chunk_stmt(criteria, after_id, archive))).scalars().all()
+        await db.commit()
+        if not ids:
+            break
+        done += len(ids)
+        after_id = max(ids)
+        ctx.report(done, max(total, done))
+    return {"deleted": done, "archived": done if archive else 0}
+
+
+@router.delete("", status_code=202)
 async def bildirimleri_temizle(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
+    status: Optional[str] = Query(default=None, description="Yalnızca bu durumdaki raporlar"),
+    before: Optional[datetime] = Query(default=None, description="Yalnızca bu andan önce oluşturulanlar"),
+    archive: bool = Query(default=False, description="Silmek yerine emergency_reports_archive'e taşı"),
 ):
-    result = await db.execute(select(EmergencyReport))
-    bildirimler = result.scalars().all()
-    for b in bildirimler:
-        await db.delete(b)
-    await db.commit()
-    return success_response(data={"deleted": len(bildirimler)}, message="Bildirimler temizlendi")
+    if before is not None and before.tzinfo is not None:
+        # created_at is naive UTC; shift offset-aware input before dropping tzinfo
+        before = before.astimezone(timezone.utc).replace(tzinfo=None)
+    job = await jobs.enqueue(
+        db,
+        "emergency_purge",
+        {
+            "status": status,
+            "before": before.isoformat() if before else None,
+            "archive": archive,
+            "max_id": await db.scalar(select(func.max(EmergencyReport.id))),
+        },
+    )
+    return success_response(data=jobs.serialize_job(job), message="Bildirim temizliği kuyruğa alındı")
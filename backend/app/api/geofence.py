@@ -19,6 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import push
 from app.api.auth import get_current_user, require_roles
 from app.api.response import success_response
+from app.core import geofence_index
 from app.core.geofence import dispatch_geofenced_alert
 from app.db import get_db
 from app.models.geofence_subscription import GeofenceSubscription
@@ -130,6 +131,9 @@ async def upsert_subscription(
         select(GeofenceSubscription).where(GeofenceSubscription.id == sub_id)
     )
     sub = result.scalar_one()
+    # Bu worker'ın indeksi hemen güncellenir; diğerleri bir sonraki eşleştirmedeki
+    # artımlı tazelemede (updated_at) görür.
+    geofence_index.index.upsert(sub)
     return success_response(
         data=GeofenceSubscriptionResponse.model_validate(sub).model_dump(),
         message="Geofence aboneliği kaydedildi",
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from pydantic import BaseModel, Field
 from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +9,7 @@ from sqlalchemy.orm.attributes import flag_modified
 
 from app.api import sse as sse_broadcaster
 from app.api.auth import require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.response import success_response
 from app.db import get_db
 from app.models.inventory_movement import InventoryMovement
@@ -367,8 +368,10 @@ async def update_warehouse_inventory_admin(
 
 @router.get("/movements/admin")
 async def list_inventory_movements_admin(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
+    page: PageParams = Depends(),
 ):
     source_warehouse = aliased(Warehouse)
     target_warehouse = aliased(Warehouse)
@@ -391,9 +394,11 @@ async def list_inventory_movements_admin(
         .outerjoin(source_warehouse, source_warehouse.id == InventoryMovement.from_warehouse_id)
         .outerjoin(target_warehouse, target_warehouse.id == InventoryMovement.to_warehouse_id)
         .outerjoin(actor, actor.id == InventoryMovement.performed_by)
-        .order_by(InventoryMovement.timestamp.desc(), InventoryMovement.id.desc())
     )
-    rows = (await db.execute(stmt)).all()
+    rows = await keyset_page(
+        db, stmt, page, response,
+        created_col=InventoryMovement.timestamp, id_col=InventoryMovement.id, scalars=False,
+    )
     data = []
     for row in rows:
         movement = row.InventoryMovement
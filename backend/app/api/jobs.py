@@ -0,0 +1,29 @@
+"""
+Arka plan iş durumu.
+
+GET /api/v1/jobs/{job_id} — kuyruğa alınmış bir bildirim işinin durumu,
+ilerleme sayaçları ve (bittiyse) sonuç özeti (admin/operator).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.api.auth import require_roles
+from app.api.response import success_response
+from app.core import jobs
+from app.db import get_db
+from app.models.user import User
+
+router = APIRouter(tags=["jobs"])
+
+
+@router.get("/{job_id}")
+async def get_job_status(
+    job_id: int,
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(require_roles("admin", "operator")),
+):
+    job = await jobs.get_job(db, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return success_response(data=jobs.serialize_job(job), message="İş durumu")
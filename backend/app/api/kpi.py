@@ -1,20 +1,44 @@
 """
 GS-080: KPI summary endpoint.
 
-GET /api/v1/kpi/summary  — aggregated operational metrics for the dashboard.
-Accessible to any authenticated user; the response is the same for all roles
-(admin-only breakdowns are omitted to keep the shape consistent).
+GET  /api/v1/kpi/summary         — aggregated operational metrics for the dashboard.
+GET  /api/v1/kpi/timeseries      — bucketed trend series, read only from kpi_rollups.
+POST /api/v1/kpi/rollups/rebuild — rebuild rollups from the raw tables (admin, 202 + job).
+The read endpoints are accessible to any authenticated user; the response is the
+same for all roles (admin-only breakdowns are omitted to keep the shape consistent).
+
+The summary is one statement: each table is aggregated once with
+count(*) FILTER (WHERE …) and the single-row results are cross-joined.
+It is served from a short-TTL snapshot (app.core.cache.get_or_load: per-worker
+L1 + shared Redis, single-flight and early refresh), so hundreds of polling
+dashboards cost roughly one query per TTL window instead of one per poll.
+
+Time series come from the per-minute/hour/day rollups maintained by
+app.core.kpi_rollup, so a 30-day trend is one primary-key range scan over a few
+hundred rollup rows regardless of how large the raw tables grow. Buckets with
+no events are zero-filled; `as_of` is how far the raw tables have been rolled up.
+
+Env:
+  KPI_SUMMARY_TTL_SECONDS — snapshot lifetime (default 10; 0 disables the snapshot)
 """
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import and_, func, select
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy import and_, func, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.auth import get_current_user
+from app.api.auth import get_current_user, require_roles
 from app.api.response import success_response
+from app.core import cache, jobs, kpi_rollup
+from app.core.kpi_rollup import Bucket, Metric
 from app.db import get_db
 from app.models.emergency_report import EmergencyReport
 from app.models.item import Item
+from app.models.kpi_rollup import KpiRollup, KpiRollupWatermark
 from app.models.safe_zone import SafeZone
 from app.models.user import User
 from app.models.volunteer_application import VolunteerApplication
@@ -25,106 +49,194 @@ from app.models.warehouse_inventory import WarehouseInventory
 router = APIRouter(tags=["kpi"])
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+SUMMARY_TTL_SECONDS = _env_int("KPI_SUMMARY_TTL_SECONDS", 10)
+_SUMMARY_CACHE_KEY = "kpi:summary"
+
+
+def _summary_stmt():
+    count = func.count()
+    emergencies = select(
+        count.label("em_total"),
+        count.filter(EmergencyReport.status == "new").label("em_new"),
+        count.filter(EmergencyReport.status.in_(["resolved", "dismissed"])).label("em_resolved"),
+    ).subquery("em")
+    tasks = select(
+        count.label("task_total"),
+        count.filter(VolunteerTask.status == "open").label("task_open"),
+        count.filter(VolunteerTask.status == "done").label("task_done"),
+    ).subquery("tasks")
+    warehouses = select(
+        count.label("wh_total"),
+        count.filter(Warehouse.status == "active").label("wh_active"),
+    ).subquery("wh")
+    safe_zones = select(
+        count.label("sz_total"),
+        count.filter(SafeZone.status == "active").label("sz_active"),
+        func.coalesce(func.sum(SafeZone.capacity), 0).label("sz_capacity"),
+    ).subquery("sz")
+    # Items whose current quantity is at or below low_stock_threshold
+    critical = (
+        select(count.label("critical"))
+        .select_from(WarehouseInventory)
+        .join(Item, Item.id == WarehouseInventory.item_id)
+        .where(
+            and_(
+                Item.is_active.is_(True),
+                Item.low_stock_threshold.isnot(None),
+                WarehouseInventory.quantity <= Item.low_stock_threshold,
+            )
+        )
+        .subquery("crit")
+    )
+    volunteers = (
+        select(count.label("vol_pending"))
+        .select_from(VolunteerApplication)
+        .where(VolunteerApplication.status == "pending")
+        .subquery("vol")
+    )
+
+    # Every subquery yields exactly one row, so the cross join yields one row
+    return select(emergencies, tasks, warehouses, safe_zones, critical, volunteers).select_from(
+        emergencies.join(tasks, true())
+        .join(warehouses, true())
+        .join(safe_zones, true())
+        .join(critical, true())
+        .join(volunteers, true())
+    )
+
+
+async def _load_summary(db: AsyncSession) -> dict:
+    row = (await db.execute(_summary_stmt())).one()
+    return {
+        "emergencies": {
+            "total": row.em_total,
+            "new": row.em_new,
+            "resolved": row.em_resolved,
+        },
+        "tasks": {
+            "total": row.task_total,
+            "open": row.task_open,
+            "done": row.task_done,
+        },
+        "warehouses": {
+            "total": row.wh_total,
+            "active": row.wh_active,
+        },
+        "safe_zones": {
+            "total": row.sz_total,
+            "active": row.sz_active,
+            "total_capacity": int(row.sz_capacity),
+        },
+        "critical_stock_count": row.critical,
+        "volunteer_applications_pending": row.vol_pending,
+    }
+
+
 @router.get("/summary")
 async def get_kpi_summary(
     db: AsyncSession = Depends(get_db),
     _: User = Depends(get_current_user),
 ):
-    # ── Emergencies ────────────────────────────────────────────────────────────
-    em_total = (await db.execute(select(func.count(EmergencyReport.id)))).scalar_one()
-    em_new = (
-        await db.execute(
-            select(func.count(EmergencyReport.id)).where(EmergencyReport.status == "new")
-        )
-    ).scalar_one()
-    em_resolved = (
-        await db.execute(
-            select(func.count(EmergencyReport.id)).where(
-                EmergencyReport.status.in_(["resolved", "dismissed"])
-            )
+    if SUMMARY_TTL_SECONDS:
+        data = await cache.get_or_load(
+            _SUMMARY_CACHE_KEY, lambda: _load_summary(db), ttl=SUMMARY_TTL_SECONDS, resource="kpi"
         )
-    ).scalar_one()
+    else:
+        data = await _load_summary(db)
+    return success_response(data=data, message="KPI özeti alındı")
 
-    # ── Volunteer tasks ────────────────────────────────────────────────────────
-    task_total = (await db.execute(select(func.count(VolunteerTask.id)))).scalar_one()
-    task_open = (
-        await db.execute(
-            select(func.count(VolunteerTask.id)).where(VolunteerTask.status == "open")
-        )
-    ).scalar_one()
-    task_done = (
-        await db.execute(
-            select(func.count(VolunteerTask.id)).where(VolunteerTask.status == "done")
-        )
-    ).scalar_one()
 
-    # ── Warehouses ────────────────────────────────────────────────────────────
-    wh_total = (await db.execute(select(func.count(Warehouse.id)))).scalar_one()
-    wh_active = (
+async def _load_timeseries(
+    db: AsyncSession, metric: str, bucket: str, days: int, dimension: Optional[str]
+) -> dict:
+    as_of = (
         await db.execute(
-            select(func.count(Warehouse.id)).where(Warehouse.status == "active")
+            select(KpiRollupWatermark.rolled_until).where(KpiRollupWatermark.metric == metric)
         )
-    ).scalar_one()
+    ).scalar_one_or_none()
+    data = {"metric": metric, "bucket": bucket, "as_of": None, "buckets": [], "series": []}
+    if as_of is None:
+        return data
 
-    # ── Safe zones ────────────────────────────────────────────────────────────
-    sz_total = (await db.execute(select(func.count(SafeZone.id)))).scalar_one()
-    sz_active = (
-        await db.execute(
-            select(func.count(SafeZone.id)).where(SafeZone.status == "active")
-        )
-    ).scalar_one()
-    sz_capacity = (
-        await db.execute(select(func.coalesce(func.sum(SafeZone.capacity), 0)))
-    ).scalar_one()
+    step = kpi_rollup.BUCKET_STEPS[bucket]
+    n_buckets = int(timedelta(days=days) / step)
+    first = kpi_rollup.floor_bucket(as_of, bucket) - step * (n_buckets - 1)
+    stmt = select(KpiRollup.bucket_start, KpiRollup.dimension, KpiRollup.count, KpiRollup.amount).where(
+        KpiRollup.metric == metric,
+        KpiRollup.bucket == bucket,
+        KpiRollup.bucket_start >= first,
+    )
+    if dimension is not None:
+        stmt = stmt.where(KpiRollup.dimension == dimension)
 
-    # ── Critical stock ────────────────────────────────────────────────────────
-    # Items whose current quantity is at or below low_stock_threshold
-    critical_rows = (
-        await db.execute(
-            select(func.count(WarehouseInventory.id))
-            .join(Item, Item.id == WarehouseInventory.item_id)
-            .where(
-                and_(
-                    Item.is_active.is_(True),
-                    Item.low_stock_threshold.isnot(None),
-                    WarehouseInventory.quantity <= Item.low_stock_threshold,
-                )
-            )
-        )
-    ).scalar_one()
+    with_amounts = metric in kpi_rollup.AMOUNT_METRICS
+    series: dict[str, dict] = {}
+    for row in (await db.execute(stmt)).all():
+        i = int((row.bucket_start - first) / step)
+        if not 0 <= i < n_buckets:
+            continue
+        entry = series.get(row.dimension)
+        if entry is None:
+            entry = series[row.dimension] = {"dimension": row.dimension, "total": 0, "counts": [0] * n_buckets}
+            if with_amounts:
+                entry["amount_total"] = 0
+                entry["amounts"] = [0] * n_buckets
+        entry["counts"][i] = row.count
+        entry["total"] += row.count
+        if with_amounts:
+            entry["amounts"][i] = row.amount
+            entry["amount_total"] += row.amount
 
-    # ── Volunteer applications ─────────────────────────────────────────────────
-    vol_pending = (
-        await db.execute(
-            select(func.count(VolunteerApplication.id)).where(
-                VolunteerApplication.status == "pending"
-            )
+    data["as_of"] = as_of.isoformat()
+    data["buckets"] = [(first + step * i).isoformat() for i in range(n_buckets)]
+    data["series"] = sorted(series.values(), key=lambda s: (-s["total"], s["dimension"]))
+    return data
+
+
+@router.get("/timeseries")
+async def get_kpi_timeseries(
+    metric: Metric = Query(...),
+    bucket: Bucket = Query("hour"),
+    days: int = Query(7, ge=1, le=366),
+    dimension: Optional[str] = Query(None, max_length=100, description="Tek bir boyutla sınırla (ör. status)"),
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(get_current_user),
+):
+    retention = {"minute": kpi_rollup.MINUTE_RETENTION, "hour": kpi_rollup.HOUR_RETENTION}.get(bucket)
+    if retention is not None and timedelta(days=days) > retention:
+        raise HTTPException(
+            status_code=400,
+            detail=f"'{bucket}' kovaları yalnızca son {retention.total_seconds() / 86400:g} gün için tutulur",
         )
-    ).scalar_one()
-
-    return success_response(
-        data={
-            "emergencies": {
-                "total": em_total,
-                "new": em_new,
-                "resolved": em_resolved,
-            },
-            "tasks": {
-                "total": task_total,
-                "open": task_open,
-                "done": task_done,
-            },
-            "warehouses": {
-                "total": wh_total,
-                "active": wh_active,
-            },
-            "safe_zones": {
-                "total": sz_total,
-                "active": sz_active,
-                "total_capacity": int(sz_capacity),
-            },
-            "critical_stock_count": critical_rows,
-            "volunteer_applications_pending": vol_pending,
-        },
-        message="KPI özeti alındı",
+    data = await _load_timeseries(db, metric, bucket, days, dimension)
+    return success_response(data=data, message="KPI zaman serisi alındı")
+
+
+class RollupRebuildPayload(BaseModel):
+    since: datetime
+    metrics: Optional[list[Metric]] = None
+
+
+@router.post("/rollups/rebuild", status_code=202)
+async def rebuild_kpi_rollups(
+    payload: RollupRebuildPayload,
+    db: AsyncSession = Depends(get_db),
+    _: User = Depends(require_roles("admin")),
+):
+    since = payload.since
+    if since.tzinfo is not None:
+        # Ham tablolar naive UTC tutar; offset'li girdiyi önce UTC'ye çevir
+        since = since.astimezone(timezone.utc).replace(tzinfo=None)
+    job = await jobs.enqueue(
+        db,
+        "kpi_rollup_rebuild",
+        {"since": since.isoformat(), "metrics": payload.metrics},
     )
+    return success_response(data=jobs.serialize_job(job), message="KPI rollup yeniden kurulumu kuyruğa alındı")
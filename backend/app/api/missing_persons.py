@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import require_roles
 from app.api.rate_limit import RateLimiter
 from app.api.response import success_response
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.models.missing_person import MissingPerson
 
 router = APIRouter(tags=["missing-persons"])
@@ -92,7 +92,7 @@ async def list_missing_persons(
     status: Optional[str] = Query(default="active"),
     limit: int = Query(default=50, ge=1, le=200),
     offset: int = Query(default=0, ge=0),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Kayıp kişileri listele / ara. Herkese açık."""
     q = select(MissingPerson)
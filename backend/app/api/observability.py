@@ -3,18 +3,29 @@ GS-007: lightweight in-process metrics collector and middleware.
 No external dependencies — exposes Prometheus text format manually.
 
 GS-064: added cache hit/miss/invalidation counters.
+Two-tier cache: per-tier (local LRU / Redis) hit and miss counters.
+SSE: slow-consumer drop / eviction counters; gauges are read at scrape time
+from callbacks registered with register_gauge().
+DB pool: checkout wait histogram and pool-timeout counter.
+SQL per request: query-count and DB-time histograms per route (app/db/instrumentation).
 """
 
 import re
 import time
 from collections import defaultdict
-from typing import Callable
+from typing import Callable, Iterable, Union
 
 from fastapi import Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.requests import Request
 
+from app.db import instrumentation
+
 _ID_SEG = re.compile(r"/\d+(?=/|$)")
+# Histogram upper bounds
+_CHECKOUT_BUCKETS = (0.001, 0.005, 0.025, 0.1, 0.5, 1.0, 5.0, 30.0)
+_QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100)
+_DB_TIME_BUCKETS = (0.005, 0.025, 0.1, 0.25, 0.5, 1.0, 5.0)
 
 
 def _normalize(path: str) -> str:
@@ -22,6 +33,37 @@ def _normalize(path: str) -> str:
     return _ID_SEG.sub("/{id}", path)
 
 
+class _Histogram:
+    """Prometheus histogram: per-bucket counts (cumulated on render), sum, count."""
+
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+    def lines(self, name: str, labels: str = "") -> Iterable[str]:
+        sep = "," if labels else ""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels}{sep}le="+Inf"}} {self.count}'
+        suffix = f"{{{labels}}}" if labels else ""
+        yield f"{name}_sum{suffix} {self.sum:.6f}"
+        yield f"{name}_count{suffix} {self.count}"
+
+
 class MetricsCollector:
     def __init__(self) -> None:
         # (method, path, status_code_str) -> count
@@ -33,6 +75,22 @@ class MetricsCollector:
         self._cache_hits: dict[str, int] = defaultdict(int)
         self._cache_misses: dict[str, int] = defaultdict(int)
         self._cache_invalidations: dict[str, int] = defaultdict(int)
+        # tier ("local" | "redis") -> count
+        self._cache_tier_hits: dict[str, int] = defaultdict(int)
+        self._cache_tier_misses: dict[str, int] = defaultdict(int)
+        # SSE slow consumers: (event_type, policy) -> dropped events, event_type -> evicted clients
+        self._sse_drops: dict[tuple, int] = defaultdict(int)
+        self._sse_evictions: dict[str, int] = defaultdict(int)
+        self._db_checkout_wait = _Histogram(_CHECKOUT_BUCKETS)
+        self._db_pool_timeouts = 0
+        # (method, path) -> per-request SQL statement count / DB time
+        self._db_queries: dict[tuple, _Histogram] = {}
+        self._db_time: dict[tuple, _Histogram] = {}
+        # name -> (help, callback) evaluated on every scrape
+        self._gauges: dict[str, tuple[str, Callable[[], Union[int, float]]]] = {}
+
+    def register_gauge(self, name: str, help_text: str, read: Callable[[], Union[int, float]]) -> None:
+        self._gauges[name] = (help_text, read)
 
     def record(self, method: str, path: str, status: int, duration: float) -> None:
         self._requests[(method, path, str(status))] += 1
@@ -48,6 +106,33 @@ class MetricsCollector:
     def record_cache_invalidation(self, resource: str) -> None:
         self._cache_invalidations[resource] += 1
 
+    def record_cache_tier(self, tier: str, *, hit: bool) -> None:
+        if hit:
+            self._cache_tier_hits[tier] += 1
+        else:
+            self._cache_tier_misses[tier] += 1
+
+    def record_sse_drop(self, event_type: str, policy: str) -> None:
+        self._sse_drops[(event_type, policy)] += 1
+
+    def record_sse_eviction(self, event_type: str) -> None:
+        self._sse_evictions[event_type] += 1
+
+    def record_db_checkout_wait(self, seconds: float) -> None:
+        self._db_checkout_wait.observe(seconds)
+
+    def record_db_queries(self, method: str, path: str, count: int, seconds: float) -> None:
+        key = (method, path)
+        queries = self._db_queries.get(key)
+        if queries is None:
+            queries = self._db_queries[key] = _Histogram(_QUERY_COUNT_BUCKETS)
+            self._db_time[key] = _Histogram(_DB_TIME_BUCKETS)
+        queries.observe(count)
+        self._db_time[key].observe(seconds)
+
+    def record_db_pool_timeout(self) -> None:
+        self._db_pool_timeouts += 1
+
     def prometheus_text(self) -> str:
         lines: list[str] = []
 
@@ -101,6 +186,69 @@ class MetricsCollector:
             for resource, count in sorted(self._cache_invalidations.items()):
                 lines.append(f'cache_invalidations_total{{resource="{resource}"}} {count}')
 
+        if self._cache_tier_hits or self._cache_tier_misses:
+            lines += [
+                "# HELP cache_tier_hits_total Cache hits by tier (local LRU, redis)",
+                "# TYPE cache_tier_hits_total counter",
+            ]
+            for tier, count in sorted(self._cache_tier_hits.items()):
+                lines.append(f'cache_tier_hits_total{{tier="{tier}"}} {count}')
+
+            lines += [
+                "# HELP cache_tier_misses_total Cache misses by tier (local LRU, redis)",
+                "# TYPE cache_tier_misses_total counter",
+            ]
+            for tier, count in sorted(self._cache_tier_misses.items()):
+                lines.append(f'cache_tier_misses_total{{tier="{tier}"}} {count}')
+
+        if self._sse_drops or self._sse_evictions:
+            lines += [
+                "# HELP sse_events_dropped_total Events dropped or coalesced away for slow SSE clients",
+                "# TYPE sse_events_dropped_total counter",
+            ]
+            for (event_type, policy), count in sorted(self._sse_drops.items()):
+                lines.append(
+                    f'sse_events_dropped_total{{type="{event_type}",policy="{policy}"}} {count}'
+                )
+
+            lines += [
+                "# HELP sse_clients_evicted_total SSE clients disconnected for a full queue",
+                "# TYPE sse_clients_evicted_total counter",
+            ]
+            for event_type, count in sorted(self._sse_evictions.items()):
+                lines.append(f'sse_clients_evicted_total{{type="{event_type}"}} {count}')
+
+        if self._db_checkout_wait.count:
+            lines += [
+                "# HELP db_pool_checkout_wait_seconds Time spent waiting for a pooled DB connection",
+                "# TYPE db_pool_checkout_wait_seconds histogram",
+                *self._db_checkout_wait.lines("db_pool_checkout_wait_seconds"),
+                "# HELP db_pool_timeouts_total Checkouts that hit pool_timeout",
+                "# TYPE db_pool_timeouts_total counter",
+                f"db_pool_timeouts_total {self._db_pool_timeouts}",
+            ]
+
+        if self._db_queries:
+            lines += [
+                "# HELP db_queries_per_request SQL statements executed per request",
+                "# TYPE db_queries_per_request histogram",
+            ]
+            for (method, path), histogram in sorted(self._db_queries.items()):
+                lines += histogram.lines("db_queries_per_request", f'method="{method}",path="{path}"')
+            lines += [
+                "# HELP db_time_per_request_seconds Total SQL execution time per request",
+                "# TYPE db_time_per_request_seconds histogram",
+            ]
+            for (method, path), histogram in sorted(self._db_time.items()):
+                lines += histogram.lines("db_time_per_request_seconds", f'method="{method}",path="{path}"')
+
+        for name, (help_text, read) in sorted(self._gauges.items()):
+            try:
+                value = read()
+            except Exception:
+                continue
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge", f"{name} {value}"]
+
         return "\n".join(lines) + "\n"
 
 
@@ -111,6 +259,10 @@ class MetricsMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         path = _normalize(request.url.path)
         start = time.perf_counter()
-        response = await call_next(request)
+        with instrumentation.track_queries() as stats:
+            response = await call_next(request)
         collector.record(request.method, path, response.status_code, time.perf_counter() - start)
+        if stats.count:
+            collector.record_db_queries(request.method, path, stats.count, stats.total_seconds)
+        instrumentation.report_request(request, response, stats)
         return response
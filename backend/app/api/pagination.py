@@ -0,0 +1,91 @@
+"""
+Keyset (cursor) pagination for admin list endpoints.
+
+Lists are ordered newest first by (created_at, id); the id breaks ties between
+rows created in the same instant. A page is fetched with
+    WHERE (created_at, id) < (:cursor_created_at, :cursor_id)
+    ORDER BY created_at DESC, id DESC LIMIT :limit + 1
+so every page costs one index range scan of `limit` rows, no matter how deep the
+client pages (OFFSET would scan and throw away every earlier row).
+
+The cursor is opaque to clients (urlsafe base64 of "<iso timestamp>|<id>").
+The response envelope is unchanged; the next page's cursor is in the
+X-Next-Cursor header and is absent on the last page.
+
+The timestamp columns paginated here are NOT NULL (migration 038): a NULL would
+sort first under DESC and never satisfy the tuple comparison, so a page ending
+on it could not be continued. New tables using this must keep that invariant.
+"""
+
+import base64
+import binascii
+from datetime import datetime
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 500
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """FastAPI dependency: ?cursor=<opaque>&limit=<1..MAX_LIMIT>."""
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(default=None, description="Önceki sayfanın X-Next-Cursor değeri"),
+        limit: int = Query(default=DEFAULT_LIMIT, ge=1, le=MAX_LIMIT),
+    ) -> None:
+        self.cursor = cursor
+        self.limit = limit
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    raw = f"{created_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(status_code=400, detail="Geçersiz sayfalama cursor'ı")
+
+
+async def keyset_page(
+    db: AsyncSession,
+    stmt: Select,
+    page: PageParams,
+    response: Response,
+    *,
+    created_col: Any,
+    id_col: Any,
+    scalars: bool = True,
+) -> Sequence[Any]:
+    """Run `stmt` for one page and set X-Next-Cursor when more rows follow.
+
+    `stmt` must not carry its own ORDER BY / LIMIT. With scalars=False the raw
+    Row objects are returned (joined selects); the paginated entity must then be
+    the first selected element so the cursor can be built from the last row.
+    """
+    if page.cursor:
+        created_at, row_id = decode_cursor(page.cursor)
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    stmt = stmt.order_by(created_col.desc(), id_col.desc()).limit(page.limit + 1)
+
+    result = await db.execute(stmt)
+    rows = list(result.scalars().all() if scalars else result.all())
+    if len(rows) > page.limit:
+        rows = rows[: page.limit]
+        last = rows[-1]
+        if not scalars:
+            last = last[0]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, created_col.key), getattr(last, id_col.key)
+        )
+    return rows
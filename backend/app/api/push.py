@@ -3,29 +3,29 @@ Web Push emergency alerts — GS-021.
 
 POST /api/v1/push/subscribe    — save a push subscription (authenticated)
 DELETE /api/v1/push/subscribe  — remove subscription
-POST /api/v1/push/send         — broadcast to all subscribers (admin)
+POST /api/v1/push/send         — queue a broadcast to all subscribers (admin, returns job)
 GET  /api/v1/push/vapid-public — return the VAPID public key (no auth)
 
 Env:
   VAPID_PUBLIC_KEY   — base64url-encoded VAPID public key
   VAPID_PRIVATE_KEY  — base64url-encoded VAPID private key
   VAPID_SUBJECT      — mailto: or https: contact (required by web-push spec)
+  PUSH_CONCURRENCY   — parallel sends during fan-out (see app/core/push_delivery.py)
 
 Generate keys once:  python -c "from py_vapid import Vapid; v=Vapid(); v.generate_keys(); print(v.public_key, v.private_key)"
 """
 
-import json
 import os
-from datetime import datetime
 from typing import Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_current_user, require_roles
 from app.api.response import success_response
+from app.core import jobs, push_delivery
 from app.db import get_db
 from app.models.push_subscription import PushSubscription
 from app.models.user import User
@@ -58,26 +58,10 @@ def _vapid_configured() -> bool:
 
 
 async def _send_one(sub: PushSubscription, payload: dict) -> bool:
-    """Send a push message to one subscription. Returns True on success."""
-    try:
-        from pywebpush import webpush  # type: ignore
-
-        webpush(
-            subscription_info={
-                "endpoint": sub.endpoint,
-                "keys": sub.keys if isinstance(sub.keys, dict) else json.loads(sub.keys),
-            },
-            data=json.dumps(payload),
-            vapid_private_key=os.getenv("VAPID_PRIVATE_KEY"),
-            vapid_claims={
-                "sub": os.getenv("VAPID_SUBJECT", "mailto:admin@geosafe.app"),
-                "exp": int(datetime.utcnow().timestamp()) + 12 * 3600,
-            },
-            ttl=86400,
-        )
-        return True
-    except Exception:
-        return False
+    """Send a push message to one subscription. Returns True on success.
+
+    The blocking pywebpush call runs on the shared delivery thread pool."""
+    return await push_delivery.send(sub, payload)
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -144,6 +128,7 @@ async def _send_push_to_all_subscriptions(
     body: str,
     url: str = "/",
     tag: str = "geosafe-alert",
+    on_progress: Optional[push_delivery.Progress] = None,
 ) -> dict:
     """Broadcast a push notification to all stored subscriptions."""
     result = await db.execute(select(PushSubscription))
@@ -153,29 +138,35 @@ async def _send_push_to_all_subscriptions(
         return {"sent": 0, "failed": 0, "removed_stale": 0}
 
     message = {"title": title, "body": body, "url": url, "tag": tag}
-    sent, failed = 0, 0
-    dead_endpoints: list[str] = []
-
-    for sub in subs:
-        ok = await _send_one(sub, message)
-        if ok:
-            sent += 1
-        else:
-            failed += 1
-            dead_endpoints.append(sub.endpoint)
-
-    for ep in dead_endpoints:
-        r = await db.execute(select(PushSubscription).where(PushSubscription.endpoint == ep))
-        dead_sub = r.scalar_one_or_none()
-        if dead_sub:
-            await db.delete(dead_sub)
+    results = await push_delivery.fan_out(
+        [(sub, message) for sub in subs], _send_one, on_progress=on_progress
+    )
+    sent = sum(results)
+    failed = len(results) - sent
+    dead_endpoints = [sub.endpoint for sub, ok in zip(subs, results) if not ok]
+
     if dead_endpoints:
+        await db.execute(
+            delete(PushSubscription).where(PushSubscription.endpoint.in_(dead_endpoints))
+        )
         await db.commit()
 
     return {"sent": sent, "failed": failed, "removed_stale": len(dead_endpoints)}
 
 
-@router.post("/send")
+@jobs.handler("push_broadcast")
+async def _run_broadcast_job(db: AsyncSession, payload: dict, ctx: jobs.JobContext) -> dict:
+    return await _send_push_to_all_subscriptions(
+        db=db,
+        title=payload["title"],
+        body=payload["body"],
+        url=payload.get("url", "/"),
+        tag=payload.get("tag", "geosafe-alert"),
+        on_progress=ctx.report,
+    )
+
+
+@router.post("/send", status_code=202)
 async def send_push(
     payload: PushSendPayload,
     db: AsyncSession = Depends(get_db),
@@ -187,14 +178,17 @@ async def send_push(
             detail="VAPID anahtarları yapılandırılmamış (VAPID_PUBLIC_KEY, VAPID_PRIVATE_KEY, VAPID_SUBJECT)",
         )
 
-    stats = await _send_push_to_all_subscriptions(
-        db=db,
-        title=payload.title,
-        body=payload.body,
-        url=payload.url or "/",
-        tag=payload.tag or "geosafe-alert",
+    job = await jobs.enqueue(
+        db,
+        "push_broadcast",
+        {
+            "title": payload.title,
+            "body": payload.body,
+            "url": payload.url or "/",
+            "tag": payload.tag or "geosafe-alert",
+        },
     )
     return success_response(
-        data=stats,
-        message=f"Push bildirimi gönderildi: {stats['sent']} başarılı, {stats['failed']} başarısız",
+        data=jobs.serialize_job(job),
+        message="Push bildirimi kuyruğa alındı",
     )
@@ -19,7 +19,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import require_roles
 from app.api.inventory import DEFAULT_LOW_STOCK_THRESHOLD
-from app.db import get_db
+from app.db import get_read_db
 from app.models.inventory_movement import InventoryMovement
 from app.models.item import Item
 from app.models.safe_checkin import SafeCheckin
@@ -119,7 +119,7 @@ async def _inventory_rows(db: AsyncSession) -> tuple[list[str], list[list]]:
 
 @router.get("/inventory.csv")
 async def export_inventory_csv(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_roles("admin")),
 ):
     headers, rows = await _inventory_rows(db)
@@ -129,7 +129,7 @@ async def export_inventory_csv(
 
 @router.get("/inventory.pdf")
 async def export_inventory_pdf(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_roles("admin")),
 ):
     headers, rows = await _inventory_rows(db)
@@ -149,7 +149,7 @@ async def export_inventory_pdf(
 
 @router.get("/movements.csv")
 async def export_movements_csv(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_roles("admin")),
 ):
     stmt = (
@@ -182,7 +182,7 @@ async def export_movements_csv(
 
 @router.get("/checkins.csv")
 async def export_checkins_csv(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     _: User = Depends(require_roles("admin")),
 ):
     stmt = select(SafeCheckin).order_by(SafeCheckin.created_at.desc()).limit(10000)
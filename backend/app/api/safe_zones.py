@@ -14,7 +14,7 @@ from app.api.auth import require_roles
 from app.api.observability import collector
 from app.api.response import success_response
 from app.core import cache
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.models import SafeZone
 from app.models.user import User
 from app.schemas import SafeZoneCreate
@@ -85,18 +85,17 @@ def _serialize_safe_zone(zone: SafeZone, *, include_private: bool = False) -> di
 
 @router.get("")
 async def list_safe_zones(db: AsyncSession = Depends(get_db)):
-    try:
-        cached = await cache.get(_CACHE_KEY)
-        if cached is not None:
-            collector.record_cache_hit("safe_zones")
-            return success_response(data=cached, message="Safe zones listed")
-
-        collector.record_cache_miss("safe_zones")
+    # Shared cache entry is filled from the primary: a replica lagging behind a
+    # write would otherwise repopulate it with pre-write data for the whole TTL.
+    # A cache hit opens no connection (the session is lazy).
+    async def _load() -> list[dict]:
         stmt = select(SafeZone).order_by(SafeZone.id)
         result = await db.execute(stmt)
         safe_zones = result.scalars().all()
-        data = [_serialize_safe_zone(zone) for zone in safe_zones]
-        await cache.set(_CACHE_KEY, data, ttl=_CACHE_TTL)
+        return [_serialize_safe_zone(zone) for zone in safe_zones]
+
+    try:
+        data = await cache.get_or_load(_CACHE_KEY, _load, ttl=_CACHE_TTL, resource="safe_zones")
         return success_response(data=data, message="Safe zones listed")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching safe zones: {str(e)}")
@@ -104,7 +103,7 @@ async def list_safe_zones(db: AsyncSession = Depends(get_db)):
 
 @router.get("/admin")
 async def list_safe_zones_admin(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_roles("admin")),
 ):
     stmt = select(SafeZone).order_by(SafeZone.id)
@@ -117,7 +116,7 @@ async def list_safe_zones_admin(
 
 
 @router.get("/{zone_id}")
-async def get_safe_zone(zone_id: int, db: AsyncSession = Depends(get_db)):
+async def get_safe_zone(zone_id: int, db: AsyncSession = Depends(get_read_db)):
     stmt = select(SafeZone).where(SafeZone.id == zone_id)
     result = await db.execute(stmt)
     safe_zone = result.scalar_one_or_none()
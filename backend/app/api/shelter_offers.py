@@ -4,11 +4,12 @@ Shelter offer intake API endpoints
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.rate_limit import public_form_dedup, shelter_limiter
 from app.api.response import success_response
 from app.db import get_db
@@ -72,15 +73,19 @@ async def create_shelter_offer(
 
 @router.get("/admin")
 async def list_shelter_offers_admin(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
     status: Optional[str] = Query(default=None, description="Filter by status"),
+    page: PageParams = Depends(),
 ):
-    stmt = select(ShelterOffer).order_by(ShelterOffer.id.desc())
+    stmt = select(ShelterOffer)
     if status is not None:
         stmt = stmt.where(ShelterOffer.status == status)
-    result = await db.execute(stmt)
-    offers = result.scalars().all()
+    offers = await keyset_page(
+        db, stmt, page, response,
+        created_col=ShelterOffer.created_at, id_col=ShelterOffer.id,
+    )
 
     return success_response(
         data=[_serialize_admin(offer) for offer in offers],
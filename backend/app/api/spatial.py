@@ -12,7 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import require_roles
 from app.api.rate_limit import nearest_depot_limiter
 from app.api.response import success_response
-from app.db import get_db
+from app.db import get_read_db
 from app.models.emergency_report import EmergencyReport
 from app.models.item import Item
 from app.models.safe_checkin import SafeCheckin
@@ -31,7 +31,7 @@ async def nearest_depot_with_required_item(
     lon: float = Query(..., ge=-180, le=180, description="User longitude"),
     item_name: str = Query(..., min_length=1, description="Required item name"),
     radius_km: float = Query(10.0, gt=0, description="Search radius in kilometers"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     Find the nearest active depot that has the requested item in stock.
@@ -115,7 +115,7 @@ async def nearest_safe_zone(
     lat: float = Query(..., ge=-90, le=90, description="User latitude"),
     lon: float = Query(..., ge=-180, le=180, description="User longitude"),
     limit: int = Query(default=5, ge=1, le=20, description="Max results"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """
     GS-031 — Capacity-aware nearest safe zone lookup.
@@ -186,7 +186,7 @@ _INCIDENT_WEIGHTS = {"verified": 1.0, "reviewing": 0.7, "new": 0.5}
 async def incident_heatmap(
     source: str = Query("incidents", description="incidents | checkins | both"),
     days: int = Query(30, ge=1, le=365, description="Include records from the last N days"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_roles("admin", "operator")),
 ):
     """
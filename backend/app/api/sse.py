@@ -2,47 +2,493 @@
 Server-Sent Events (SSE) — Live announcement channel (GS-020).
 
 Architecture:
-  - A module-level broadcaster holds a set of active client queues.
+  - A module-level broadcaster holds a set of active client queues (per worker).
   - When an admin publishes an announcement, they call `broadcast_announcement`.
-  - /api/v1/sse/announcements streams events to all connected clients.
-  - Heartbeat every 25 s keeps proxies from closing idle connections.
+  - `_broadcast` goes through app/core/sse_bus: local queues get the event at once,
+    and with Redis the bus relays it to every other gunicorn worker.
+  - /api/v1/sse/announcements streams events to all connected clients; optional
+    topic filters (event types, chat rooms, warehouse ids) are kept in a
+    topic → queue routing index so a broadcast only touches interested queues.
+  - Every event has a monotonically increasing SSE id and is kept in a bounded
+    per-event-type replay buffer; reconnects with Last-Event-ID replay the gap.
+  - Each client queue is bounded; when it fills, the event type's overflow
+    policy decides what happens (drop_oldest, coalesce, disconnect — see below).
+  - inventory_update is batched per warehouse over a short window into one
+    delta event (app/core/event_aggregator); low_stock_alert goes out at once.
+  - One shared ticker per worker sends a heartbeat every 25 s to connections
+    that were idle since the previous tick, keeping proxies from closing them.
+
+Slow consumers (client queue full):
+  drop_oldest — the oldest queued event is discarded to make room.
+  coalesce    — a queued event that the new one supersedes (same warehouse for
+                inventory_update, same room for presence_update) is replaced;
+                inventory deltas are merged item by item (newest quantity wins)
+                so no change is lost. With nothing to replace it falls back to
+                disconnect.
+  disconnect  — the queue is flushed, a `resync` event is sent and the stream
+                ends; EventSource reconnects with Last-Event-ID and replays.
+
+Env:
+  SSE_QUEUE_SIZE         — per-client queue size (default 50)
+  SSE_HEARTBEAT_SECONDS  — heartbeat interval of the shared ticker (default 25)
+  SSE_INVENTORY_WINDOW_MS — inventory_update batching window per warehouse
+                           (default 500; 0 sends every change on its own)
+  SSE_OVERFLOW_POLICY    — default policy (default disconnect)
+  SSE_OVERFLOW_POLICIES  — per event type overrides, e.g.
+                           "chat_message=drop_oldest,inventory_update=coalesce"
+                           (default: inventory_update and presence_update coalesce)
 """
 
 import asyncio
 import json
+import logging
+import os
+from collections import deque
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Callable, Iterable, Optional
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, HTTPException, Query
 from fastapi.responses import StreamingResponse
 
+from app.api.observability import collector
+from app.core import sse_bus
+from app.core.event_aggregator import EventAggregator
+
+logger = logging.getLogger(__name__)
+
 router = APIRouter(tags=["sse"])
 
-# Each connected client gets its own asyncio.Queue
-_clients: set[asyncio.Queue] = set()
+EVENT_TYPES = (
+    "announcement",
+    "low_stock_alert",
+    "chat_message",
+    "inventory_update",
+    "presence_update",
+)
+# Event type → payload field that scopes it (chat room / channel slug, warehouse id)
+_SCOPE_FIELD = {
+    "chat_message": "room",
+    "presence_update": "room",
+    "inventory_update": "warehouse_id",
+    "low_stock_alert": "warehouse_id",
+}
+_ANY_SCOPE = "*"
+# Clients without any filter: every event, whatever its type or scope
+_FIREHOSE = ("*", _ANY_SCOPE)
+
+Topic = tuple[str, str]  # (event_type, scope value | "*")
+
+OVERFLOW_POLICIES = ("drop_oldest", "coalesce", "disconnect")
+# Event type → payload fields identifying the state an event replaces
+_COALESCE_FIELDS = {
+    # a delta is merged into a queued delta for the same warehouse (_COALESCE_MERGE)
+    "inventory_update": ("warehouse_id",),
+    "presence_update": ("room",),
+}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(2, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _load_policies() -> dict[str, str]:
+    default = os.getenv("SSE_OVERFLOW_POLICY", "disconnect").strip().lower()
+    if default not in OVERFLOW_POLICIES:
+        logger.warning("Unknown SSE_OVERFLOW_POLICY=%r — using disconnect", default)
+        default = "disconnect"
+    policies = {event_type: default for event_type in EVENT_TYPES}
+    policies.update(inventory_update="coalesce", presence_update="coalesce")
+
+    raw = os.getenv("SSE_OVERFLOW_POLICIES", "")
+    for part in raw.split(","):
+        event_type, _, policy = part.partition("=")
+        event_type, policy = event_type.strip(), policy.strip().lower()
+        if not event_type:
+            continue
+        if event_type not in policies or policy not in OVERFLOW_POLICIES:
+            logger.warning("Ignoring SSE_OVERFLOW_POLICIES entry %r", part.strip())
+            continue
+        policies[event_type] = policy
+    return policies
+
+
+QUEUE_SIZE = _env_int("SSE_QUEUE_SIZE", 50)
+HEARTBEAT_SECONDS = _env_int("SSE_HEARTBEAT_SECONDS", 25)
+
+
+def _env_window(name: str, default_ms: int) -> float:
+    try:
+        return max(0, int(os.getenv(name, default_ms))) / 1000
+    except (TypeError, ValueError):
+        return default_ms / 1000
+
+
+INVENTORY_WINDOW_SECONDS = _env_window("SSE_INVENTORY_WINDOW_MS", 500)
+_INVENTORY_ITEM_FIELDS = (
+    "item_id",
+    "item_name",
+    "item_sku",
+    "item_unit",
+    "quantity",
+    "threshold",
+    "is_critical",
+)
+_policies = _load_policies()
+
+
+# (event_id, encoded frame); control frames (heartbeat, resync) carry no id
+Frame = tuple[Optional[int], bytes]
+
+
+class _Client:
+    """Lean per-connection state: bounded frame buffer plus routing/overflow bookkeeping.
+
+    Frames are pre-encoded bytes shared between clients. A waiting stream parks
+    on a single future instead of a per-get timer; heartbeats come from the
+    shared ticker (`_heartbeat_loop`), which only touches idle clients.
+    """
+
+    __slots__ = ("topics", "frames", "maxsize", "waiter", "coalesce_keys", "closed", "active")
+
+    def __init__(self, topics: tuple[Topic, ...], maxsize: int) -> None:
+        self.topics = topics
+        self.frames: deque[Frame] = deque()
+        self.maxsize = maxsize
+        self.waiter: Optional[asyncio.Future] = None
+        # event id → (coalescing key, JSON payload) of queued coalescable events
+        self.coalesce_keys: Optional[dict[int, tuple[str, str]]] = None
+        self.closed = False
+        # Something was queued since the last heartbeat tick
+        self.active = False
+
+    def qsize(self) -> int:
+        return len(self.frames)
+
+    def empty(self) -> bool:
+        return not self.frames
 
+    def _wake(self) -> None:
+        if self.waiter is not None and not self.waiter.done():
+            self.waiter.set_result(None)
 
-def _register() -> asyncio.Queue:
-    q: asyncio.Queue = asyncio.Queue(maxsize=50)
+    def put_nowait(self, item: Frame) -> None:
+        if len(self.frames) >= self.maxsize:
+            raise asyncio.QueueFull
+        self.frames.append(item)
+        self.active = True
+        self._wake()
+
+    def get_nowait(self) -> Frame:
+        if not self.frames:
+            raise asyncio.QueueEmpty
+        item = self.frames.popleft()
+        if self.coalesce_keys and item[0] is not None:
+            self.coalesce_keys.pop(item[0], None)
+        return item
+
+    async def get(self) -> Frame:
+        while not self.frames:
+            self.waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self.waiter
+            finally:
+                self.waiter = None
+        return self.get_nowait()
+
+    def remember_key(self, event_id: int, key: str, payload: str) -> None:
+        if self.coalesce_keys is None:
+            self.coalesce_keys = {}
+        self.coalesce_keys[event_id] = (key, payload)
+
+    def replace(
+        self,
+        key: str,
+        item: Frame,
+        payload: str,
+        merge: Optional[Callable[[str, str], str]] = None,
+    ) -> bool:
+        """Drop the queued event with `key` and append `item`; False if none is queued.
+
+        With `merge`, the appended frame carries merge(queued payload, new payload)
+        under the new event id instead of the new payload alone.
+        """
+        if not self.coalesce_keys:
+            return False
+        for index, queued in enumerate(self.frames):
+            entry = self.coalesce_keys.get(queued[0])
+            if entry is not None and entry[0] == key:
+                del self.frames[index]
+                del self.coalesce_keys[queued[0]]
+                if merge is not None:
+                    payload = merge(entry[1], payload)
+                    item = (item[0], _frame(item[0], payload))
+                self.put_nowait(item)
+                self.coalesce_keys[item[0]] = (key, payload)
+                return True
+        return False
+
+    def evict(self, frame: bytes) -> None:
+        """Flush pending events, leave only `frame` and mark the stream for closing."""
+        self.frames.clear()
+        self.coalesce_keys = None
+        self.closed = True
+        self.put_nowait((None, frame))
+
+    def heartbeat(self, frame: bytes) -> None:
+        """Called by the ticker: queue a keep-alive only if nothing was sent since the last tick."""
+        if not self.active and not self.frames:
+            self.frames.append((None, frame))
+            self._wake()
+        self.active = False
+
+
+# Each connected client gets its own state object
+_clients: set[_Client] = set()
+# Routing index: topic → interested clients; a broadcast only touches these
+_routes: dict[Topic, set[_Client]] = {}
+_heartbeat_task: Optional[asyncio.Task] = None
+
+
+async def _heartbeat_loop() -> None:
+    """One ticker per worker; exits when the last client leaves."""
+    global _heartbeat_task
+    try:
+        while _clients:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            # Keep-alive — SSE comment, invisible to JS EventSource
+            frame = f": heartbeat {datetime.utcnow().isoformat()}\n\n".encode()
+            for client in tuple(_clients):
+                client.heartbeat(frame)
+    finally:
+        _heartbeat_task = None
+
+
+def _ensure_heartbeat() -> None:
+    global _heartbeat_task
+    if _heartbeat_task is None:
+        _heartbeat_task = asyncio.get_running_loop().create_task(_heartbeat_loop())
+
+
+collector.register_gauge(
+    "sse_connected_clients", "Connected SSE clients on this worker", lambda: len(_clients)
+)
+collector.register_gauge(
+    "sse_queue_depth_max",
+    "Deepest SSE client queue on this worker",
+    lambda: max((q.qsize() for q in _clients), default=0),
+)
+collector.register_gauge(
+    "sse_queue_depth_total",
+    "Events waiting in all SSE client queues on this worker",
+    lambda: sum(q.qsize() for q in _clients),
+)
+
+
+def _topics_for(
+    types: Optional[Iterable[str]] = None,
+    rooms: Optional[Iterable[str]] = None,
+    warehouses: Optional[Iterable[str]] = None,
+) -> tuple[Topic, ...]:
+    """Expand a filter into routing keys.
+
+    Types narrow which events arrive; rooms/warehouses narrow only the event
+    types that carry that scope (an announcement has neither, so it still passes).
+    """
+    types, rooms, warehouses = set(types or ()), set(rooms or ()), set(warehouses or ())
+    if not (types or rooms or warehouses):
+        return (_FIREHOSE,)
+    topics: list[Topic] = []
+    for event_type in sorted(types or EVENT_TYPES):
+        field = _SCOPE_FIELD.get(event_type)
+        wanted = rooms if field == "room" else warehouses if field == "warehouse_id" else None
+        if wanted:
+            topics.extend((event_type, value) for value in sorted(wanted))
+        else:
+            topics.append((event_type, _ANY_SCOPE))
+    return tuple(topics)
+
+
+def _register(
+    types: Optional[Iterable[str]] = None,
+    rooms: Optional[Iterable[str]] = None,
+    warehouses: Optional[Iterable[str]] = None,
+) -> _Client:
+    topics = _topics_for(types, rooms, warehouses)
+    q = _Client(topics, QUEUE_SIZE)
     _clients.add(q)
+    for topic in topics:
+        _routes.setdefault(topic, set()).add(q)
     return q
 
 
-def _unregister(q: asyncio.Queue) -> None:
+def _unregister(q: _Client) -> None:
+    if q not in _clients:
+        return
     _clients.discard(q)
+    for topic in q.topics:
+        queues = _routes.get(topic)
+        if queues is not None:
+            queues.discard(q)
+            if not queues:
+                del _routes[topic]
 
 
-async def _broadcast(event_type: str, data: dict) -> None:
-    """Internal: push a typed event to all connected SSE clients."""
-    payload = json.dumps({"type": event_type, "data": data}, default=str)
-    dead: list[asyncio.Queue] = []
-    for q in list(_clients):
+def _route_key(event_id: Optional[int], event_type: str, data: dict) -> str:
+    """Bus route "<id>|<type>|<scope>": lets receivers route without decoding the JSON.
+
+    The id is empty when the bus could not issue one (see sse_bus.next_id).
+    """
+    return f"{'' if event_id is None else event_id}|{event_type}|{_scope(event_type, data)}"
+
+
+def _scope(event_type: str, data: dict) -> str:
+    field = _SCOPE_FIELD.get(event_type)
+    scope = data.get(field) if field and isinstance(data, dict) else None
+    return _ANY_SCOPE if scope is None else str(scope)
+
+
+def _parse_route(route: str) -> tuple[Optional[int], str, str]:
+    event_id, event_type, scope = route.split("|", 2)
+    return (int(event_id) if event_id else None), event_type, scope
+
+
+def _frame(event_id: Optional[int], payload: str) -> bytes:
+    # Without an id line the browser keeps its previous Last-Event-ID
+    if event_id is None:
+        return f"data: {payload}\n\n".encode()
+    return f"id: {event_id}\ndata: {payload}\n\n".encode()
+
+
+def _wants(topics: frozenset[Topic], event_type: str, scope: str) -> bool:
+    return (
+        _FIREHOSE in topics
+        or (event_type, scope) in topics
+        or (event_type, _ANY_SCOPE) in topics
+    )
+
+
+def _coalesce_key(event_type: str, payload: str) -> Optional[str]:
+    fields = _COALESCE_FIELDS.get(event_type)
+    if not fields:
+        return None
+    try:
+        data = json.loads(payload).get("data") or {}
+    except (ValueError, AttributeError):
+        return None
+    return "|".join(str(data.get(field)) for field in fields)
+
+
+def _merge_inventory_delta(queued: str, new: str) -> str:
+    """One inventory_update payload holding both deltas; the newer item entry wins."""
+    old_data = json.loads(queued)["data"]
+    new_data = json.loads(new)["data"]
+    items = {entry.get("item_id"): entry for entry in old_data.get("items") or []}
+    items.update((entry.get("item_id"), entry) for entry in new_data.get("items") or [])
+    merged = {**old_data, **new_data, "items": list(items.values())}
+    return json.dumps({"type": "inventory_update", "data": merged}, default=str)
+
+
+# Event type → how a coalesced event folds the queued one it replaces into itself
+_COALESCE_MERGE: dict[str, Callable[[str, str], str]] = {
+    "inventory_update": _merge_inventory_delta,
+}
+
+
+def _resync_frame(reason: str) -> bytes:
+    return f"data: {json.dumps({'type': 'resync', 'data': {'reason': reason}})}\n\n".encode()
+
+
+def _overflow(
+    q: _Client, event_type: str, item: Frame, key: Optional[str], payload: str
+) -> None:
+    """Apply the event type's slow-consumer policy to a full client queue."""
+    policy = _policies.get(event_type, "disconnect")
+    if policy == "drop_oldest":
+        q.get_nowait()
+        q.put_nowait(item)
+        collector.record_sse_drop(event_type, policy)
+        return
+    if policy == "coalesce" and key is not None and q.replace(
+        key, item, payload, _COALESCE_MERGE.get(event_type)
+    ):
+        collector.record_sse_drop(event_type, policy)
+        return
+    q.evict(_resync_frame("slow_consumer"))
+    _unregister(q)
+    collector.record_sse_eviction(event_type)
+
+
+def _deliver_local(route: str, payload: str) -> None:
+    """Bus callback: push an encoded event to this worker's interested client queues."""
+    event_id, event_type, scope = _parse_route(route)
+    targets: set[_Client] = set()
+    for topic in ((event_type, scope), (event_type, _ANY_SCOPE), _FIREHOSE):
+        queues = _routes.get(topic)
+        if queues:
+            targets.update(queues)
+    if not targets:
+        return
+
+    # One encoded frame (and coalescing key) shared by every queue
+    item = (event_id, _frame(event_id, payload))
+    key = (
+        _coalesce_key(event_type, payload)
+        if event_id is not None and _policies.get(event_type) == "coalesce"
+        else None
+    )
+    for q in targets:
         try:
-            q.put_nowait(payload)
+            q.put_nowait(item)
         except asyncio.QueueFull:
-            dead.append(q)
-    for q in dead:
-        _unregister(q)
+            _overflow(q, event_type, item, key, payload)
+            continue
+        if key is not None:
+            q.remember_key(event_id, key, payload)
+
+
+sse_bus.set_local_handler(_deliver_local)
+
+
+async def _broadcast(event_type: str, data: dict) -> None:
+    """Internal: push a typed event to interested SSE clients on every worker.
+
+    The event gets a monotonically increasing id and is kept in its topic's
+    ("<type>|<scope>") replay buffer so reconnecting clients can catch up via
+    Last-Event-ID; a busy room or warehouse only evicts its own history.
+    """
+    payload = json.dumps({"type": event_type, "data": data}, default=str)
+    event_id = await sse_bus.next_id()
+    await sse_bus.publish(
+        _route_key(event_id, event_type, data),
+        payload,
+        replay_key=f"{event_type}|{_scope(event_type, data)}",
+        replay_family=event_type,
+        event_id=event_id,
+    )
+
+
+async def _replay_frames(q: _Client, last_event_id: int) -> list[Frame]:
+    """Missed events for this client's topics, oldest first; a resync hint if some are gone."""
+    topics = frozenset(q.topics)
+    if _FIREHOSE in topics:
+        replay_keys, families = (), EVENT_TYPES
+    else:
+        # A scoped topic is its own buffer; "any scope" means every buffer of the type
+        replay_keys = {f"{event_type}|{scope}" for event_type, scope in topics if scope != _ANY_SCOPE}
+        families = {event_type for event_type, scope in topics if scope == _ANY_SCOPE}
+
+    entries, gap = await sse_bus.replay(replay_keys, last_event_id, families)
+    frames: list[Frame] = []
+    if gap:
+        frames.append((None, _resync_frame("replay_buffer_exceeded")))
+    for event_id, route, payload in entries:
+        _, event_type, scope = _parse_route(route)
+        if _wants(topics, event_type, scope):
+            frames.append((event_id, _frame(event_id, payload)))
+    return frames
 
 
 async def broadcast_announcement(announcement: dict) -> None:
@@ -60,9 +506,37 @@ async def broadcast_chat_message(message: dict) -> None:
     await _broadcast("chat_message", message)
 
 
+async def _emit_inventory_delta(warehouse_id, updates: list[dict]) -> None:
+    await _broadcast(
+        "inventory_update",
+        {
+            "warehouse_id": warehouse_id,
+            "warehouse_name": updates[-1].get("warehouse_name"),
+            "items": [
+                {field: update[field] for field in _INVENTORY_ITEM_FIELDS if field in update}
+                for update in updates
+            ],
+        },
+    )
+
+
+# Per-warehouse batching of inventory changes (bulk edits, scanner bursts)
+inventory_updates = EventAggregator(
+    INVENTORY_WINDOW_SECONDS,
+    _emit_inventory_delta,
+    group_key=lambda update: update.get("warehouse_id"),
+    item_key=lambda update: update.get("item_id"),
+)
+
+
 async def broadcast_inventory_update(update: dict) -> None:
-    """Push a live inventory change to all connected SSE clients (GS-022)."""
-    await _broadcast("inventory_update", update)
+    """Queue a live inventory change for the dashboard (GS-022).
+
+    Changes are batched per warehouse for SSE_INVENTORY_WINDOW_MS and sent as one
+    `inventory_update` delta: {warehouse_id, warehouse_name, items: [...]}, where
+    each item carries its latest quantity. Low-stock alerts are not batched.
+    """
+    await inventory_updates.add(update)
 
 
 async def broadcast_presence_update(presence: dict) -> None:
@@ -70,31 +544,76 @@ async def broadcast_presence_update(presence: dict) -> None:
     await _broadcast("presence_update", presence)
 
 
-async def _event_stream(q: asyncio.Queue) -> AsyncGenerator[str, None]:
-    """Yield SSE-formatted strings; sends a heartbeat comment every 25 s."""
+async def _event_stream(q: _Client, replay: Iterable[Frame] = ()) -> AsyncGenerator[bytes, None]:
+    """Yield pre-encoded SSE frames; heartbeats arrive through the queue from the shared ticker.
+
+    Replayed frames go first. The client was registered before the replay was
+    read, so live events already replayed are skipped by id. An evicted client
+    ends the stream once its resync frame is sent.
+    """
+    replayed: set[int] = set()
     try:
+        for event_id, frame in replay:
+            if event_id is not None:
+                replayed.add(event_id)
+            yield frame
         while True:
-            try:
-                payload = await asyncio.wait_for(q.get(), timeout=25)
-                yield f"data: {payload}\n\n"
-            except asyncio.TimeoutError:
-                # Keep-alive — SSE comment, invisible to JS EventSource
-                yield f": heartbeat {datetime.utcnow().isoformat()}\n\n"
+            event_id, frame = await q.get()
+            if event_id is not None and event_id in replayed:
+                continue
+            yield frame
+            if q.closed and q.empty():
+                break
     except asyncio.CancelledError:
         pass
     finally:
         _unregister(q)
 
 
+def _split(raw: Optional[str]) -> list[str]:
+    return [part.strip() for part in (raw or "").split(",") if part.strip()]
+
+
+def _parse_last_event_id(raw: Optional[str]) -> Optional[int]:
+    try:
+        return int(raw) if raw else None
+    except ValueError:
+        return None
+
+
 @router.get("/announcements")
-async def stream_announcements():
+async def stream_announcements(
+    types: Optional[str] = Query(None, description="Comma-separated event types"),
+    rooms: Optional[str] = Query(None, description="Comma-separated chat rooms / channel slugs"),
+    warehouses: Optional[str] = Query(None, description="Comma-separated warehouse ids"),
+    last_event_id: Optional[str] = Query(None, description="Replay events after this id"),
+    last_event_id_header: Optional[str] = Header(None, alias="Last-Event-ID"),
+):
     """
     SSE endpoint — connect with EventSource('/api/v1/sse/announcements').
     Events have type 'announcement' and carry the full announcement payload.
+
+    Without filters every event is streamed. `types` limits the event types;
+    `rooms` limits chat_message/presence_update and `warehouses` limits
+    inventory_update/low_stock_alert to the given scopes, e.g.
+    `?types=chat_message,presence_update&rooms=ops`.
+
+    Every event carries an SSE `id`. On reconnect the browser sends
+    `Last-Event-ID` (or pass `?last_event_id=`) and only the missed events
+    matching the filters are replayed. If the replay buffer no longer reaches
+    back that far, a `resync` event tells the client to re-fetch full lists.
     """
-    q = _register()
+    type_filter = _split(types)
+    unknown = sorted(set(type_filter) - set(EVENT_TYPES))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Bilinmeyen olay türü: {', '.join(unknown)}")
+
+    q = _register(type_filter, _split(rooms), _split(warehouses))
+    _ensure_heartbeat()
+    resume_from = _parse_last_event_id(last_event_id_header or last_event_id)
+    replay = await _replay_frames(q, resume_from) if resume_from is not None else []
     return StreamingResponse(
-        _event_stream(q),
+        _event_stream(q, replay),
         media_type="text/event-stream",
         headers={
             "Cache-Control": "no-cache",
@@ -107,4 +626,8 @@ async def stream_announcements():
 @router.get("/health")
 async def sse_health():
     """Returns the current number of connected SSE clients (for monitoring)."""
-    return {"connected_clients": len(_clients)}
+    return {
+        "connected_clients": len(_clients),
+        "bus": sse_bus.backend(),
+        "routed_topics": len(_routes),
+    }
@@ -19,6 +19,7 @@ from app.api.auth import require_roles
 from app.api.response import success_response
 from app.core.audit import log_audit
 from app.db import get_db
+from app.db.writes import insert_returning
 from app.models.inventory_movement import InventoryMovement
 from app.models.transfer_request import TransferRequest
 from app.models.user import User
@@ -86,12 +87,7 @@ async def create_transfer(
         requested_by=current_user.id,
         note=payload.note,
     )
-    db.add(transfer)
-    await db.flush()
-    transfer_id = transfer.id
-    await db.commit()
-    result = await db.execute(select(TransferRequest).where(TransferRequest.id == transfer_id))
-    transfer = result.scalar_one()
+    transfer = await insert_returning(db, transfer)
     return success_response(
         data=TransferResponse.model_validate(transfer).model_dump(),
         message="Transfer talebi oluşturuldu",
@@ -4,13 +4,15 @@ Coordinators (admin/operator) create and assign tasks.
 Any authenticated user can view open tasks, claim one, and mark it done.
 """
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import get_current_user, require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.response import success_response
 from app.db import get_db
+from app.db.writes import insert_returning, update_returning
 from app.models.user import User
 from app.models.volunteer_application import VolunteerApplication
 from app.models.volunteer_task import VolunteerTask
@@ -31,6 +33,15 @@ def _serialize(task: VolunteerTask) -> dict:
     return VolunteerTaskResponse.model_validate(task).model_dump()
 
 
+async def _get_or_404(db: AsyncSession, task_id: int) -> VolunteerTask:
+    """Slow path after a conditional UPDATE matched nothing: explain why."""
+    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
+    task = result.scalars().first()
+    if task is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+
 # ── Coordinator: create ─────────────────────────────────────────────────────
 
 @router.post("", status_code=201)
@@ -48,12 +59,7 @@ async def create_task(
         status="open",
         created_by_id=current_user.id,
     )
-    db.add(task)
-    await db.flush()
-    task_id = task.id
-    await db.commit()
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one()
+    task = await insert_returning(db, task)
     return success_response(data=_serialize(task), message="Task created")
 
 
@@ -61,18 +67,22 @@ async def create_task(
 
 @router.get("/admin")
 async def list_tasks_admin(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin", "operator")),
     status: str | None = None,
     urgency: str | None = None,
+    page: PageParams = Depends(),
 ):
-    stmt = select(VolunteerTask).order_by(VolunteerTask.id.desc())
+    stmt = select(VolunteerTask)
     if status:
         stmt = stmt.where(VolunteerTask.status == status)
     if urgency:
         stmt = stmt.where(VolunteerTask.urgency == urgency)
-    result = await db.execute(stmt)
-    tasks = result.scalars().all()
+    tasks = await keyset_page(
+        db, stmt, page, response,
+        created_col=VolunteerTask.created_at, id_col=VolunteerTask.id,
+    )
     return success_response(data=[_serialize(t) for t in tasks], message="Tasks listed")
 
 
@@ -85,20 +95,17 @@ async def assign_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin", "operator")),
 ):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalars().first()
+    task = await update_returning(
+        db,
+        VolunteerTask,
+        VolunteerTask.id == task_id,
+        VolunteerTask.status.notin_(_TERMINAL),
+        assigned_to_id=payload.assigned_to_id,
+        status="in_progress" if payload.assigned_to_id else "open",
+    )
     if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.status in _TERMINAL:
+        task = await _get_or_404(db, task_id)
         raise HTTPException(status_code=422, detail=f"Cannot assign a task with status '{task.status}'")
-
-    task.assigned_to_id = payload.assigned_to_id
-    task.status = "in_progress" if payload.assigned_to_id else "open"
-    await db.flush()
-    task_id = task.id
-    await db.commit()
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one()
     return success_response(data=_serialize(task), message="Task assigned")
 
 
@@ -111,17 +118,9 @@ async def update_task_status_admin(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin", "operator")),
 ):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalars().first()
+    task = await update_returning(db, VolunteerTask, VolunteerTask.id == task_id, status=payload.status)
     if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
-
-    task.status = payload.status
-    await db.flush()
-    task_id = task.id
-    await db.commit()
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one()
     return success_response(data=_serialize(task), message="Task status updated")
 
 
@@ -167,20 +166,18 @@ async def claim_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalars().first()
+    # Conditional UPDATE: two volunteers racing for the same task cannot both win
+    task = await update_returning(
+        db,
+        VolunteerTask,
+        VolunteerTask.id == task_id,
+        VolunteerTask.status == "open",
+        assigned_to_id=current_user.id,
+        status="in_progress",
+    )
     if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.status != "open":
+        await _get_or_404(db, task_id)
         raise HTTPException(status_code=409, detail="Task is not open for claiming")
-
-    task.assigned_to_id = current_user.id
-    task.status = "in_progress"
-    await db.flush()
-    task_id = task.id
-    await db.commit()
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one()
     return success_response(data=_serialize(task), message="Task claimed")
 
 
@@ -192,21 +189,19 @@ async def complete_task(
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalars().first()
+    task = await update_returning(
+        db,
+        VolunteerTask,
+        VolunteerTask.id == task_id,
+        VolunteerTask.assigned_to_id == current_user.id,
+        VolunteerTask.status == "in_progress",
+        status="done",
+    )
     if task is None:
-        raise HTTPException(status_code=404, detail="Task not found")
-    if task.assigned_to_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Only the assigned volunteer can complete this task")
-    if task.status != "in_progress":
+        task = await _get_or_404(db, task_id)
+        if task.assigned_to_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Only the assigned volunteer can complete this task")
         raise HTTPException(status_code=422, detail=f"Cannot complete a task with status '{task.status}'")
-
-    task.status = "done"
-    await db.flush()
-    task_id = task.id
-    await db.commit()
-    result = await db.execute(select(VolunteerTask).where(VolunteerTask.id == task_id))
-    task = result.scalar_one()
     return success_response(data=_serialize(task), message="Task completed")
 
 
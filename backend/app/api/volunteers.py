@@ -4,11 +4,12 @@ Volunteer intake API endpoints
 
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.auth import require_roles
+from app.api.pagination import PageParams, keyset_page
 from app.api.rate_limit import public_form_dedup, volunteer_limiter
 from app.api.response import success_response
 from app.db import get_db
@@ -67,15 +68,19 @@ async def create_volunteer_application(
 
 @router.get("/admin")
 async def list_volunteer_applications_admin(
+    response: Response,
     db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin")),
     status: Optional[str] = Query(default=None, description="Filter by status"),
+    page: PageParams = Depends(),
 ):
-    stmt = select(VolunteerApplication).order_by(VolunteerApplication.id.desc())
+    stmt = select(VolunteerApplication)
     if status is not None:
         stmt = stmt.where(VolunteerApplication.status == status)
-    result = await db.execute(stmt)
-    volunteers = result.scalars().all()
+    volunteers = await keyset_page(
+        db, stmt, page, response,
+        created_col=VolunteerApplication.created_at, id_col=VolunteerApplication.id,
+    )
 
     return success_response(
         data=[_serialize_admin(volunteer) for volunteer in volunteers],
@@ -18,7 +18,7 @@ from app.api.observability import collector
 from app.api.response import success_response
 from app.core import cache
 from app.core.audit import log_audit
-from app.db import get_db
+from app.db import get_db, get_read_db
 from app.models import Warehouse
 from app.models.inventory_movement import InventoryMovement
 from app.models.item import Item
@@ -87,18 +87,17 @@ def _serialize_warehouse(warehouse: Warehouse, *, include_private: bool = False)
 
 @router.get("")
 async def list_warehouses(db: AsyncSession = Depends(get_db)):
-    try:
-        cached = await cache.get(_CACHE_KEY)
-        if cached is not None:
-            collector.record_cache_hit("warehouses")
-            return success_response(data=cached, message="Warehouses listed")
-
-        collector.record_cache_miss("warehouses")
+    # Shared cache entry is filled from the primary: a replica lagging behind a
+    # write would otherwise repopulate it with pre-write data for the whole TTL.
+    # A cache hit opens no connection (the session is lazy).
+    async def _load() -> list[dict]:
         stmt = select(Warehouse).order_by(Warehouse.id)
         result = await db.execute(stmt)
         warehouses = result.scalars().all()
-        data = [_serialize_warehouse(warehouse) for warehouse in warehouses]
-        await cache.set(_CACHE_KEY, data, ttl=_CACHE_TTL)
+        return [_serialize_warehouse(warehouse) for warehouse in warehouses]
+
+    try:
+        data = await cache.get_or_load(_CACHE_KEY, _load, ttl=_CACHE_TTL, resource="warehouses")
         return success_response(data=data, message="Warehouses listed")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching warehouses: {str(e)}")
@@ -106,7 +105,7 @@ async def list_warehouses(db: AsyncSession = Depends(get_db)):
 
 @router.get("/admin")
 async def list_warehouses_admin(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     current_user: User = Depends(require_roles("admin")),
 ):
     stmt = select(Warehouse).order_by(Warehouse.id)
@@ -119,7 +118,7 @@ async def list_warehouses_admin(
 
 
 @router.get("/{warehouse_id}")
-async def get_warehouse(warehouse_id: int, db: AsyncSession = Depends(get_db)):
+async def get_warehouse(warehouse_id: int, db: AsyncSession = Depends(get_read_db)):
     stmt = select(Warehouse).where(Warehouse.id == warehouse_id)
     result = await db.execute(stmt)
     warehouse = result.scalar_one_or_none()
@@ -218,7 +217,7 @@ async def delete_warehouse(
 
 
 @router.get("/{warehouse_id}/inventory")
-async def get_warehouse_inventory(warehouse_id: int, db: AsyncSession = Depends(get_db)):
+async def get_warehouse_inventory(warehouse_id: int, db: AsyncSession = Depends(get_read_db)):
     wh_result = await db.execute(select(Warehouse).where(Warehouse.id == warehouse_id))
     warehouse = wh_result.scalar_one_or_none()
     if not warehouse:
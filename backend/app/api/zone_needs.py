@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.api.auth import require_roles
 from app.api.response import success_response
 from app.db import get_db
+from app.db.writes import insert_returning
 from app.models.user import User
 from app.models.zone_need import ZoneNeed
 
@@ -70,12 +71,7 @@ async def report_need(
         reported_by=current_user.id,
         note=payload.note,
     )
-    db.add(need)
-    await db.flush()
-    need_id = need.id
-    await db.commit()
-    result = await db.execute(select(ZoneNeed).where(ZoneNeed.id == need_id))
-    need = result.scalar_one()
+    need = await insert_returning(db, need)
     return success_response(
         data=ZoneNeedResponse.model_validate(need).model_dump(),
         message="İhtiyaç bildirimi oluşturuldu",
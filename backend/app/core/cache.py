@@ -1,14 +1,48 @@
 """
 GS-064: Redis async caching layer with graceful bypass.
 
-If REDIS_URL is not set or Redis is unreachable, all operations are no-ops:
-  get() → None   set()/delete() → silently ignored
-The application runs correctly without Redis; caching benefits are simply absent.
+Two tiers:
+  L1 — bounded per-worker LRU with TTL (decoded Python values, no network hop)
+  L2 — Redis (shared across workers, JSON-encoded)
+
+get() checks L1 first, then Redis; a Redis hit is copied into L1 for at most
+CACHE_LOCAL_TTL_SECONDS (and never past the key's remaining Redis TTL).
+set()/delete() write through both tiers and publish the key on the
+`cache:invalidate` Redis channel; every worker runs one subscriber task that
+drops those keys from its own L1, so a write on one worker is not served stale
+by another.
+
+If REDIS_URL is not set or Redis is unreachable, only L1 is used:
+  get() → L1 or None   set()/delete() → L1 only
+The application runs correctly without Redis; cross-worker sharing is simply absent.
+
+Values returned from L1 are shared objects — callers must not mutate them.
+
+Stampede protection:
+  single_flight(key, loader) — concurrent callers for the same key in this
+      worker share one loader run.
+  get_or_load(key, loader, ttl=…) — cache-aside read on top of single_flight,
+      with probabilistic early expiry (XFetch): each read may refresh a little
+      before the TTL, more likely the closer to expiry and the slower the
+      loader, so a hot key does not expire on every gunicorn worker at once.
+      While one caller refreshes early the others keep getting the old value.
+
+Env:
+  CACHE_LOCAL_MAX_ENTRIES   — L1 capacity per worker (default 1024)
+  CACHE_LOCAL_TTL_SECONDS   — L1 TTL cap (default 30)
 """
+import asyncio
 import json
 import logging
+import math
 import os
-from typing import Any, Optional
+import random
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+
+from app.api.observability import collector
 
 logger = logging.getLogger(__name__)
 
@@ -21,16 +55,70 @@ except ImportError:
 _client: Optional[Any] = None
 _connected: bool = False
 
+INVALIDATION_CHANNEL = "cache:invalidate"
+# Bu worker'ın kendi yayınladığı invalidation mesajlarını ayırt etmek için.
+_INSTANCE_ID = uuid.uuid4().hex
+_subscriber_task: Optional[asyncio.Task] = None
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+LOCAL_MAX_ENTRIES = _env_int("CACHE_LOCAL_MAX_ENTRIES", 1024)
+LOCAL_TTL_SECONDS = _env_int("CACHE_LOCAL_TTL_SECONDS", 30)
+
+
+class LocalLRU:
+    """Bounded LRU with per-entry expiry. Single event loop — no locking needed."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        entry = self._data.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return False, None
+        self._data.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def discard(self, *keys: str) -> None:
+        for key in keys:
+            self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_local = LocalLRU(LOCAL_MAX_ENTRIES)
+
 
 async def connect() -> None:
     """Call on app startup.  Connects to Redis if REDIS_URL env var is set."""
-    global _client, _connected
+    global _client, _connected, _subscriber_task
     if not _PACKAGE_PRESENT:
-        logger.info("redis package not installed — caching disabled")
+        logger.info("redis package not installed — Redis tier disabled")
         return
     url = os.getenv("REDIS_URL", "").strip()
     if not url:
-        logger.info("REDIS_URL not set — caching disabled (graceful bypass)")
+        logger.info("REDIS_URL not set — Redis tier disabled (graceful bypass)")
         return
     try:
         _client = _aioredis.from_url(url, encoding="utf-8", decode_responses=True)
@@ -39,14 +127,23 @@ async def connect() -> None:
         safe_url = url.split("@")[-1] if "@" in url else url
         logger.info("Redis connected: %s", safe_url)
     except Exception as exc:
-        logger.warning("Redis connection failed — caching disabled: %s", exc)
+        logger.warning("Redis connection failed — Redis tier disabled: %s", exc)
         _client = None
         _connected = False
+        return
+    _subscriber_task = asyncio.get_running_loop().create_task(_listen_invalidations())
 
 
 async def disconnect() -> None:
     """Call on app shutdown."""
-    global _client, _connected
+    global _client, _connected, _subscriber_task
+    if _subscriber_task is not None:
+        _subscriber_task.cancel()
+        try:
+            await _subscriber_task
+        except asyncio.CancelledError:
+            pass
+        _subscriber_task = None
     if _client is not None:
         try:
             await _client.aclose()
@@ -54,39 +151,217 @@ async def disconnect() -> None:
             pass
         _client = None
     _connected = False
+    _local.clear()
 
 
 def is_available() -> bool:
     return _connected
 
 
+def redis_client() -> Optional[Any]:
+    """Connected Redis client for other pub/sub users (e.g. the SSE bus), else None."""
+    return _client if _connected else None
+
+
+def clear_local() -> None:
+    """Drop every L1 entry of this worker (tests, manual resets)."""
+    _local.clear()
+
+
 async def get(key: str) -> Optional[Any]:
     """Return deserialized value, or None on miss / error / bypass."""
+    found, value = _local.get(key)
+    if found:
+        collector.record_cache_tier("local", hit=True)
+        return value
+    collector.record_cache_tier("local", hit=False)
+
     if not _connected or _client is None:
         return None
     try:
-        raw = await _client.get(key)
-        return json.loads(raw) if raw is not None else None
+        async with _client.pipeline(transaction=False) as pipe:
+            pipe.get(key)
+            pipe.pttl(key)
+            raw, pttl = await pipe.execute()
     except Exception as exc:
         logger.warning("Redis GET error key=%s: %s", key, exc)
         return None
 
+    if raw is None:
+        collector.record_cache_tier("redis", hit=False)
+        return None
+    collector.record_cache_tier("redis", hit=True)
+    value = json.loads(raw)
+    local_ttl = LOCAL_TTL_SECONDS if pttl is None or pttl < 0 else min(LOCAL_TTL_SECONDS, pttl / 1000)
+    if local_ttl > 0:
+        _local.set(key, value, local_ttl)
+    return value
+
 
 async def set(key: str, value: Any, ttl: int = 300) -> None:
-    """Serialize to JSON and store with TTL seconds.  No-op on error."""
+    """Serialize to JSON and store with TTL seconds in both tiers.  Redis errors are ignored."""
+    encoded = json.dumps(value, default=str)
+    # L1 holds the JSON round-tripped value so both tiers return identical shapes
+    # (e.g. datetimes as strings) regardless of which one served the hit.
+    _local.set(key, json.loads(encoded), min(ttl, LOCAL_TTL_SECONDS))
     if not _connected or _client is None:
         return
     try:
-        await _client.setex(key, ttl, json.dumps(value, default=str))
+        await _client.setex(key, ttl, encoded)
     except Exception as exc:
         logger.warning("Redis SET error key=%s: %s", key, exc)
+        return
+    await _publish_invalidation(key)
 
 
 async def delete(*keys: str) -> None:
-    """Delete one or more keys.  No-op on error / bypass."""
-    if not _connected or _client is None or not keys:
+    """Delete one or more keys from both tiers and tell other workers.  No-op on error / bypass."""
+    if not keys:
+        return
+    for key in keys:
+        _generations[key] = _generations.get(key, 0) + 1
+    _local.discard(*keys)
+    if not _connected or _client is None:
         return
     try:
         await _client.delete(*keys)
     except Exception as exc:
         logger.warning("Redis DELETE error keys=%s: %s", keys, exc)
+    await _publish_invalidation(*keys)
+
+
+# ── Stampede protection ──────────────────────────────────────────────────────
+
+Loader = Callable[[], Awaitable[Any]]
+
+# key → leader'ın sonucunu bekleyen future (bu worker'daki uçuştaki yüklemeler)
+_inflight: dict[str, asyncio.Future] = {}
+# key → delete() sayacı; yükleme sürerken silinen anahtara eski değer yazılmasın
+_generations: dict[str, int] = {}
+
+
+class _LeaderCancelled(Exception):
+    """Leader iptal edildi; bekleyenler yüklemeyi kendileri üstlenir."""
+
+
+async def single_flight(key: str, loader: Loader) -> Any:
+    """Run `loader` once for all concurrent callers of `key` in this worker."""
+    while True:
+        pending = _inflight.get(key)
+        if pending is None:
+            break
+        try:
+            # shield: bekleyen bir isteğin iptali ortak future'ı iptal etmesin
+            return await asyncio.shield(pending)
+        except _LeaderCancelled:
+            continue
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight[key] = future
+    try:
+        value = await loader()
+    except asyncio.CancelledError:
+        future.set_exception(_LeaderCancelled())
+        raise
+    except Exception as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(value)
+        return value
+    finally:
+        _inflight.pop(key, None)
+        if future.done() and not future.cancelled():
+            future.exception()  # bekleyen yoksa "never retrieved" uyarısını sustur
+
+
+def _should_refresh_early(envelope: dict, beta: float, now: float) -> bool:
+    """XFetch: now − delta·beta·ln(U) ≥ expiry (U ∈ (0, 1])."""
+    delta = max(float(envelope.get("delta", 0.0)), 0.0)
+    return now - delta * beta * math.log(1.0 - random.random()) >= envelope["exp"]
+
+
+async def get_or_load(
+    key: str,
+    loader: Loader,
+    *,
+    ttl: int = 300,
+    resource: Optional[str] = None,
+    beta: float = 1.0,
+) -> Any:
+    """Cache-aside read with single-flight loading and probabilistic early expiry.
+
+    `resource` names the cache_hits_total / cache_misses_total series to record.
+    Entries are stored as {"v": value, "delta": load seconds, "exp": epoch expiry}.
+    """
+    envelope = await get(key)
+    if not (isinstance(envelope, dict) and "v" in envelope and "exp" in envelope):
+        envelope = None
+
+    if envelope is not None:
+        refresh = _should_refresh_early(envelope, beta, time.time())
+        # Başka biri zaten erken yeniliyorsa beklemeden mevcut değeri ver.
+        if not refresh or key in _inflight:
+            if resource:
+                collector.record_cache_hit(resource)
+            return envelope["v"]
+
+    if resource:
+        collector.record_cache_miss(resource)
+
+    async def _load_and_store() -> Any:
+        generation = _generations.get(key, 0)
+        started = time.monotonic()
+        value = await loader()
+        delta = time.monotonic() - started
+        if _generations.get(key, 0) == generation:
+            await set(key, {"v": value, "delta": delta, "exp": time.time() + ttl}, ttl=ttl)
+        return value
+
+    return await single_flight(key, _load_and_store)
+
+
+# ── Cross-worker invalidation ────────────────────────────────────────────────
+
+async def _publish_invalidation(*keys: str) -> None:
+    try:
+        await _client.publish(
+            INVALIDATION_CHANNEL, json.dumps({"origin": _INSTANCE_ID, "keys": list(keys)})
+        )
+    except Exception as exc:
+        logger.warning("Redis PUBLISH error keys=%s: %s", keys, exc)
+
+
+def _apply_invalidation(raw: str) -> None:
+    try:
+        message = json.loads(raw)
+    except (TypeError, ValueError):
+        return
+    if message.get("origin") == _INSTANCE_ID:
+        return
+    _local.discard(*message.get("keys", ()))
+
+
+async def _listen_invalidations() -> None:
+    """One subscriber per worker; reconnects after errors."""
+    while True:
+        pubsub = None
+        try:
+            pubsub = _client.pubsub()
+            await pubsub.subscribe(INVALIDATION_CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _apply_invalidation(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Cache invalidation subscriber error: %s", exc)
+            # Missed messages may have left L1 stale — start from a clean slate.
+            _local.clear()
+            await asyncio.sleep(1.0)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
@@ -0,0 +1,180 @@
+"""
+Toplu (vektörel) deprem ↔ tercih eşleştirme.
+
+`find_matches` her (tercih, deprem) çifti için `earthquake_matches_preference`
+çağırır; 100k+ tercihli artçı sarsıntı fırtınalarında bu on milyonlarca Python
+çağrısı demektir. Bu modül tercihleri sütunsal NumPy dizilerine paketler ve tüm
+depremleri tüm tercihlerle dizi işlemleriyle değerlendirir.
+
+Sonuç skaler yolla birebir aynıdır: aynı (tercih, deprem) çiftleri, aynı sırada
+(tercih-öncelikli). Eksik (None) alanlar NaN olarak taşınır.
+"""
+
+import math
+from datetime import datetime, timezone
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from app.core.eq_matching import _to_float
+
+_EARTH_RADIUS_KM = 6371.0
+
+# Tek blokta değerlendirilecek en fazla (tercih × deprem) hücresi; bellek tavanı.
+_MAX_CELLS_PER_CHUNK = 1_000_000
+
+
+def _objects(values: Sequence[Any]) -> np.ndarray:
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _col(values: Sequence[Any]) -> np.ndarray:
+    return np.array(
+        [np.nan if v is None else float(v) for v in values], dtype=np.float64
+    )
+
+
+class PreferenceColumns:
+    """Tercih listesinin sütunsal (columnar) temsili.
+
+    Bir kez paketlenir, birden çok deprem turunda yeniden kullanılabilir.
+    """
+
+    __slots__ = (
+        "prefs",
+        "objects",
+        "enabled",
+        "min_magnitude",
+        "max_depth_km",
+        "ref_lat",
+        "ref_lon",
+        "radius_km",
+        "quiet_start",
+        "quiet_end",
+        "override_magnitude",
+    )
+
+    def __init__(self, prefs: Sequence[Any]) -> None:
+        self.prefs = list(prefs)
+        self.objects = _objects(self.prefs)
+        self.enabled = np.array([bool(p.enabled) for p in self.prefs], dtype=bool)
+        self.min_magnitude = _col([p.min_magnitude for p in self.prefs])
+        self.max_depth_km = _col([p.max_depth_km for p in self.prefs])
+        self.ref_lat = _col([p.reference_lat for p in self.prefs])
+        self.ref_lon = _col([p.reference_lon for p in self.prefs])
+        self.radius_km = _col([p.radius_km for p in self.prefs])
+        self.quiet_start = _col([getattr(p, "quiet_hours_start", None) for p in self.prefs])
+        self.quiet_end = _col([getattr(p, "quiet_hours_end", None) for p in self.prefs])
+        self.override_magnitude = _col(
+            [getattr(p, "critical_override_magnitude", None) for p in self.prefs]
+        )
+
+    def __len__(self) -> int:
+        return len(self.prefs)
+
+    def quiet_now(self, hour: int) -> np.ndarray:
+        """Saate göre sessiz pencerede olan tercihler (büyüklük istisnası hariç)."""
+        start, end = self.quiet_start, self.quiet_end
+        has_window = ~np.isnan(start) & ~np.isnan(end)
+        same_day = (start <= hour) & (hour < end)
+        wraps = (hour >= start) | (hour < end)
+        return has_window & np.where(start <= end, same_day, wraps)
+
+
+def _haversine_matrix(
+    lat1: np.ndarray, lon1: np.ndarray, lat2: np.ndarray, lon2: np.ndarray
+) -> np.ndarray:
+    """(P,) × (E,) → (P, E) büyük-daire mesafesi; `haversine_km` ile aynı formül."""
+    lat1 = lat1[:, None]
+    lon1 = lon1[:, None]
+    lat2 = lat2[None, :]
+    lon2 = lon2[None, :]
+    dlat = np.radians(lat2 - lat1)
+    dlon = np.radians(lon2 - lon1)
+    a = (
+        np.sin(dlat / 2) ** 2
+        + np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) * np.sin(dlon / 2) ** 2
+    )
+    return _EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def _match_block(
+    cols: PreferenceColumns,
+    rows: slice,
+    quiet: np.ndarray,
+    mag: np.ndarray,
+    depth: np.ndarray,
+    lat: np.ndarray,
+    lon: np.ndarray,
+) -> np.ndarray:
+    """Bir tercih bloğu için (P_blok, E) eşleşme maskesi."""
+    min_mag = cols.min_magnitude[rows][:, None]
+    ok = cols.enabled[rows][:, None] & (mag[None, :] >= min_mag)
+
+    max_depth = cols.max_depth_km[rows][:, None]
+    # NaN karşılaştırmaları False döner: derinlik/limit eksikse filtre atlanır.
+    ok &= ~(depth[None, :] > max_depth)
+
+    radius = cols.radius_km[rows]
+    has_radius = ~np.isnan(radius)
+    if has_radius.any():
+        idx = np.flatnonzero(has_radius)
+        dist = _haversine_matrix(
+            cols.ref_lat[rows][idx], cols.ref_lon[rows][idx], lat, lon
+        )
+        # Referans ya da deprem koordinatı eksikse mesafe NaN → eşleşmez.
+        ok[idx] &= dist <= radius[idx][:, None]
+
+    quiet_rows = quiet[rows]
+    if quiet_rows.any():
+        idx = np.flatnonzero(quiet_rows)
+        override = cols.override_magnitude[rows][idx][:, None]
+        ok[idx] &= mag[None, :] >= override
+
+    return ok
+
+
+def find_matches_bulk(
+    earthquakes: list[dict],
+    prefs: Sequence[Any] | PreferenceColumns,
+    *,
+    now_hour: Optional[int] = None,
+) -> list[tuple[Any, dict]]:
+    """`find_matches` ile aynı (tercih, deprem) çiftlerini dizi işlemleriyle döndür.
+
+    prefs: tercih nesneleri ya da önceden paketlenmiş `PreferenceColumns`.
+    now_hour: sessiz saat kontrolü için UTC saat; verilmezse şimdiki saat.
+    """
+    cols = prefs if isinstance(prefs, PreferenceColumns) else PreferenceColumns(prefs)
+    if not earthquakes or not len(cols):
+        return []
+
+    mag = _col([_to_float(eq.get("mag")) for eq in earthquakes])
+    # Büyüklüğü okunamayan ya da hiçbir eşiği geçemeyen depremleri baştan ele.
+    floor = np.nanmin(cols.min_magnitude) if not np.isnan(cols.min_magnitude).all() else math.inf
+    live = np.flatnonzero(mag >= floor)
+    if live.size == 0:
+        return []
+
+    quakes = [earthquakes[i] for i in live]
+    mag = mag[live]
+    depth = _col([_to_float(eq.get("depth")) for eq in quakes])
+    lat = _col([_to_float(eq.get("lat")) for eq in quakes])
+    lon = _col([_to_float(eq.get("lon")) for eq in quakes])
+
+    hour = now_hour if now_hour is not None else datetime.now(timezone.utc).hour
+    quiet = cols.quiet_now(hour)
+
+    quake_objects = _objects(quakes)
+    matches: list[tuple[Any, dict]] = []
+    step = max(1, _MAX_CELLS_PER_CHUNK // len(quakes))
+    for start in range(0, len(cols), step):
+        rows = slice(start, start + step)
+        ok = _match_block(cols, rows, quiet, mag, depth, lat, lon)
+        pref_idx, eq_idx = np.nonzero(ok)
+        matches.extend(
+            zip(cols.objects[rows][pref_idx].tolist(), quake_objects[eq_idx].tolist())
+        )
+    return matches
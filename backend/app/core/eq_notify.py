@@ -8,10 +8,13 @@ tekrar gönderilmesini engeller. Eşleştirme yüklemi GS-100'den gelir.
 
 from typing import Any, Awaitable, Callable, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.eq_bulk_matching import find_matches_bulk
 from app.core.eq_matching import earthquake_matches_preference
+from app.core.push_delivery import IN_CHUNK_SIZE, Progress, fan_out, subscriptions_by_user
 from app.models.earthquake_notification_pref import EarthquakeNotificationPref
 from app.models.earthquake_notification_sent import EarthquakeNotificationSent
 from app.models.push_subscription import PushSubscription
@@ -36,7 +39,9 @@ def earthquake_key(eq: dict) -> str:
 def find_matches(
     earthquakes: list[dict], prefs: list[Any]
 ) -> list[tuple[Any, dict]]:
-    """Eşleşen (tercih, deprem) çiftlerini döndür (saf, yan etkisiz)."""
+    """Eşleşen (tercih, deprem) çiftlerini döndür (saf, yan etkisiz).
+
+    Skaler referans yol; sevkiyat aynı sonucu veren `find_matches_bulk` kullanır."""
     matches: list[tuple[Any, dict]] = []
     for pref in prefs:
         for eq in earthquakes:
@@ -50,8 +55,9 @@ async def dispatch_earthquake_notifications(
     earthquakes: list[dict],
     *,
     sender: Optional[Sender] = None,
+    on_progress: Optional[Progress] = None,
 ) -> dict:
-    """Bir tarama turu çalıştır: eşleştir, push gönder, dedup yaz, özet döndür."""
+    """Bir tarama turu çalıştır: eşleştir, dedup ayır, push gönder, özet döndür."""
     if sender is None:
         from app.api.push import _send_one as sender  # geç import (test enjeksiyonu)
 
@@ -72,59 +78,99 @@ async def dispatch_earthquake_notifications(
     )
     prefs = list(prefs_result.scalars().all())
 
-    matches = find_matches(earthquakes, prefs)
+    matches = find_matches_bulk(earthquakes, prefs)
     summary["matches"] = len(matches)
     if not matches:
         return summary
 
-    # Bu turdaki anahtarlar için mevcut dedup kayıtlarını ön-yükle
-    keys = {earthquake_key(eq) for _, eq in matches}
-    sent_result = await db.execute(
-        select(
-            EarthquakeNotificationSent.user_id,
-            EarthquakeNotificationSent.eq_key,
-        ).where(EarthquakeNotificationSent.eq_key.in_(keys))
-    )
-    already_sent: set[tuple[int, str]] = {(row.user_id, row.eq_key) for row in sent_result}
-
-    committed_any = False
+    # 1) Aday (kullanıcı, deprem) çiftleri ve bu kullanıcıların tüm abonelikleri
+    #    (tek parçalı IN sorgusu). Aboneliği olmayan kullanıcı için ayırma yapılmaz.
+    candidates: dict[tuple[int, str], dict] = {}
     for pref, eq in matches:
-        user_id = pref.user_id
-        key = earthquake_key(eq)
-        if (user_id, key) in already_sent:
-            summary["skipped_already_sent"] += 1
-            continue
+        candidates.setdefault((pref.user_id, earthquake_key(eq)), eq)
 
-        subs_result = await db.execute(
-            select(PushSubscription).where(PushSubscription.user_id == user_id)
-        )
-        subs = list(subs_result.scalars().all())
-        if not subs:
+    subs_by_user = await subscriptions_by_user(db, {user_id for user_id, _ in candidates})
+
+    wanted: list[dict] = []
+    for user_id, key in candidates:
+        if not subs_by_user.get(user_id):
             summary["matched_no_subscription"] += 1
             continue
-
-        payload = _build_payload(eq)
+        wanted.append({"user_id": user_id, "eq_key": key})
+
+    # 2) Göndermeden önce ayır: ON CONFLICT DO NOTHING RETURNING yalnızca bu
+    #    turun kazandığı çiftleri döndürür. Aynı depremi eşzamanlı işleyen başka
+    #    bir tur (ya da geri alınıp yeniden çalışan iş) çifti zaten ayırmışsa
+    #    gönderim yapılmaz.
+    won = await _reserve_sent_rows(db, wanted)
+    summary["skipped_already_sent"] += len(wanted) - len(won)
+
+    planned: list[tuple[int, str, list[PushSubscription], dict]] = [
+        (row["user_id"], row["eq_key"], subs_by_user[row["user_id"]],
+         _build_payload(candidates[(row["user_id"], row["eq_key"])]))
+        for row in wanted
+        if (row["user_id"], row["eq_key"]) in won
+    ]
+
+    # 3) Tüm gönderimler tek seferde, sınırlı eşzamanlılıkla
+    send_jobs = [(sub, payload) for _, _, subs, payload in planned for sub in subs]
+    results = iter(await fan_out(send_jobs, sender, on_progress=on_progress))
+
+    # 4) Kullanıcı bazında özet; hiçbir aboneliğine ulaşılamayan kullanıcının
+    #    ayırması bırakılır ki sonraki tur yeniden deneyebilsin
+    released: list[tuple[int, str]] = []
+    for user_id, key, subs, _ in planned:
         any_success = False
-        for sub in subs:
-            ok = await sender(sub, payload)
-            if ok:
+        for _sub in subs:
+            if next(results):
                 summary["push_sent"] += 1
                 any_success = True
             else:
                 summary["push_failed"] += 1
 
         if any_success:
-            db.add(EarthquakeNotificationSent(user_id=user_id, eq_key=key))
-            already_sent.add((user_id, key))
             summary["users_notified"] += 1
-            committed_any = True
+        else:
+            released.append((user_id, key))
 
-    if committed_any:
-        await db.commit()
+    if released:
+        await _release_sent_rows(db, released)
 
     return summary
 
 
+async def _reserve_sent_rows(db: AsyncSession, rows: list[dict]) -> set[tuple[int, str]]:
+    """Dedup kayıtlarını parçalı toplu INSERT … RETURNING ile ayır, commit et.
+
+    Dönen küme bu turun yazdığı (kazandığı) çiftlerdir; çakışan satırlar
+    (başka tur önce yazmış) sessizce atlanır ve kümede yer almaz."""
+    won: set[tuple[int, str]] = set()
+    for start in range(0, len(rows), IN_CHUNK_SIZE):
+        result = await db.execute(
+            pg_insert(EarthquakeNotificationSent)
+            .values(rows[start : start + IN_CHUNK_SIZE])
+            .on_conflict_do_nothing(constraint="uq_eq_notif_sent_user_key")
+            .returning(EarthquakeNotificationSent.user_id, EarthquakeNotificationSent.eq_key)
+        )
+        won.update((row.user_id, row.eq_key) for row in result)
+    # Ayırma gönderimden önce görünür olmalı; eşzamanlı tur bunu görüp atlar.
+    await db.commit()
+    return won
+
+
+async def _release_sent_rows(db: AsyncSession, pairs: list[tuple[int, str]]) -> None:
+    """Gönderimi tamamen başarısız olan çiftlerin ayırmasını geri al."""
+    for start in range(0, len(pairs), IN_CHUNK_SIZE):
+        await db.execute(
+            delete(EarthquakeNotificationSent).where(
+                tuple_(EarthquakeNotificationSent.user_id, EarthquakeNotificationSent.eq_key).in_(
+                    pairs[start : start + IN_CHUNK_SIZE]
+                )
+            )
+        )
+    await db.commit()
+
+
 def _build_payload(eq: dict) -> dict:
     mag = eq.get("mag")
     title = eq.get("title", "Deprem")
@@ -0,0 +1,261 @@
+"""
+Süreç-içi deprem feed yoklayıcısı — artımlı (yalnızca yeni depremler) sevkiyat.
+
+Bildirim taraması eskiden yalnızca POST /earthquakes/dispatch-notifications ile
+tetikleniyor ve her seferinde üç günlük feed baştan indiriliyordu. Yoklayıcı:
+
+  - son POLL_DAYS günün Kandilli sayfasını EQ_POLL_INTERVAL_SECONDS'da bir,
+    koşullu istekle (If-None-Match / If-Modified-Since) çeker; 304 gelen sayfa
+    yeniden indirilmez (doğrulayıcılar ve son gövde süreç başına önbellekte),
+  - görülen en yeni `earthquake_key` için yüksek su işareti (high-water mark)
+    tutar; yalnızca işaretten sonra beliren depremler sevkiyata gider,
+  - sevkiyatı `earthquake_dispatch` işi olarak kuyruğa yazar (app/core/jobs.py);
+    aynı süreçteki worker hemen uyanır, deneme/ilerleme oradan gelir.
+
+Çok worker'lı dağıtımda her tur `pg_try_advisory_xact_lock` ile korunur; aynı
+anda yalnızca bir worker farkı hesaplar. Yüksek su işareti ve pencere
+anahtarları süreç belleğinde değil `earthquake_poller_state` satırında durur;
+kilidi alan worker onu okur, günceller ve işi aynı transaction'da kuyruğa
+yazar — kilidi sırayla farklı worker'lar alsa da aynı deprem iki kez kuyruğa
+girmez. Feed HTTP ile kilit ve transaction açılmadan önce çekilir; yavaş bir
+feed havuzdan bağlantı tutmaz.
+
+Durum satırı hiç yoksa (ilk kurulum) o turdaki feed yalnızca işaret olarak
+kaydedilir, sevkiyat yapılmaz: yoklayıcı açılmadan önceki depremler için
+bildirim gönderilmez. Yine de aynı deprem iki işe girerse (ör. elle tetiklenen
+tarama) alıcı başına tekrar, sevkiyattaki (user_id, eq_key) ayırması ile
+önlenir (app/core/eq_notify.py).
+
+Env:
+  EQ_POLLER_ENABLED          — yoklayıcı çalışsın mı (varsayılan true)
+  EQ_POLL_INTERVAL_SECONDS   — yoklama aralığı (varsayılan 30)
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Optional
+
+import httpx
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core import jobs
+from app.core.eq_notify import earthquake_key
+from app.models.earthquake_poller_state import EarthquakePollerState
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+ENABLED = _env_flag("EQ_POLLER_ENABLED", True)
+INTERVAL_SECONDS = max(5.0, _env_float("EQ_POLL_INTERVAL_SECONDS", 30.0))
+# Bugün + dün: gece yarısı civarı gecikmeli yayımlanan kayıtlar kaçmasın.
+POLL_DAYS = 2
+# Yüksek su işaretinden bu kadar geride tarihlenen kayıtlar da "yeni" sayılabilir
+# (Kandilli kayıtları dakikalar sonra yayımlayabilir / büyüklüğü revize edebilir).
+LATE_ARRIVAL_WINDOW = timedelta(minutes=30)
+_ADVISORY_LOCK_KEY = 0x45515F504F4C4C  # "EQ_POLL"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+_STATE_ID = 1
+
+
+def _parse_date(value: str) -> Optional[datetime]:
+    try:
+        return datetime.strptime(value, _DATE_FORMAT)
+    except (TypeError, ValueError):
+        return None
+
+
+class EarthquakePoller:
+    """Koşullu istek doğrulayıcıları (süreç başına) + turda kullanılan işaret durumu.
+
+    `high_water` / `_recent` her turda `earthquake_poller_state`'ten yüklenir ve
+    oraya geri yazılır; bellekteki kopya yalnızca o turun hesabı içindir.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self._transport = transport
+        # url → (ETag, Last-Modified, son gövdenin ham kayıtları)
+        self._pages: dict[str, tuple[Optional[str], Optional[str], list[dict]]] = {}
+        self.high_water: Optional[str] = None
+        # Geç gelme penceresi içindeki, daha önce görülmüş anahtarlar
+        self._recent: set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    # ── Fark (diff) ──────────────────────────────────────────────────────────
+
+    def diff(self, earthquakes: list[dict]) -> list[dict]:
+        """Yüksek su işaretinden sonra beliren depremleri döndür, işareti ilerlet.
+
+        İşaret yoksa tüm liste yenidir; `tick` bu durumu (paylaşılan durum satırı
+        henüz yok) sevkiyatsız başlangıç turu olarak ele alır.
+        """
+        floor = None
+        if self.high_water is not None:
+            hw_date = _parse_date(self.high_water.split("|", 1)[0])
+            if hw_date is not None:
+                floor = (hw_date - LATE_ARRIVAL_WINDOW).strftime(_DATE_FORMAT)
+
+        fresh: list[dict] = []
+        for eq in earthquakes:
+            key = earthquake_key(eq)
+            if key in self._recent:
+                continue
+            if floor is not None and (eq.get("date") or "") < floor:
+                continue
+            fresh.append(eq)
+            self._recent.add(key)
+            if self.high_water is None or key > self.high_water:
+                self.high_water = key
+
+        # Pencerenin gerisine düşen anahtarları unut; küme sınırlı kalır.
+        hw_date = _parse_date((self.high_water or "").split("|", 1)[0])
+        if hw_date is not None:
+            cutoff = (hw_date - LATE_ARRIVAL_WINDOW).strftime(_DATE_FORMAT)
+            self._recent = {k for k in self._recent if k >= cutoff}
+        return fresh
+
+    # ── Çekme ────────────────────────────────────────────────────────────────
+
+    async def _fetch_page(self, client: httpx.AsyncClient, url: str) -> tuple[bool, list[dict]]:
+        """(değişti mi, ham kayıtlar). 304'te önbellekteki gövde döner."""
+        etag, last_modified, cached = self._pages.get(url, (None, None, []))
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        response = await client.get(url, headers=headers)
+        if response.status_code == 304:
+            return False, cached
+        response.raise_for_status()
+        results = response.json().get("result", [])
+        self._pages[url] = (
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            results,
+        )
+        return True, results
+
+    async def fetch_feed(self) -> list[dict]:
+        """Son POLL_DAYS günü koşullu çek; normalize edilmiş tüm depremler.
+
+        304 dönen sayfanın önbellekteki gövdesi kullanılır. Fark (yeni olanlar)
+        burada değil, paylaşılan durumla `tick` içinde hesaplanır: bu süreç
+        sayfayı değişmemiş görse de işaret başka bir worker'ın turunda geride
+        kalmış olabilir.
+        """
+        from app.api.earthquakes import KANDILLI_BASE, _normalize_feed  # geç import
+
+        now = datetime.now()
+        urls = [
+            f"{KANDILLI_BASE}?date={(now - timedelta(days=i)).strftime('%Y-%m-%d')}&limit=500"
+            for i in range(POLL_DAYS)
+        ]
+        # Gün değişince artık yoklanmayan sayfaların doğrulayıcılarını bırak.
+        self._pages = {u: v for u, v in self._pages.items() if u in urls}
+
+        raw: list[dict] = []
+        async with httpx.AsyncClient(timeout=15, transport=self._transport) as client:
+            for url in urls:
+                try:
+                    _changed, results = await self._fetch_page(client, url)
+                except Exception as exc:
+                    logger.warning("Earthquake poll failed url=%s: %s", url, exc)
+                    continue
+                raw.extend(results)
+        return _normalize_feed(raw)
+
+    # ── Döngü ────────────────────────────────────────────────────────────────
+
+    async def tick(self) -> int:
+        """Bir yoklama turu; kuyruğa alınan deprem sayısını döndürür."""
+        from app.api.push import _vapid_configured  # geç import (döngüsel import önlemi)
+
+        if not _vapid_configured():
+            return 0
+        # HTTP çekimi transaction dışında: feed yavaşken bağlantı ve kilit tutulmaz
+        earthquakes = await self.fetch_feed()
+        if not earthquakes:
+            return 0
+
+        async with jobs._session_factory() as db:
+            locked = (
+                await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+                )
+            ).scalar()
+            if not locked:
+                await db.rollback()
+                return 0
+
+            state = await db.get(EarthquakePollerState, _STATE_ID)
+            baseline = state is None
+            self.high_water = None if baseline else state.high_water
+            self._recent = set() if baseline else set(state.recent or [])
+            fresh = self.diff(earthquakes)
+
+            values = {"high_water": self.high_water, "recent": sorted(self._recent)}
+            upsert = pg_insert(EarthquakePollerState).values(id=_STATE_ID, **values)
+            await db.execute(
+                upsert.on_conflict_do_update(
+                    index_elements=[EarthquakePollerState.id],
+                    set_={**values, "updated_at": func.now()},
+                )
+            )
+            if baseline or not fresh:
+                await db.commit()
+                if baseline:
+                    logger.info("Earthquake poller baseline set at %s (nothing dispatched)", self.high_water)
+                return 0
+            # enqueue durum güncellemesiyle birlikte commit eder; advisory xact
+            # kilidi de onunla bırakılır.
+            await jobs.enqueue(db, "earthquake_dispatch", {"earthquakes": fresh})
+        logger.info("Earthquake poller queued %d new quake(s)", len(fresh))
+        return len(fresh)
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("Earthquake poller error: %s", exc)
+            await asyncio.sleep(INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Uygulama açılışında çağrılır; EQ_POLLER_ENABLED=false ise no-op."""
+        if not ENABLED or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        logger.info("Earthquake feed poller started (interval=%ss)", INTERVAL_SECONDS)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+poller = EarthquakePoller()
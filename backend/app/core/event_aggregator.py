@@ -0,0 +1,75 @@
+"""
+Olay toplayıcı (event aggregator) — sık gelen güncellemeleri kısa bir pencerede toplar.
+
+Bir grup (ör. depo) için ilk güncelleme pencereyi açar; pencere boyunca aynı
+gruba gelen güncellemeler öğe anahtarına göre birleştirilir (son yazan kazanır)
+ve pencere kapanınca grup başına tek bir `emit(group, items)` çağrılır.
+Pencere sabittir (her güncellemeyle uzamaz), yani gecikme en fazla `window` kadardır.
+window <= 0 ise toplama yapılmaz; her güncelleme hemen tek öğelik grup olarak gönderilir.
+
+Tek event loop içinde çalışır; kilit gerekmez. Toplama worker başınadır.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger(__name__)
+
+Emit = Callable[[Hashable, list[dict]], Awaitable[None]]
+
+
+class EventAggregator:
+    def __init__(
+        self,
+        window: float,
+        emit: Emit,
+        *,
+        group_key: Callable[[dict], Hashable],
+        item_key: Callable[[dict], Hashable],
+    ) -> None:
+        self.window = window
+        self._emit = emit
+        self._group_key = group_key
+        self._item_key = item_key
+        # group → {item key → latest update}; dict insertion order = first-change order
+        self._pending: dict[Hashable, dict[Hashable, dict]] = {}
+        self._timers: dict[Hashable, asyncio.Task] = {}
+
+    def pending(self) -> int:
+        return sum(len(items) for items in self._pending.values())
+
+    async def add(self, update: dict) -> None:
+        group = self._group_key(update)
+        if self.window <= 0:
+            await self._send(group, [update])
+            return
+        bucket = self._pending.get(group)
+        if bucket is None:
+            bucket = self._pending[group] = {}
+            self._timers[group] = asyncio.get_running_loop().create_task(self._flush_later(group))
+        bucket[self._item_key(update)] = update
+
+    async def flush(self) -> None:
+        """Emit every open window now (shutdown, tests)."""
+        for task in self._timers.values():
+            task.cancel()
+        self._timers.clear()
+        for group in list(self._pending):
+            await self._flush_group(group)
+
+    async def _flush_later(self, group: Hashable) -> None:
+        await asyncio.sleep(self.window)
+        self._timers.pop(group, None)
+        await self._flush_group(group)
+
+    async def _flush_group(self, group: Hashable) -> None:
+        bucket = self._pending.pop(group, None)
+        if bucket:
+            await self._send(group, list(bucket.values()))
+
+    async def _send(self, group: Any, items: list[dict]) -> None:
+        try:
+            await self._emit(group, items)
+        except Exception as exc:
+            logger.warning("Aggregated event emit failed group=%s: %s", group, exc)
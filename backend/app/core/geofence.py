@@ -3,7 +3,8 @@ Coğrafi alan (geofence) eşleştirme + sevkiyat — GS-023.
 
 Bir olay konumunu (lat, lon) kullanıcıların opt-in geofence aboneliğiyle eşleştirir
 ve dairesi içine düşen kullanıcılara Web Push gönderir. Mesafe hesabı GS-100'deki
-haversine yardımcısından gelir (tek doğruluk kaynağı).
+haversine yardımcısından gelir (tek doğruluk kaynağı). Aday abonelikler
+app/core/geofence_index ızgara indeksinden gelir; tüm tablo taranmaz.
 
 Mahremiyet: yalnızca kullanıcının kendi verdiği kaba referans konumu kullanılır;
 olay konumu bildirim gövdesine konmaz (sadece "yakınında" sinyali verilir).
@@ -14,7 +15,9 @@ from typing import Any, Awaitable, Callable, Optional
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import geofence_index, jobs
 from app.core.eq_matching import haversine_km
+from app.core.push_delivery import Progress, fan_out, subscriptions_by_user
 from app.models.geofence_subscription import GeofenceSubscription
 from app.models.push_subscription import PushSubscription
 
@@ -49,6 +52,7 @@ async def dispatch_geofenced_alert(
     url: str = "/",
     tag: str = "geosafe-geofence",
     sender: Optional[Sender] = None,
+    on_progress: Optional[Progress] = None,
 ) -> dict:
     """Olay konumunu tüm aboneliklerle eşleştir, eşleşen kullanıcılara push gönder.
 
@@ -65,8 +69,19 @@ async def dispatch_geofenced_alert(
         "matched_no_push_subscription": 0,
     }
 
+    grid = await geofence_index.index.ensure_loaded(db)
+    candidate_ids = grid.candidates(lat, lon)
+    if not candidate_ids:
+        return summary
+
+    # İndeks yalnızca aday daraltır; güncel satırla kesin eşleşmeyi doğrula.
     subs_result = await db.execute(
-        select(GeofenceSubscription).where(GeofenceSubscription.enabled.is_(True))
+        select(GeofenceSubscription)
+        .where(
+            GeofenceSubscription.id.in_(candidate_ids),
+            GeofenceSubscription.enabled.is_(True),
+        )
+        .order_by(GeofenceSubscription.id)
     )
     subs = list(subs_result.scalars().all())
 
@@ -77,19 +92,27 @@ async def dispatch_geofenced_alert(
 
     payload = {"title": title, "body": body, "url": url, "tag": tag}
 
+    push_by_user = await subscriptions_by_user(db, (sub.user_id for sub in matched))
+
+    planned: list[list[PushSubscription]] = []
     for sub in matched:
-        push_result = await db.execute(
-            select(PushSubscription).where(PushSubscription.user_id == sub.user_id)
-        )
-        push_subs = list(push_result.scalars().all())
+        push_subs = push_by_user.get(sub.user_id)
         if not push_subs:
             summary["matched_no_push_subscription"] += 1
             continue
+        planned.append(push_subs)
 
+    results = iter(
+        await fan_out(
+            [(ps, payload) for subs in planned for ps in subs],
+            sender,
+            on_progress=on_progress,
+        )
+    )
+    for push_subs in planned:
         any_success = False
-        for ps in push_subs:
-            ok = await sender(ps, payload)
-            if ok:
+        for _ps in push_subs:
+            if next(results):
                 summary["push_sent"] += 1
                 any_success = True
             else:
@@ -99,3 +122,18 @@ async def dispatch_geofenced_alert(
             summary["users_notified"] += 1
 
     return summary
+
+
+@jobs.handler("geofence_alert")
+async def _run_geofence_alert_job(db: AsyncSession, payload: dict, ctx: jobs.JobContext) -> dict:
+    """Arka plan işi: acil bildirim konumu için geofence alarmı (bkz. app/core/jobs.py)."""
+    return await dispatch_geofenced_alert(
+        db,
+        lat=payload["lat"],
+        lon=payload["lon"],
+        title=payload["title"],
+        body=payload["body"],
+        url=payload.get("url", "/"),
+        tag=payload.get("tag", "geosafe-geofence"),
+        on_progress=ctx.report,
+    )
@@ -0,0 +1,234 @@
+"""
+Geofence abonelikleri için süreç-içi ızgara (grid) mekânsal indeksi.
+
+Her etkin aboneliğin dairesini kapsayan sınırlayıcı kutu (bbox), sabit boyutlu
+enlem/boylam hücrelerine yazılır. "Bu nokta hangi dairelerin içinde?" sorusu
+tek hücre okuması + aday başına haversine ile, yaklaşık O(eşleşme) sürede
+yanıtlanır; abone tablosunun boyutundan bağımsızdır.
+
+İndeks bir kez (ilk sevkiyatta) DB'den kurulur. İndeks süreç başınadır;
+PUT /geofence/subscription yalnızca isteği karşılayan worker'ın indeksini
+günceller, alarm işi ise herhangi bir worker'da çalışabilir. Bu yüzden her
+eşleştirmeden önce ucuz bir artımlı tazeleme yapılır: son işaretten
+(görülen en büyük updated_at − REFRESH_OVERLAP) sonra değişen satırlar
+yeniden okunur (ix_geofence_subscriptions_updated_at). Örtüşme payı, işaretten
+önce başlayıp sonra commit edilen yazmaları da yakalar. Silinen abonelikler
+izlenmez: indekste kalan fazladan aday, sevkiyatta güncel DB satırıyla yapılan
+kesin doğrulamada elenir (indeks yalnızca aday daraltır). Güvenlik ağı olarak
+GEOFENCE_INDEX_MAX_AGE_SECONDS'da bir baştan kurulur.
+
+Env:
+  GEOFENCE_INDEX_CELL_DEG          — hücre boyu (derece, varsayılan 0.25 ≈ 28 km)
+  GEOFENCE_INDEX_MAX_AGE_SECONDS   — tam yeniden kurulum aralığı (varsayılan 300)
+"""
+
+import asyncio
+import math
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Any, NamedTuple, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.eq_matching import haversine_km
+from app.models.geofence_subscription import GeofenceSubscription
+
+_EARTH_RADIUS_KM = 6371.0
+
+# Artımlı tazelemede işaretin bu kadar gerisi de yeniden okunur (uzun süren
+# transaction'lar updated_at'ı commit'ten önce, başlangıç anında yazar).
+REFRESH_OVERLAP = timedelta(seconds=60)
+
+# Bundan fazla hücreye yayılan (çok büyük yarıçaplı) daireler ayrı listede taranır.
+_MAX_CELLS_PER_ENTRY = 256
+
+Cell = tuple[int, int]
+
+
+class _Entry(NamedTuple):
+    lat: float
+    lon: float
+    radius_km: float
+    cells: Optional[tuple[Cell, ...]]  # None → geniş daire (_wide kümesinde)
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class GeofenceGridIndex:
+    """Abonelik id → daire eşlemesi ve hücre → abonelik id kümeleri."""
+
+    def __init__(self, cell_deg: float = 0.25, max_age_seconds: float = 300.0) -> None:
+        self.cell_deg = cell_deg
+        self.max_age_seconds = max_age_seconds
+        self._lon_cells = max(1, math.ceil(360.0 / cell_deg))
+        self._entries: dict[int, _Entry] = {}
+        self._cells: dict[Cell, set[int]] = {}
+        self._wide: set[int] = set()
+        self._built_at: Optional[float] = None
+        # Görülen en büyük updated_at; artımlı tazeleme buradan devam eder
+        self._mark: Optional[datetime] = None
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # ── Hücre hesabı ─────────────────────────────────────────────────────────
+
+    def _cell(self, lat: float, lon: float) -> Cell:
+        row = math.floor((lat + 90.0) / self.cell_deg)
+        col = math.floor((lon + 180.0) / self.cell_deg) % self._lon_cells
+        return row, col
+
+    def _cover(self, lat: float, lon: float, radius_km: float) -> Optional[tuple[Cell, ...]]:
+        """Dairenin bbox'ını kapsayan hücreler; çok genişse None."""
+        # Küçük pay: sınırdaki noktalar kayan nokta hatasıyla bbox dışına düşmesin.
+        angular = (radius_km + 0.01) / _EARTH_RADIUS_KM
+        dlat = math.degrees(angular)
+        min_lat = max(-90.0, lat - dlat)
+        max_lat = min(90.0, lat + dlat)
+
+        # Küresel başlığın boylam yarı-genişliği; başlık kutbu içeriyorsa tam tur.
+        sin_ratio = math.sin(angular) / max(math.cos(math.radians(lat)), 1e-12)
+        if angular >= math.pi / 2 or sin_ratio >= 1.0:
+            return None
+        dlon = math.degrees(math.asin(sin_ratio))
+
+        row_lo, col_lo = self._cell(min_lat, lon - dlon)
+        row_hi, _ = self._cell(max_lat, lon + dlon)
+        n_cols = math.floor((lon + dlon + 180.0) / self.cell_deg) - math.floor(
+            (lon - dlon + 180.0) / self.cell_deg
+        ) + 1
+        if (row_hi - row_lo + 1) * n_cols > _MAX_CELLS_PER_ENTRY:
+            return None
+        return tuple(
+            (row, (col_lo + i) % self._lon_cells)
+            for row in range(row_lo, row_hi + 1)
+            for i in range(n_cols)
+        )
+
+    # ── Artımlı güncelleme ───────────────────────────────────────────────────
+
+    def remove(self, sub_id: int) -> None:
+        entry = self._entries.pop(sub_id, None)
+        if entry is None:
+            return
+        if entry.cells is None:
+            self._wide.discard(sub_id)
+            return
+        for cell in entry.cells:
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(sub_id)
+                if not bucket:
+                    del self._cells[cell]
+
+    def upsert(self, sub: Any) -> None:
+        """Abonelik satırını indekse yaz; eşleşemeyecek durumdaysa çıkar."""
+        self.remove(sub.id)
+        radius = sub.radius_km if sub.radius_km is not None else 0.0
+        if not sub.enabled or sub.center_lat is None or sub.center_lon is None or radius <= 0:
+            return
+        self._insert(sub.id, float(sub.center_lat), float(sub.center_lon), float(radius))
+
+    def _insert(self, sub_id: int, lat: float, lon: float, radius_km: float) -> None:
+        cells = self._cover(lat, lon, radius_km)
+        self._entries[sub_id] = _Entry(lat, lon, radius_km, cells)
+        if cells is None:
+            self._wide.add(sub_id)
+            return
+        for cell in cells:
+            self._cells.setdefault(cell, set()).add(sub_id)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._cells.clear()
+        self._wide.clear()
+        self._built_at = None
+        self._mark = None
+
+    # ── Sorgu ────────────────────────────────────────────────────────────────
+
+    def candidates(self, lat: float, lon: float) -> list[int]:
+        """(lat, lon) noktasını dairesi içinde tutan abonelik id'leri (artan sıra)."""
+        bucket = self._cells.get(self._cell(lat, lon), ())
+        hits = []
+        for sub_id in (*bucket, *self._wide):
+            entry = self._entries[sub_id]
+            if haversine_km(entry.lat, entry.lon, lat, lon) <= entry.radius_km:
+                hits.append(sub_id)
+        hits.sort()
+        return hits
+
+    # ── Kurulum ──────────────────────────────────────────────────────────────
+
+    def is_stale(self, now: Optional[float] = None) -> bool:
+        if self._built_at is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return now - self._built_at >= self.max_age_seconds
+
+    def _advance(self, updated_at: Optional[datetime]) -> None:
+        if updated_at is not None and (self._mark is None or updated_at > self._mark):
+            self._mark = updated_at
+
+    async def rebuild(self, db: AsyncSession) -> None:
+        mark = await db.scalar(select(func.max(GeofenceSubscription.updated_at)))
+        result = await db.execute(
+            select(
+                GeofenceSubscription.id,
+                GeofenceSubscription.center_lat,
+                GeofenceSubscription.center_lon,
+                GeofenceSubscription.radius_km,
+            ).where(
+                GeofenceSubscription.enabled.is_(True),
+                GeofenceSubscription.center_lat.isnot(None),
+                GeofenceSubscription.center_lon.isnot(None),
+                GeofenceSubscription.radius_km > 0,
+            )
+        )
+        self.clear()
+        for row in result:
+            self._insert(row.id, float(row.center_lat), float(row.center_lon), float(row.radius_km))
+        self._advance(mark)
+        self._built_at = time.monotonic()
+
+    async def refresh(self, db: AsyncSession) -> int:
+        """İşaretten (− örtüşme payı) sonra değişen abonelikleri indekse yaz; okunan satır sayısı."""
+        stmt = select(
+            GeofenceSubscription.id,
+            GeofenceSubscription.enabled,
+            GeofenceSubscription.center_lat,
+            GeofenceSubscription.center_lon,
+            GeofenceSubscription.radius_km,
+            GeofenceSubscription.updated_at,
+        )
+        if self._mark is not None:
+            stmt = stmt.where(GeofenceSubscription.updated_at >= self._mark - REFRESH_OVERLAP)
+        rows = (await db.execute(stmt)).all()
+        for row in rows:
+            # Devre dışı / konumsuz satır upsert'te indeksten çıkar
+            self.upsert(row)
+            self._advance(row.updated_at)
+        return len(rows)
+
+    async def ensure_loaded(self, db: AsyncSession) -> "GeofenceGridIndex":
+        """İndeks hiç kurulmadıysa ya da eskidiyse baştan kur; değilse artımlı tazele."""
+        async with self._lock:
+            if self.is_stale():
+                await self.rebuild(db)
+            else:
+                await self.refresh(db)
+        return self
+
+
+index = GeofenceGridIndex(
+    cell_deg=_env_float("GEOFENCE_INDEX_CELL_DEG", 0.25),
+    max_age_seconds=_env_float("GEOFENCE_INDEX_MAX_AGE_SECONDS", 300.0),
+)
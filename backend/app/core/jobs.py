@@ -0,0 +1,333 @@
+"""
+Kalıcı arka plan iş kuyruğu — bildirim fan-out işleri.
+
+İşler `dispatch_jobs` tablosuna yazılır (kalıcı: süreç yeniden başlasa da
+kaybolmaz). Her uygulama süreci bir worker görevi çalıştırır; worker
+`SELECT … FOR UPDATE SKIP LOCKED` ile sıradaki işi sahiplenir, böylece birden
+çok gunicorn worker'ı aynı işi iki kez çalıştırmaz. Hata alan iş üstel bekleme
+ile yeniden kuyruğa girer; `max_attempts` aşılırsa `failed` olur. Çalışırken
+düşen bir worker'ın işi `JOBS_STALE_SECONDS` sonra başka worker'a geçer; bu
+da bir deneme sayılır ve `max_attempts` dolmuşsa iş yeniden alınmaz, `failed`
+olur (worker'ı her seferinde düşüren bir iş sonsuza dek denenmez).
+
+Teslim garantisi "en az bir kez"dir: yeniden denenen ya da devralınan iş
+baştan çalışır. earthquake_dispatch her (kullanıcı, deprem) çiftini göndermeden
+önce dedup tablosunda ayırır, devralınan iş ayrılmış çiftlere yeniden göndermez
+(app/core/eq_notify.py); push_broadcast ve geofence_alert ise
+ilerlemeyi alıcı bazında kaydetmez — yarıda kalıp devralınan yayın, daha önce alan abonelere de
+yeniden gönderilir. Yayın bildirimlerinde (aynı `tag` ile tarayıcıda tek
+bildirime katlanır) bu kabul edilmiştir.
+
+İş türleri, sahibi olan modülde `@jobs.handler("tür")` ile kaydedilir:
+  push_broadcast       — app/api/push.py
+  emergency_purge      — app/api/emergency.py
+  earthquake_dispatch  — app/api/earthquakes.py
+  geofence_alert       — app/core/geofence.py
+  kpi_rollup_rebuild   — app/core/kpi_rollup.py
+
+Env:
+  JOBS_WORKER_ENABLED        — bu süreçte worker çalışsın mı (varsayılan true)
+  JOBS_EAGER                 — işi kuyruğa yazıp aynı istekte hemen çalıştır
+                               (testler / tek süreçli geliştirme; varsayılan false)
+  JOBS_POLL_INTERVAL_SECONDS — boşta yoklama aralığı (varsayılan 2)
+  JOBS_MAX_ATTEMPTS          — iş başına deneme sayısı (varsayılan 3)
+  JOBS_STALE_SECONDS         — sahipsiz kalmış "running" iş eşiği (varsayılan 600)
+"""
+
+import asyncio
+import logging
+import os
+from datetime import timedelta
+from typing import Awaitable, Callable, Optional
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.models.dispatch_job import DispatchJob
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+WORKER_ENABLED = _env_flag("JOBS_WORKER_ENABLED", True)
+EAGER = _env_flag("JOBS_EAGER", False)
+POLL_INTERVAL_SECONDS = _env_float("JOBS_POLL_INTERVAL_SECONDS", 2.0)
+MAX_ATTEMPTS = int(_env_float("JOBS_MAX_ATTEMPTS", 3))
+STALE_SECONDS = _env_float("JOBS_STALE_SECONDS", 600.0)
+RETRY_BASE_SECONDS = 5.0
+HEARTBEAT_SECONDS = 1.0
+
+
+class JobContext:
+    """Çalışan işin ilerleme sayaçları; handler `report` ile günceller."""
+
+    __slots__ = ("job_id", "done", "total")
+
+    def __init__(self, job_id: int) -> None:
+        self.job_id = job_id
+        self.done = 0
+        self.total = 0
+
+    def report(self, done: int, total: int) -> None:
+        self.done = done
+        self.total = total
+
+
+# handler imzası: (db, payload, ctx) -> sonuç özeti (JSON'lanabilir dict)
+Handler = Callable[[AsyncSession, dict, JobContext], Awaitable[dict]]
+
+_handlers: dict[str, Handler] = {}
+_wake = asyncio.Event()
+_worker_task: Optional[asyncio.Task] = None
+
+
+def handler(kind: str) -> Callable[[Handler], Handler]:
+    """İş türü için handler kaydeden dekoratör."""
+
+    def decorator(fn: Handler) -> Handler:
+        _handlers[kind] = fn
+        return fn
+
+    return decorator
+
+
+def _session_factory():
+    from app.db import AsyncSessionLocal  # geç import (döngüsel import önlemi)
+
+    return AsyncSessionLocal()
+
+
+def serialize_job(job: DispatchJob) -> dict:
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "attempts": job.attempts,
+        "max_attempts": job.max_attempts,
+        "progress": {"done": job.progress_done, "total": job.progress_total},
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at,
+        "started_at": job.started_at,
+        "finished_at": job.finished_at,
+    }
+
+
+async def enqueue(
+    db: AsyncSession,
+    kind: str,
+    payload: Optional[dict] = None,
+    *,
+    max_attempts: Optional[int] = None,
+) -> DispatchJob:
+    """İşi kuyruğa yaz ve commit et; worker'ı uyandır. Tek INSERT + commit."""
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job = DispatchJob(
+        kind=kind,
+        status="queued",
+        payload=payload or {},
+        attempts=0,
+        max_attempts=max_attempts or MAX_ATTEMPTS,
+        progress_done=0,
+        progress_total=0,
+    )
+    db.add(job)
+    await db.commit()
+
+    if EAGER:
+        await _mark_running(db, job.id)
+        await _execute(db, job.id, kind, job.payload, 1, job.max_attempts)
+    else:
+        _wake.set()
+
+    await db.refresh(job)
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: int) -> Optional[DispatchJob]:
+    result = await db.execute(select(DispatchJob).where(DispatchJob.id == job_id))
+    return result.scalar_one_or_none()
+
+
+# ── Worker ───────────────────────────────────────────────────────────────────
+
+async def _mark_running(db: AsyncSession, job_id: int) -> None:
+    await db.execute(
+        update(DispatchJob)
+        .where(DispatchJob.id == job_id)
+        .values(
+            status="running",
+            attempts=DispatchJob.attempts + 1,
+            started_at=func.now(),
+            updated_at=func.now(),
+            error=None,
+        )
+    )
+    await db.commit()
+
+
+async def _claim(db: AsyncSession) -> Optional[tuple[int, str, dict, int, int]]:
+    """Çalıştırılabilir ilk işi kilitleyip sahiplen; yoksa None."""
+    stale_before = func.now() - timedelta(seconds=STALE_SECONDS)
+    # Denemesi tükenmiş sahipsiz işler devralınmaz, kapatılır
+    await db.execute(
+        update(DispatchJob)
+        .where(
+            DispatchJob.status == "running",
+            DispatchJob.updated_at < stale_before,
+            DispatchJob.attempts >= DispatchJob.max_attempts,
+        )
+        .values(
+            status="failed",
+            error="Worker lost while running; no attempts left",
+            finished_at=func.now(),
+            updated_at=func.now(),
+        )
+    )
+    stmt = (
+        select(DispatchJob)
+        .where(
+            or_(
+                and_(DispatchJob.status == "queued", DispatchJob.run_after <= func.now()),
+                and_(
+                    DispatchJob.status == "running",
+                    DispatchJob.updated_at < stale_before,
+                    DispatchJob.attempts < DispatchJob.max_attempts,
+                ),
+            )
+        )
+        .order_by(DispatchJob.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    )
+    job = (await db.execute(stmt)).scalar_one_or_none()
+    if job is None:
+        await db.commit()  # yukarıdaki "failed" kapatmaları kalıcı olsun
+        return None
+    claimed = (job.id, job.kind, job.payload or {}, job.attempts + 1, job.max_attempts)
+    await _mark_running(db, job.id)
+    return claimed
+
+
+async def _heartbeat(ctx: JobContext) -> None:
+    """Çalışan işin ilerlemesini ayrı oturumla periyodik yaz (updated_at = canlılık)."""
+    while True:
+        await asyncio.sleep(HEARTBEAT_SECONDS)
+        try:
+            async with _session_factory() as db:
+                await db.execute(
+                    update(DispatchJob)
+                    .where(DispatchJob.id == ctx.job_id)
+                    .values(
+                        progress_done=ctx.done,
+                        progress_total=ctx.total,
+                        updated_at=func.now(),
+                    )
+                )
+                await db.commit()
+        except Exception as exc:
+            logger.warning("Job heartbeat failed id=%s: %s", ctx.job_id, exc)
+
+
+async def _execute(
+    db: AsyncSession,
+    job_id: int,
+    kind: str,
+    payload: dict,
+    attempt: int,
+    max_attempts: int,
+) -> None:
+    ctx = JobContext(job_id)
+    heartbeat = None if EAGER else asyncio.create_task(_heartbeat(ctx))
+    try:
+        result = await _handlers[kind](db, payload, ctx)
+    except Exception as exc:
+        await db.rollback()
+        logger.exception("Job failed id=%s kind=%s attempt=%s", job_id, kind, attempt)
+        if attempt < max_attempts:
+            values = {
+                "status": "queued",
+                "run_after": func.now() + timedelta(seconds=RETRY_BASE_SECONDS * 2 ** (attempt - 1)),
+            }
+        else:
+            values = {"status": "failed", "finished_at": func.now()}
+        values.update(error=str(exc)[:2000], updated_at=func.now())
+    else:
+        values = {
+            "status": "succeeded",
+            "result": result,
+            "finished_at": func.now(),
+            "updated_at": func.now(),
+        }
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+
+    values.update(progress_done=ctx.done, progress_total=ctx.total)
+    await db.execute(update(DispatchJob).where(DispatchJob.id == job_id).values(**values))
+    await db.commit()
+
+
+async def run_next() -> bool:
+    """Sıradaki işi çalıştır. İş yoksa False."""
+    async with _session_factory() as db:
+        claimed = await _claim(db)
+        if claimed is None:
+            return False
+        await _execute(db, *claimed)
+        return True
+
+
+async def _worker_loop() -> None:
+    while True:
+        try:
+            ran = await run_next()
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("Job worker error: %s", exc)
+            ran = False
+        if ran:
+            continue
+        try:
+            await asyncio.wait_for(_wake.wait(), timeout=POLL_INTERVAL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        _wake.clear()
+
+
+def start_worker() -> None:
+    """Uygulama açılışında çağrılır; JOBS_WORKER_ENABLED=false ise no-op."""
+    global _worker_task
+    if not WORKER_ENABLED or EAGER or _worker_task is not None:
+        return
+    _worker_task = asyncio.get_running_loop().create_task(_worker_loop())
+    logger.info("Dispatch job worker started")
+
+
+async def stop_worker() -> None:
+    global _worker_task
+    if _worker_task is None:
+        return
+    _worker_task.cancel()
+    try:
+        await _worker_task
+    except asyncio.CancelledError:
+        pass
+    _worker_task = None
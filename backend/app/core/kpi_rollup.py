@@ -0,0 +1,324 @@
+"""
+KPI rollup'ları — trend grafikleri için kovalanmış (dakika/saat/gün) sayaçlar.
+
+/kpi/summary anlık toplamları verir; 30 günlük bir trend grafiği ise ham
+tabloları (emergency_reports, safe_checkins, inventory_movements,
+volunteer_tasks) her açılışta yeniden taramak zorunda kalırdı. Bunun yerine
+sayaçlar `kpi_rollups` tablosunda tutulur ve GET /kpi/timeseries yalnızca
+oradan okur; sorgu maliyeti ham tabloların boyutundan bağımsızdır.
+
+Güncelleme artımlıdır. Her metrik için `kpi_rollup_watermarks` ham tablonun
+hangi ana kadar işlendiğini tutar; her turda:
+
+  - dakika kovaları ham tablodan yalnızca [işaret − KPI_ROLLUP_LATE_MINUTES, şimdi)
+    aralığı için yeniden hesaplanır (DELETE + INSERT … SELECT … GROUP BY),
+  - saat kovaları dakika kovalarından, gün kovaları saat kovalarından türetilir;
+    ham tabloya ikinci kez gidilmez,
+  - işaret "şimdi"ye ilerletilir, saklama süresini aşan dakika/saat kovaları silinir.
+
+Aralık her turda baştan yazıldığı için tur idempotent'tir; geç commit edilen
+satırlar ve pencere içindeki durum değişiklikleri (ör. "new" → "resolved")
+sonraki turda kovalarına yansır. Pencereden daha eski bir raporun durumu
+sonradan değişirse `emergency_status` serisi, kovanın son hesaplandığı andaki
+durumu göstermeye devam eder; gerekirse `kpi_rollup_rebuild` işi geçmişi
+ham tablodan yeniden kurar. `task_completions` görevin updated_at'ine göre
+kovalanır: tamamlanmış bir görev sonradan düzenlenirse (not, atama vb.)
+tamamlanması o düzenlemenin kovasına kayar; pencere içindeyse eski kovadan
+düşer, pencereden eskiyse iki kovada birden sayılmış olur.
+
+Çok worker'lı dağıtımda her tur `pg_try_advisory_xact_lock` ile korunur;
+aynı anda yalnızca bir worker toplar.
+
+Env:
+  KPI_ROLLUP_ENABLED                — toplayıcı çalışsın mı (varsayılan true)
+  KPI_ROLLUP_INTERVAL_SECONDS       — tur aralığı (varsayılan 60)
+  KPI_ROLLUP_LATE_MINUTES           — her turda yeniden hesaplanan geçmiş (varsayılan 60)
+  KPI_ROLLUP_BACKFILL_DAYS          — işaret yoksa ilk turda doldurulan gün (varsayılan 30)
+  KPI_ROLLUP_MINUTE_RETENTION_HOURS — dakika kovalarının saklama süresi (varsayılan 48)
+  KPI_ROLLUP_HOUR_RETENTION_DAYS    — saat kovalarının saklama süresi (varsayılan 90)
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Literal, NamedTuple, Optional, Sequence, get_args
+
+from sqlalchemy import String, cast, delete, func, insert, literal, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import jobs
+from app.models.emergency_report import EmergencyReport
+from app.models.inventory_movement import InventoryMovement
+from app.models.kpi_rollup import KpiRollup, KpiRollupWatermark
+from app.models.safe_checkin import SafeCheckin
+from app.models.volunteer_task import VolunteerTask
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes"}
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+ENABLED = _env_flag("KPI_ROLLUP_ENABLED", True)
+INTERVAL_SECONDS = max(5.0, _env_float("KPI_ROLLUP_INTERVAL_SECONDS", 60.0))
+LATE_WINDOW = timedelta(minutes=max(1.0, _env_float("KPI_ROLLUP_LATE_MINUTES", 60.0)))
+BACKFILL = timedelta(days=max(1.0, _env_float("KPI_ROLLUP_BACKFILL_DAYS", 30.0)))
+# Saat kovaları dakika kovalarından türetildiği için dakikalar en az
+# geç gelme penceresi + bir saat boyunca tutulmalı.
+MINUTE_RETENTION = max(
+    timedelta(hours=_env_float("KPI_ROLLUP_MINUTE_RETENTION_HOURS", 48.0)),
+    LATE_WINDOW + timedelta(hours=2),
+)
+HOUR_RETENTION = timedelta(days=max(2.0, _env_float("KPI_ROLLUP_HOUR_RETENTION_DAYS", 90.0)))
+_ADVISORY_LOCK_KEY = 0x4B50495F524F4C4C  # "KPI_ROLL"
+
+Metric = Literal[
+    "emergency_status",
+    "emergency_category",
+    "checkins",
+    "stock_in",
+    "stock_out",
+    "task_completions",
+]
+Bucket = Literal["minute", "hour", "day"]
+METRICS: tuple[str, ...] = get_args(Metric)
+BUCKET_STEPS = {
+    "minute": timedelta(minutes=1),
+    "hour": timedelta(hours=1),
+    "day": timedelta(days=1),
+}
+
+
+class _Source(NamedTuple):
+    """Bir metriğin ham tablodaki karşılığı."""
+
+    ts: Any                      # kovaya düşüren zaman kolonu (indeksli olmalı)
+    dimension: Any = None        # boyut ifadesi; None → tek seri ("")
+    amount: Any = None           # kova başına toplanacak miktar; None → 0
+    where: tuple = ()
+
+
+_TO = cast(InventoryMovement.to_warehouse_id, String)
+_FROM = cast(InventoryMovement.from_warehouse_id, String)
+
+SOURCES: dict[str, _Source] = {
+    "emergency_status": _Source(EmergencyReport.created_at, EmergencyReport.status),
+    "emergency_category": _Source(
+        EmergencyReport.created_at, func.coalesce(EmergencyReport.kategori, literal_column("''"))
+    ),
+    "checkins": _Source(SafeCheckin.created_at, SafeCheckin.source),
+    # Transfer hem kaynak deponun çıkışı hem hedef deponun girişi olarak sayılır
+    "stock_in": _Source(
+        InventoryMovement.timestamp, _TO, InventoryMovement.quantity,
+        (InventoryMovement.to_warehouse_id.isnot(None),),
+    ),
+    "stock_out": _Source(
+        InventoryMovement.timestamp, _FROM, InventoryMovement.quantity,
+        (InventoryMovement.from_warehouse_id.isnot(None),),
+    ),
+    # Tamamlanma anı olarak updated_at kullanılır (ayrı bir completed_at yok): biten
+    # bir görev sonradan düzenlenirse tamamlanması yeni updated_at'in kovasına taşınır.
+    # 'done' bind parametresi değil literal: generic planda "$1" kısmi indeksin
+    # (034, WHERE status = 'done') yüklemiyle eşleşmez ve indeks kullanılmaz.
+    "task_completions": _Source(
+        VolunteerTask.updated_at, where=(VolunteerTask.status == literal_column("'done'"),)
+    ),
+}
+# Metric Literal'ı ile kaynak kaydı birlikte güncellenmeli
+assert set(SOURCES) == set(METRICS)
+
+# Kovası miktar da taşıyan metrikler (timeseries yanıtında "amounts")
+AMOUNT_METRICS = frozenset(name for name, src in SOURCES.items() if src.amount is not None)
+
+_COLUMNS = ["metric", "bucket", "bucket_start", "dimension", "count", "amount"]
+
+
+def floor_bucket(ts: datetime, bucket: str) -> datetime:
+    """Zamanı kovanın başlangıcına indir (date_trunc'ın Python karşılığı)."""
+    ts = ts.replace(second=0, microsecond=0)
+    if bucket in ("hour", "day"):
+        ts = ts.replace(minute=0)
+    if bucket == "day":
+        ts = ts.replace(hour=0)
+    return ts
+
+
+def _trunc(bucket: str, column: Any) -> Any:
+    # Birim bind parametresi olmamalı: SELECT ve GROUP BY'daki iki ayrı $n
+    # PostgreSQL için farklı ifadelerdir ("must appear in GROUP BY" hatası).
+    return func.date_trunc(literal_column(f"'{bucket}'"), column)
+
+
+async def _replace(db: AsyncSession, metric: str, bucket: str, lower: datetime, stmt) -> None:
+    await db.execute(
+        delete(KpiRollup).where(
+            KpiRollup.metric == metric,
+            KpiRollup.bucket == bucket,
+            KpiRollup.bucket_start >= lower,
+        )
+    )
+    await db.execute(insert(KpiRollup).from_select(_COLUMNS, stmt))
+
+
+async def _roll_metric(db: AsyncSession, metric: str, start: datetime) -> None:
+    """`start`tan (dakika sınırı) itibaren metriğin üç kova seviyesini yeniden yaz."""
+    src = SOURCES[metric]
+    minute = _trunc("minute", src.ts)
+    dimension = src.dimension if src.dimension is not None else literal_column("''")
+    amount = func.coalesce(func.sum(src.amount), 0) if src.amount is not None else literal_column("0")
+    group_by = [minute] if src.dimension is None else [minute, src.dimension]
+    await _replace(
+        db, metric, "minute", start,
+        select(literal(metric), literal("minute"), minute, dimension, func.count(), amount)
+        .where(src.ts >= start, *src.where)
+        .group_by(*group_by),
+    )
+
+    for finer, coarser in (("minute", "hour"), ("hour", "day")):
+        lower = floor_bucket(start, coarser)
+        coarse = _trunc(coarser, KpiRollup.bucket_start)
+        await _replace(
+            db, metric, coarser, lower,
+            select(
+                literal(metric), literal(coarser), coarse, KpiRollup.dimension,
+                func.sum(KpiRollup.count), func.sum(KpiRollup.amount),
+            )
+            .where(
+                KpiRollup.metric == metric,
+                KpiRollup.bucket == finer,
+                KpiRollup.bucket_start >= lower,
+            )
+            .group_by(coarse, KpiRollup.dimension),
+        )
+
+
+async def roll_up(
+    db: AsyncSession,
+    *,
+    metrics: Optional[Sequence[str]] = None,
+    since: Optional[datetime] = None,
+) -> dict:
+    """Bir toplama turu (commit etmez). `since` verilirse o günden itibaren ham tablodan yeniden kurar."""
+    # Zaman kolonları server_default=now() ile oturum saat diliminde yazılır; "şimdi" de oradan
+    now = (await db.execute(select(func.localtimestamp()))).scalar_one()
+    names = list(metrics or METRICS)
+    marks = dict(
+        (await db.execute(
+            select(KpiRollupWatermark.metric, KpiRollupWatermark.rolled_until)
+            .where(KpiRollupWatermark.metric.in_(names))
+        )).all()
+    )
+    # Bundan eski dakika kovaları silinmiş olabilir; saat/gün türetimi eksik kalmasın diye
+    # böyle bir başlangıç gün sınırına çekilip ham tablodan baştan hesaplanır.
+    minute_horizon = now - MINUTE_RETENTION + timedelta(hours=1)
+
+    starts = {}
+    for name in names:
+        if since is not None:
+            start = since
+        elif name in marks:
+            start = marks[name] - LATE_WINDOW
+        else:
+            start = now - BACKFILL
+        full = since is not None or name not in marks or start < minute_horizon
+        start = floor_bucket(start, "day" if full else "minute")
+        await _roll_metric(db, name, start)
+        starts[name] = start.isoformat()
+
+    upsert = pg_insert(KpiRollupWatermark).values(
+        [{"metric": name, "rolled_until": now} for name in names]
+    )
+    await db.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[KpiRollupWatermark.metric],
+            set_={"rolled_until": upsert.excluded.rolled_until},
+        )
+    )
+    await db.execute(
+        delete(KpiRollup).where(KpiRollup.bucket == "minute", KpiRollup.bucket_start < now - MINUTE_RETENTION)
+    )
+    await db.execute(
+        delete(KpiRollup).where(KpiRollup.bucket == "hour", KpiRollup.bucket_start < now - HOUR_RETENTION)
+    )
+    return {"rolled_until": now.isoformat(), "from": starts}
+
+
+@jobs.handler("kpi_rollup_rebuild")
+async def _run_rebuild_job(db: AsyncSession, payload: dict, ctx: jobs.JobContext) -> dict:
+    """Geçmişi ham tablodan yeniden kur (ör. backfill penceresinden eski veriler için)."""
+    since = floor_bucket(datetime.fromisoformat(payload["since"]), "day")
+    names = [m for m in (payload.get("metrics") or METRICS) if m in SOURCES]
+    for i, name in enumerate(names):
+        ctx.report(i, len(names))
+        # Periyodik turla aynı kilit; tur bitene kadar bekler, sonra metriği tek transaction'da yazar
+        await db.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY})
+        await roll_up(db, metrics=[name], since=since)
+        await db.commit()
+    ctx.report(len(names), len(names))
+    return {"metrics": names, "since": since.isoformat()}
+
+
+class KpiRollupWorker:
+    """Periyodik artımlı toplama turunu çalıştıran süreç-içi görev."""
+
+    def __init__(self) -> None:
+        self._task: Optional[asyncio.Task] = None
+
+    async def tick(self) -> bool:
+        """Bir tur; kilit başka worker'daysa False."""
+        async with jobs._session_factory() as db:
+            locked = (
+                await db.execute(
+                    text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": _ADVISORY_LOCK_KEY}
+                )
+            ).scalar()
+            if not locked:
+                await db.rollback()
+                return False
+            await roll_up(db)
+            # Commit advisory xact kilidini de bırakır.
+            await db.commit()
+        return True
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self.tick()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning("KPI rollup error: %s", exc)
+            await asyncio.sleep(INTERVAL_SECONDS)
+
+    def start(self) -> None:
+        """Uygulama açılışında çağrılır; KPI_ROLLUP_ENABLED=false ise no-op."""
+        if not ENABLED or self._task is not None:
+            return
+        self._task = asyncio.get_running_loop().create_task(self._loop())
+        logger.info("KPI rollup worker started (interval=%ss)", INTERVAL_SECONDS)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+roller = KpiRollupWorker()
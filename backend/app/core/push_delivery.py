@@ -0,0 +1,197 @@
+"""
+Web Push teslim motoru — sınırlı eşzamanlı fan-out.
+
+`pywebpush.webpush` senkron (requests) bir çağrıdır; doğrudan async fonksiyon
+içinde çağrılınca her gönderim event loop'u bloklar. Bu modül:
+
+  - gönderimleri sınırlı bir ThreadPoolExecutor'da çalıştırır (loop serbest kalır),
+  - push servisi origin'i başına (fcm.googleapis.com, updates.push.services.mozilla.com …)
+    tek bir requests.Session tutar; TLS/HTTP bağlantıları yeniden kullanılır,
+  - `fan_out` ile bir gönderim listesini en fazla N eşzamanlı işçiyle işler,
+  - `subscriptions_by_user` ile eşleşen kullanıcıların aboneliklerini tek
+    (parçalı) `IN` sorgusuyla yükler; kullanıcı başına ayrı sorgu atılmaz.
+
+Env:
+  PUSH_CONCURRENCY      — eşzamanlı gönderim sayısı (varsayılan 32)
+  PUSH_TIMEOUT_SECONDS  — tek gönderim için HTTP zaman aşımı (varsayılan 10)
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Iterable, Optional, Sequence
+from urllib.parse import urlsplit
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.push_subscription import PushSubscription
+
+logger = logging.getLogger(__name__)
+
+# sender imzası: (PushSubscription, payload_dict) -> bool (başarılı mı)
+Sender = Callable[[Any, dict], Awaitable[bool]]
+# ilerleme geri çağrısı: (tamamlanan, toplam)
+Progress = Callable[[int, int], None]
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+CONCURRENCY = _env_int("PUSH_CONCURRENCY", 32)
+TIMEOUT_SECONDS = _env_float("PUSH_TIMEOUT_SECONDS", 10.0)
+
+# Tek `IN (...)` listesindeki en fazla id; asyncpg'nin 32767 parametre sınırının
+# epey altında kalır ve sorgu planı büyük listelerde de makul olur.
+IN_CHUNK_SIZE = 5000
+
+_executor: Optional[ThreadPoolExecutor] = None
+_sessions: dict[str, Any] = {}
+_sessions_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=CONCURRENCY, thread_name_prefix="webpush")
+    return _executor
+
+
+def _origin(endpoint: str) -> str:
+    parts = urlsplit(endpoint)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _session_for(endpoint: str) -> Any:
+    """Push servisi origin'i başına paylaşılan requests.Session (bağlantı havuzu)."""
+    origin = _origin(endpoint)
+    session = _sessions.get(origin)
+    if session is not None:
+        return session
+    with _sessions_lock:
+        session = _sessions.get(origin)
+        if session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=CONCURRENCY)
+            session.mount(origin, adapter)
+            _sessions[origin] = session
+    return session
+
+
+def _send_blocking(endpoint: str, keys: dict, data: str) -> None:
+    """İşçi thread'inde çalışır; hata durumunda istisna fırlatır."""
+    from pywebpush import webpush  # type: ignore
+
+    webpush(
+        subscription_info={"endpoint": endpoint, "keys": keys},
+        data=data,
+        vapid_private_key=os.getenv("VAPID_PRIVATE_KEY"),
+        vapid_claims={
+            "sub": os.getenv("VAPID_SUBJECT", "mailto:admin@geosafe.app"),
+            "exp": int(datetime.utcnow().timestamp()) + 12 * 3600,
+        },
+        ttl=86400,
+        timeout=TIMEOUT_SECONDS,
+        requests_session=_session_for(endpoint),
+    )
+
+
+async def send(sub: Any, payload: dict) -> bool:
+    """Tek aboneliğe push gönder (thread havuzunda). Başarılıysa True."""
+    try:
+        keys = sub.keys if isinstance(sub.keys, dict) else json.loads(sub.keys)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(
+            _get_executor(), _send_blocking, sub.endpoint, keys, json.dumps(payload)
+        )
+        return True
+    except Exception as exc:
+        logger.debug("Web Push failed endpoint=%s: %s", getattr(sub, "endpoint", "?"), exc)
+        return False
+
+
+async def fan_out(
+    jobs: Sequence[tuple[Any, dict]],
+    sender: Sender,
+    *,
+    concurrency: Optional[int] = None,
+    on_progress: Optional[Progress] = None,
+) -> list[bool]:
+    """(abonelik, payload) listesini en fazla `concurrency` eşzamanlı işçiyle gönder.
+
+    Sonuçlar giriş sırasıyla döner. Kuyruk tek seferde görev olarak açılmaz;
+    sabit sayıda işçi sıradaki işi çeker (50k abonede bile bellek sabit kalır).
+    """
+    results = [False] * len(jobs)
+    if not jobs:
+        return results
+
+    pending = iter(range(len(jobs)))
+    done = 0
+
+    async def worker() -> None:
+        nonlocal done
+        for i in pending:
+            sub, payload = jobs[i]
+            results[i] = bool(await sender(sub, payload))
+            done += 1
+            if on_progress is not None:
+                on_progress(done, len(jobs))
+
+    n_workers = min(concurrency or CONCURRENCY, len(jobs))
+    await asyncio.gather(*(worker() for _ in range(n_workers)))
+    return results
+
+
+async def subscriptions_by_user(
+    db: AsyncSession, user_ids: Iterable[int], *, chunk_size: int = IN_CHUNK_SIZE
+) -> dict[int, list[PushSubscription]]:
+    """Verilen kullanıcıların push aboneliklerini user_id'ye göre grupla.
+
+    Kullanıcı başına sorgu yerine `chunk_size`'lık parçalar hâlinde `IN` sorgusu;
+    20k kullanıcı ≈ 4 sorgu. Aboneliği olmayan kullanıcı sonuçta yer almaz.
+    """
+    ids = sorted(set(user_ids))
+    grouped: dict[int, list[PushSubscription]] = {}
+    for start in range(0, len(ids), chunk_size):
+        result = await db.execute(
+            select(PushSubscription)
+            .where(PushSubscription.user_id.in_(ids[start : start + chunk_size]))
+            .order_by(PushSubscription.id)
+        )
+        for sub in result.scalars():
+            grouped.setdefault(sub.user_id, []).append(sub)
+    return grouped
+
+
+def shutdown() -> None:
+    """Uygulama kapanışında thread havuzunu ve oturumları kapat."""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+    with _sessions_lock:
+        for session in _sessions.values():
+            try:
+                session.close()
+            except Exception:
+                pass
+        _sessions.clear()
@@ -0,0 +1,277 @@
+"""
+SSE yayın veriyolu (broadcast bus) — worker'lar arası canlı olay dağıtımı.
+
+`app/api/sse._clients` her worker'ın kendi bağlantılarını tutar; bir worker'da
+yayınlanan olay eskiden yalnızca o worker'a bağlı istemcilere gidiyordu.
+Veriyolu iki arka uç sunar:
+
+  memory — tek worker: olay yalnızca yerel kuyruklara dağıtılır.
+  redis  — olay yerel kuyruklara hemen dağıtılır VE `sse:events` kanalına
+           yayınlanır; her worker tek bir abone görevle kanalı dinler ve
+           başka worker'lardan gelen olayları kendi kuyruklarına dağıtır.
+
+Yerel dağıtım her zaman önce yapılır (Redis kopsa bile aynı worker'daki
+istemciler olayı alır); kendi yayınladığı mesajı abone tekrar dağıtmaz.
+
+Yeniden oynatma (Last-Event-ID): her olay monoton artan bir id alır (redis'te
+paylaşılan INCR sayacı, memory'de süreç sayacı; ikisi de ms-epoch tabanından
+başlar, yeniden başlatmada geri gitmez). Redis arka ucunda INCR başarısız olursa
+yerel sayaca geçilmez — iki dizi karışınca istemcinin Last-Event-ID'si yeni
+olayları "eski" sayardı; olay id'siz canlı dağıtılır ve tampona yazılmaz.
+Id'li olaylar konu başına sınırlı bir halka
+tampona yazılır (redis: sıralı küme `sse:replay:<konu>`, memory: deque); konu
+"tür|kapsam"dır (ör. `chat_message|ops`), böylece yoğun bir oda ya da depo
+diğerlerinin geçmişini tampondan atmaz. Konular aileye (olay türü) göre
+indekslenir (redis: küme `sse:replay-index:<tür>`); kapsam filtresi olmayan
+istemci türün tüm konularını oynatır. `replay` verilen id'den sonraki olayları
+ve tamponun boşluğu kapsayıp kapsamadığını döndürür.
+
+Env:
+  SSE_BUS_BACKEND         — auto (varsayılan: Redis bağlıysa redis, değilse memory) | redis | memory
+  SSE_REPLAY_BUFFER_SIZE  — konu başına tutulan son olay sayısı (varsayılan 256)
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Iterable, Optional
+
+from app.core import cache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "sse:events"
+# Sabit uzunluklu köken öneki; mesaj "<origin><route>\n<payload>" olarak taşınır.
+# route ("tür|kapsam") abonenin JSON'u çözmeden yönlendirme yapmasını sağlar;
+# json.dumps çıktısında çıplak satır sonu olmadığı için ayraç güvenlidir.
+_INSTANCE_ID = uuid.uuid4().hex
+_ORIGIN_LEN = len(_INSTANCE_ID)
+
+BACKEND = os.getenv("SSE_BUS_BACKEND", "auto").strip().lower()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+REPLAY_BUFFER_SIZE = _env_int("SSE_REPLAY_BUFFER_SIZE", 256)
+_ID_KEY = "sse:event_id"
+_REPLAY_PREFIX = "sse:replay:"
+_REPLAY_INDEX_PREFIX = "sse:replay-index:"
+
+# (id, route, payload)
+ReplayEntry = tuple[int, str, str]
+
+_local_ids = itertools.count(int(time.time() * 1000))
+_local_buffers: dict[str, deque] = {}
+_local_families: dict[str, set[str]] = {}
+
+LocalHandler = Callable[[str, str], None]  # (route, payload)
+
+_local_handler: Optional[LocalHandler] = None
+_redis: Optional[Any] = None
+_subscriber_task: Optional[asyncio.Task] = None
+
+
+def set_local_handler(handler: LocalHandler) -> None:
+    """app/api/sse kendi kuyruklarına dağıtım fonksiyonunu import anında kaydeder."""
+    global _local_handler
+    _local_handler = handler
+
+
+def backend() -> str:
+    return "redis" if _redis is not None else "memory"
+
+
+def _deliver_local(route: str, payload: str) -> None:
+    if _local_handler is not None:
+        _local_handler(route, payload)
+
+
+async def next_id() -> Optional[int]:
+    """Monoton artan olay id'si (redis'te tüm worker'lar arasında).
+
+    Redis INCR başarısızsa None: olay id'siz (yeniden oynatılamaz) yayınlanır.
+    """
+    if _redis is None:
+        return next(_local_ids)
+    try:
+        return int(await _redis.incr(_ID_KEY))
+    except Exception as exc:
+        logger.warning("SSE event id INCR failed — publishing without id/replay: %s", exc)
+        return None
+
+
+async def publish(
+    route: str,
+    payload: str,
+    *,
+    replay_key: Optional[str] = None,
+    replay_family: Optional[str] = None,
+    event_id: Optional[int] = None,
+) -> None:
+    """Olayı bu worker'ın istemcilerine dağıt; redis arka ucunda diğer worker'lara da yayınla.
+
+    `replay_key` verilirse olay o konunun yeniden oynatma tamponuna `event_id` ile
+    yazılır; `replay_family` konuyu ailesinin indeksine ekler (bkz. `replay`).
+    """
+    _deliver_local(route, payload)
+    remember = replay_key is not None and event_id is not None
+    if _redis is None:
+        if remember:
+            buffer = _local_buffers.get(replay_key)
+            if buffer is None:
+                buffer = _local_buffers[replay_key] = deque(maxlen=REPLAY_BUFFER_SIZE)
+                if replay_family is not None:
+                    _local_families.setdefault(replay_family, set()).add(replay_key)
+            buffer.append((event_id, route, payload))
+        return
+    try:
+        # Tampon yazımı + yayın tek round-trip
+        async with _redis.pipeline(transaction=False) as pipe:
+            if remember:
+                key = _REPLAY_PREFIX + replay_key
+                pipe.zadd(key, {f"{route}\n{payload}": event_id})
+                pipe.zremrangebyrank(key, 0, -(REPLAY_BUFFER_SIZE + 1))
+                if replay_family is not None:
+                    pipe.sadd(_REPLAY_INDEX_PREFIX + replay_family, replay_key)
+            pipe.publish(CHANNEL, f"{_INSTANCE_ID}{route}\n{payload}")
+            await pipe.execute()
+    except Exception as exc:
+        logger.warning("SSE bus publish failed: %s", exc)
+
+
+async def replay(
+    replay_keys: Iterable[str], after_id: int, families: Iterable[str] = ()
+) -> tuple[list[ReplayEntry], bool]:
+    """`after_id`'den sonraki olaylar (id sırasıyla) ve boşluk kaybı olup olmadığı.
+
+    `families` verilen ailelerin (olay türü) indekslenmiş tüm konularını ekler.
+    Kayıp: bir konunun tamponu dolu ve en eski kaydı `after_id`'den yeni → arada
+    düşen olay olabilir.
+    """
+    keys = set(replay_keys)
+    families = sorted(set(families))
+    entries: list[ReplayEntry] = []
+    gap = False
+
+    if _redis is None:
+        for family in families:
+            keys.update(_local_families.get(family, ()))
+        for key in sorted(keys):
+            buffer = _local_buffers.get(key)
+            if not buffer:
+                continue
+            if len(buffer) >= REPLAY_BUFFER_SIZE and buffer[0][0] > after_id:
+                gap = True
+            entries.extend(entry for entry in buffer if entry[0] > after_id)
+        entries.sort(key=lambda entry: entry[0])
+        return entries, gap
+
+    try:
+        if families:
+            async with _redis.pipeline(transaction=False) as pipe:
+                for family in families:
+                    pipe.smembers(_REPLAY_INDEX_PREFIX + family)
+                for members in await pipe.execute():
+                    keys.update(members)
+        keys = sorted(keys)
+        async with _redis.pipeline(transaction=False) as pipe:
+            for key in keys:
+                redis_key = _REPLAY_PREFIX + key
+                pipe.zcard(redis_key)
+                pipe.zrange(redis_key, 0, 0, withscores=True)
+                pipe.zrangebyscore(redis_key, f"({after_id}", "+inf", withscores=True)
+            results = await pipe.execute()
+    except Exception as exc:
+        logger.warning("SSE replay read failed: %s", exc)
+        return [], True
+
+    for i in range(0, len(results), 3):
+        size, oldest, newer = results[i : i + 3]
+        if size >= REPLAY_BUFFER_SIZE and oldest and int(oldest[0][1]) > after_id:
+            gap = True
+        for member, score in newer:
+            route, _, payload = member.partition("\n")
+            entries.append((int(score), route, payload))
+    entries.sort(key=lambda entry: entry[0])
+    return entries, gap
+
+
+def _on_message(message: str) -> None:
+    if message[:_ORIGIN_LEN] == _INSTANCE_ID:
+        return
+    route, _, payload = message[_ORIGIN_LEN:].partition("\n")
+    _deliver_local(route, payload)
+
+
+async def _listen() -> None:
+    """Worker başına tek abone; hata sonrası yeniden bağlanır."""
+    while True:
+        pubsub = None
+        try:
+            pubsub = _redis.pubsub()
+            await pubsub.subscribe(CHANNEL)
+            async for message in pubsub.listen():
+                if message.get("type") == "message":
+                    _on_message(message.get("data"))
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.warning("SSE bus subscriber error: %s", exc)
+            await asyncio.sleep(1.0)
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+
+def _web_concurrency() -> int:
+    try:
+        return int(os.getenv("WEB_CONCURRENCY", "1"))
+    except ValueError:
+        return 1
+
+
+async def start() -> None:
+    """Uygulama açılışında (cache.connect() sonrası) çağrılır; arka ucu seçer."""
+    global _redis, _subscriber_task
+    client = cache.redis_client()
+    if BACKEND == "memory" or client is None:
+        if BACKEND == "redis":
+            logger.warning("SSE_BUS_BACKEND=redis but Redis is unavailable — using in-process bus")
+        if _web_concurrency() > 1:
+            logger.warning(
+                "SSE bus is in-process with WEB_CONCURRENCY>1 — live events reach only "
+                "clients connected to the publishing worker"
+            )
+        return
+    _redis = client
+    try:
+        # Sayaç ms-epoch tabanından başlasın: memory döneminin id'lerinin gerisine düşmesin.
+        await client.set(_ID_KEY, int(time.time() * 1000), nx=True)
+    except Exception as exc:
+        logger.warning("SSE event id seed failed: %s", exc)
+    _subscriber_task = asyncio.get_running_loop().create_task(_listen())
+    logger.info("SSE broadcast bus: redis channel %s", CHANNEL)
+
+
+async def stop() -> None:
+    global _redis, _subscriber_task
+    if _subscriber_task is not None:
+        _subscriber_task.cancel()
+        try:
+            await _subscriber_task
+        except asyncio.CancelledError:
+            pass
+        _subscriber_task = None
+    _redis = None
@@ -1,4 +1,4 @@
 # Database package
-from .session import AsyncSessionLocal, engine, get_db
+from .session import AsyncSessionLocal, engine, get_db, get_read_db
 
-__all__ = ["get_db", "engine", "AsyncSessionLocal"]
+__all__ = ["get_db", "get_read_db", "engine", "AsyncSessionLocal"]
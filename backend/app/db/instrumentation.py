@@ -0,0 +1,173 @@
+"""
+Per-request SQL instrumentation and query budgets.
+
+SQLAlchemy cursor events (registered once on the Engine class, so every engine
+— primary, replica, test engines — is covered) time each statement and add it
+to the QueryStats bound to the current request through a ContextVar.
+SQLAlchemy's async greenlets inherit the caller's context, so statements run
+through AsyncSession land on the right request.
+
+MetricsMiddleware (app/api/observability) opens the stats per request,
+records the db_queries_per_request / db_time_per_request_seconds histograms
+and calls report_request(), which
+  - logs the slowest statement when a request is slow or query-heavy
+    (JSON logs carry the X-Request-ID),
+  - adds X-DB-Query-Count / X-DB-Time-Ms / X-DB-Slowest-Ms headers when
+    DB_QUERY_STATS_HEADERS is on (default off; the local docker-compose
+    turns it on — the headers describe the query shape of each endpoint and
+    must not leak from a deployment that forgot to set ENVIRONMENT).
+
+query_budget(n) is the test-side helper: it counts every statement executed in
+the process while the block runs and raises QueryBudgetExceeded past `n`.
+
+Env:
+  DB_QUERY_STATS_HEADERS        — true | false (default false)
+  DB_SLOW_REQUEST_MS            — log requests whose DB time exceeds this (default 500)
+  DB_QUERY_WARN_COUNT           — log requests running more statements (default 50)
+"""
+
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.logging_config import request_id_var
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: bool) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in {"1", "true", "yes", "on"}
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+STATS_HEADERS = _env_flag("DB_QUERY_STATS_HEADERS", False)
+SLOW_REQUEST_MS = _env_int("DB_SLOW_REQUEST_MS", 500)
+QUERY_WARN_COUNT = _env_int("DB_QUERY_WARN_COUNT", 50)
+
+
+class QueryStats:
+    __slots__ = ("count", "total_seconds", "slowest_seconds", "slowest_statement", "statements")
+
+    def __init__(self, keep_statements: bool = False) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: Optional[str] = None
+        # Only query_budget keeps the full list (for its failure message)
+        self.statements: Optional[list[str]] = [] if keep_statements else None
+
+    def add(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.total_seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+        if self.statements is not None:
+            self.statements.append(statement)
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("db_query_stats", default=None)
+# query_budget() collectors; process-wide so TestClient's app thread is counted too
+_global: list[QueryStats] = []
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info.get("_query_started")
+    if not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats = _current.get()
+    if stats is not None:
+        stats.add(statement, elapsed)
+    for budget in _global:
+        budget.add(statement, elapsed)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # A failing statement never reaches after_cursor_execute; drop its start time
+    # so conn.info (which lives as long as the pooled connection) doesn't grow.
+    conn = exception_context.connection
+    if conn is None or exception_context.execution_context is None:
+        return
+    started = conn.info.get("_query_started")
+    if started:
+        started.pop()
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect statements executed in this context (request, task) into a QueryStats."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Fail when more than `max_queries` statements run inside the block (N+1 guard for tests)."""
+    stats = QueryStats(keep_statements=True)
+    _global.append(stats)
+    try:
+        yield stats
+    finally:
+        _global.remove(stats)
+    if stats.count > max_queries:
+        listing = "\n".join(f"  {i + 1}. {s.strip()[:200]}" for i, s in enumerate(stats.statements))
+        raise QueryBudgetExceeded(
+            f"{stats.count} queries executed, budget is {max_queries}:\n{listing}"
+        )
+
+
+def report_request(request: Request, response: Response, stats: QueryStats) -> None:
+    """Log DB-heavy requests (slowest statement included) and add debug headers."""
+    total_ms = stats.total_seconds * 1000
+    if stats.count and (total_ms > SLOW_REQUEST_MS or stats.count > QUERY_WARN_COUNT):
+        # RequestIDMiddleware runs inside this one and has already reset its ContextVar
+        token = request_id_var.set(response.headers.get("X-Request-ID", ""))
+        try:
+            logger.warning(
+                "DB-heavy request %s %s: %d queries, %.1f ms; slowest %.1f ms: %s",
+                request.method,
+                request.url.path,
+                stats.count,
+                total_ms,
+                stats.slowest_seconds * 1000,
+                (stats.slowest_statement or "").strip()[:500],
+            )
+        finally:
+            request_id_var.reset(token)
+    if STATS_HEADERS:
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time-Ms"] = f"{stats.total_seconds * 1000:.1f}"
+        response.headers["X-DB-Slowest-Ms"] = f"{stats.slowest_seconds * 1000:.1f}"
@@ -1,13 +1,57 @@
 """
 Database session and connection management.
 Uses SQLAlchemy async for non-blocking queries.
+
+Connection pool (PostgreSQL):
+  DB_POOL_SIZE              — persistent connections per worker (default 5)
+  DB_MAX_OVERFLOW           — extra connections under burst (default 10)
+  DB_POOL_TIMEOUT_SECONDS   — max wait for a free connection (default 30)
+  DB_POOL_RECYCLE_SECONDS   — reconnect connections older than this (default 1800)
+  DB_POOL_PREWARM           — connections opened at startup (default DB_POOL_SIZE, 0 = off)
+  DB_STATEMENT_CACHE_SIZE   — asyncpg prepared-statement cache (default 100)
+  DB_POOLER_MODE            — auto | transaction | off
+
+Transaction-mode poolers (PgBouncer, Supabase on port 6543) hand every
+transaction a possibly different server connection, so asyncpg's prepared
+statements break. In pooler mode (auto: port 6543) the statement caches are
+disabled and prepared statements get unique names.
+
+Read replica (optional):
+  DATABASE_REPLICA_URL          — read-only replica; unset → every read uses the primary
+  DB_REPLICA_MAX_LAG_SECONDS    — replica is skipped while its lag exceeds this (default 10)
+  DB_REPLICA_LAG_CHECK_SECONDS  — lag polling interval (default 5)
+  DB_READ_YOUR_WRITES_MARGIN_SECONDS — extra primary pinning after a write (default 1)
+
+Read-heavy GET routes use `get_read_db`; it hands out a replica session unless
+the replica is missing, unhealthy or lagging, or the caller wrote recently
+(last-write marker newer than the measured lag + margin) — then the primary.
+Write responses carry the marker both as the LAST_WRITE_HEADER response
+header, which the cross-origin SPA stores and echoes back on every request
+(it authenticates with Bearer tokens and sends no cookies), and as
+LAST_WRITE_COOKIE for same-origin callers.
+Routes that fill a shared cache entry (app.core.cache) keep `get_db`: a reader
+on a lagging replica would store pre-write data for every client.
+
+Pool checkout wait, timeouts and in-use / overflow counts go to /metrics once
+main calls register_pool_metrics(collector) (app.db stays free of app.api imports).
 """
 
+import asyncio
+import logging
 import os
+import time
+import uuid
+from typing import Optional
 from urllib.parse import quote, unquote, urlsplit, urlunsplit
 
+from fastapi import Depends, Request
+from sqlalchemy import exc as sa_exc
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+logger = logging.getLogger(__name__)
 
 SUPABASE_PROJECT_POOLER_HOSTS = {
     "jihsjgirttfipldhhfxx": "aws-1-ap-northeast-1.pooler.supabase.com",
@@ -81,18 +125,140 @@ print(f"Database configuration: {_safe_database_url_summary(DATABASE_URL)}")
 # SQLite mi Postgres mu otomatik anla
 is_sqlite = DATABASE_URL.startswith("sqlite")
 
-connect_args = {"check_same_thread": False} if is_sqlite else {}
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(0, int(os.getenv(name, default)))
+    except (TypeError, ValueError):
+        return default
+
+
+POOL_SIZE = max(1, _env_int("DB_POOL_SIZE", 5))
+MAX_OVERFLOW = _env_int("DB_MAX_OVERFLOW", 10)
+POOL_TIMEOUT_SECONDS = _env_int("DB_POOL_TIMEOUT_SECONDS", 30)
+POOL_RECYCLE_SECONDS = _env_int("DB_POOL_RECYCLE_SECONDS", 1800)
+POOL_PREWARM = min(_env_int("DB_POOL_PREWARM", POOL_SIZE), POOL_SIZE)
+STATEMENT_CACHE_SIZE = _env_int("DB_STATEMENT_CACHE_SIZE", 100)
+
+
+def _is_pooler_mode(url: str) -> bool:
+    mode = os.getenv("DB_POOLER_MODE", "auto").strip().lower()
+    if mode in {"transaction", "pgbouncer", "on", "true"}:
+        return True
+    if mode != "auto":
+        return False
+    try:
+        return urlsplit(url).port == 6543
+    except ValueError:
+        return False
+
+
+def _postgres_connect_args(pooler_mode: bool) -> dict:
+    if pooler_mode:
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            # Unnamed statements collide across pooled server connections
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4().hex}__",
+        }
+    return {
+        "statement_cache_size": STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+    }
+
+
+# MetricsCollector set by register_pool_metrics()
+_metrics = None
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that reports how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except sa_exc.TimeoutError:
+            if _metrics is not None:
+                _metrics.record_db_pool_timeout()
+            raise
+        finally:
+            if _metrics is not None:
+                _metrics.record_db_checkout_wait(time.perf_counter() - started)
+
+
+
+def _engine_kwargs(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {
+        "connect_args": _postgres_connect_args(_is_pooler_mode(url)),
+        "poolclass": TimedQueuePool,
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT_SECONDS,
+        "pool_recycle": POOL_RECYCLE_SECONDS,
+    }
+
 
 # Async engine: allows non-blocking DB operations
 engine = create_async_engine(
     DATABASE_URL,
     echo=False,
     future=True,
-    connect_args=connect_args,
     pool_pre_ping=True,
-    pool_timeout=30,
+    **_engine_kwargs(DATABASE_URL),
 )
 
+
+def register_pool_metrics(collector) -> None:
+    """Export checkout wait / timeouts and pool gauges through the metrics collector."""
+    global _metrics
+    _metrics = collector
+    if not isinstance(engine.pool, AsyncAdaptedQueuePool):
+        return
+    collector.register_gauge(
+        "db_pool_size", "Configured persistent connections in the pool", lambda: engine.pool.size()
+    )
+    collector.register_gauge(
+        "db_pool_checked_out", "Connections currently in use", lambda: engine.pool.checkedout()
+    )
+    collector.register_gauge(
+        "db_pool_checked_in", "Idle connections in the pool", lambda: engine.pool.checkedin()
+    )
+    collector.register_gauge(
+        "db_pool_overflow",
+        "Connections open beyond pool_size (negative: pool not yet filled)",
+        lambda: engine.pool.overflow(),
+    )
+    if read_engine is not None:
+        collector.register_gauge(
+            "db_replica_lag_seconds",
+            "Replica replay lag (-1: unknown / unreachable)",
+            lambda: -1 if _replica_lag is None else round(_replica_lag, 3),
+        )
+
+
+async def prewarm_pool(count: int = POOL_PREWARM) -> int:
+    """Open `count` pool connections at startup so the first requests skip the TCP/TLS/auth handshake."""
+    if is_sqlite or count <= 0:
+        return 0
+    connections = [engine.connect() for _ in range(count)]
+    results = await asyncio.gather(*(conn.start() for conn in connections), return_exceptions=True)
+    opened = 0
+    for conn, result in zip(connections, results):
+        if isinstance(result, BaseException):
+            continue
+        try:
+            await conn.execute(text("SELECT 1"))
+            opened += 1
+        finally:
+            await conn.close()
+    if opened < count:
+        failures = [r for r in results if isinstance(r, BaseException)]
+        logger.warning("DB pool pre-warm opened %d/%d connections: %s", opened, count, failures[:1])
+    return opened
+
 # Session factory: creates new session instances
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -107,3 +273,123 @@ async def get_db():
     """
     async with AsyncSessionLocal() as session:
         yield session
+
+
+# ── Read replica ─────────────────────────────────────────────────────────────
+
+_raw_replica_url = os.getenv("DATABASE_REPLICA_URL", "").strip()
+REPLICA_URL = _normalize_database_url(_raw_replica_url) if _raw_replica_url else None
+REPLICA_MAX_LAG_SECONDS = _env_int("DB_REPLICA_MAX_LAG_SECONDS", 10)
+REPLICA_LAG_CHECK_SECONDS = max(1, _env_int("DB_REPLICA_LAG_CHECK_SECONDS", 5))
+READ_YOUR_WRITES_MARGIN_SECONDS = _env_int("DB_READ_YOUR_WRITES_MARGIN_SECONDS", 1)
+# Epoch seconds of the caller's last successful write; set by main's middleware
+LAST_WRITE_COOKIE = "gs_last_write"
+LAST_WRITE_HEADER = "X-Last-Write"
+
+read_engine = None
+AsyncReadSessionLocal = None
+if REPLICA_URL:
+    print(f"Read replica configuration: {_safe_database_url_summary(REPLICA_URL)}")
+    read_engine = create_async_engine(
+        REPLICA_URL,
+        echo=False,
+        future=True,
+        pool_pre_ping=True,
+        **_engine_kwargs(REPLICA_URL),
+    )
+    AsyncReadSessionLocal = sessionmaker(read_engine, class_=AsyncSession, expire_on_commit=False)
+
+# Last measured replay lag in seconds; None until measured or after a failed check
+_replica_lag: Optional[float] = None
+_monitor_task: Optional[asyncio.Task] = None
+
+# 0 when the replica has replayed everything it received (an idle primary
+# otherwise looks like growing lag), else time since the last replayed commit.
+_LAG_SQL = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+def replica_lag() -> Optional[float]:
+    return _replica_lag
+
+
+async def check_replica_lag() -> Optional[float]:
+    """Measure replica lag once; None (→ reads go to the primary) if unreachable."""
+    global _replica_lag
+    if read_engine is None:
+        return None
+    try:
+        async with read_engine.connect() as conn:
+            lag = (await conn.execute(_LAG_SQL)).scalar()
+        _replica_lag = max(0.0, float(lag or 0))
+    except Exception as exc:
+        if _replica_lag is not None:
+            logger.warning("Read replica lag check failed — routing reads to primary: %s", exc)
+        _replica_lag = None
+    return _replica_lag
+
+
+async def _monitor_replica() -> None:
+    while True:
+        await check_replica_lag()
+        await asyncio.sleep(REPLICA_LAG_CHECK_SECONDS)
+
+
+def start_replica_monitor() -> None:
+    global _monitor_task
+    if read_engine is not None and _monitor_task is None:
+        _monitor_task = asyncio.get_running_loop().create_task(_monitor_replica())
+
+
+async def stop_replica_monitor() -> None:
+    global _monitor_task
+    if _monitor_task is not None:
+        _monitor_task.cancel()
+        try:
+            await _monitor_task
+        except asyncio.CancelledError:
+            pass
+        _monitor_task = None
+    if read_engine is not None:
+        await read_engine.dispose()
+
+
+def use_replica(last_write: Optional[float] = None, now: Optional[float] = None) -> bool:
+    """True when a read may go to the replica.
+
+    The replica must be configured and measured within DB_REPLICA_MAX_LAG_SECONDS.
+    A caller whose last write is younger than lag + margin is pinned to the
+    primary so it reads its own write.
+    """
+    if read_engine is None or _replica_lag is None or _replica_lag > REPLICA_MAX_LAG_SECONDS:
+        return False
+    if last_write is not None:
+        now = time.time() if now is None else now
+        if now - last_write <= _replica_lag + READ_YOUR_WRITES_MARGIN_SECONDS:
+            return False
+    return True
+
+
+def _last_write(request: Request) -> Optional[float]:
+    """Newest of the echoed LAST_WRITE_HEADER and LAST_WRITE_COOKIE, if any."""
+    stamps = []
+    for raw in (request.headers.get(LAST_WRITE_HEADER), request.cookies.get(LAST_WRITE_COOKIE)):
+        try:
+            stamps.append(float(raw))
+        except (TypeError, ValueError):
+            continue
+    return max(stamps, default=None)
+
+
+async def get_read_db(request: Request, primary: AsyncSession = Depends(get_db)):
+    """
+    Dependency for read-only endpoints: replica session when usable, else the primary.
+    The primary session opens no connection unless it is actually used.
+    """
+    if not use_replica(_last_write(request)):
+        yield primary
+        return
+    async with AsyncReadSessionLocal() as session:
+        yield session
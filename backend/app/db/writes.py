@@ -0,0 +1,47 @@
+"""
+Single-round-trip write helpers.
+
+The old handler pattern was flush() → commit() → SELECT by id, which costs
+three to four round-trips per mutation. The re-select existed only because
+server-generated columns (created_at, updated_at) would otherwise be expired
+and lazy-loading them under AsyncSession raises.
+
+  - INSERT: the mapper default eager_defaults="auto" already adds the
+    server-generated columns to the flush's RETURNING clause on PostgreSQL.
+    Sessions use expire_on_commit=False, so the committed object is complete
+    and can be serialized as is.
+  - UPDATE: a unit-of-work flush does not fetch onupdate=func.now(), so the
+    helper issues UPDATE ... RETURNING and gets the whole row back in the
+    same statement. Extra WHERE criteria make state transitions atomic.
+    When no row matches, the caller decides whether to report 404 or 409/422
+    and only then pays for a SELECT.
+
+Each mutation therefore costs one statement plus COMMIT.
+"""
+
+from typing import Any, Optional, TypeVar
+
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+
+async def insert_returning(db: AsyncSession, obj: T) -> T:
+    """INSERT ... RETURNING <server defaults> + COMMIT; returns the (fully loaded) object."""
+    db.add(obj)
+    await db.commit()
+    return obj
+
+
+async def update_returning(
+    db: AsyncSession, model: type[T], *criteria: Any, **values: Any
+) -> Optional[T]:
+    """UPDATE model SET values WHERE criteria RETURNING * + COMMIT.
+
+    Returns the updated object, or None when no row matched the criteria.
+    """
+    stmt = update(model).where(*criteria).values(**values).returning(model)
+    obj = (await db.execute(stmt)).scalars().first()
+    await db.commit()
+    return obj
@@ -1,5 +1,6 @@
 # ruff: noqa: E402
 import os
+import time
 
 from dotenv import load_dotenv
 
@@ -46,6 +47,7 @@ from app.api import (
     emergency,
     geofence,
     inventory,
+    jobs,
     kpi,
     missing_persons,
     profile,
@@ -65,10 +67,16 @@ from app.api import (
 )
 from app.api.auth import validate_jwt_secret
 from app.api.observability import MetricsMiddleware, collector
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.api.response import error_response, success_response
 from app.core import cache as _cache
+from app.core import eq_poller as _eq_poller
+from app.core import jobs as _jobs
+from app.core import kpi_rollup as _kpi_rollup
+from app.core import push_delivery, sse_bus
 from app.db import get_db
-from app.db.session import engine
+from app.db import session as db_session
+from app.db.session import engine, prewarm_pool, register_pool_metrics
 from app.models.base import Base
 
 # Tüm modelleri import et - Base.metadata.registry'ye kayıtlı olmalarını sağla
@@ -102,7 +110,32 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         return response
 
 
+class ReadYourWritesMiddleware(BaseHTTPMiddleware):
+    """With a read replica configured, stamp successful writes so get_read_db pins the caller to the primary."""
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if (
+            db_session.read_engine is not None
+            and request.method in {"POST", "PUT", "PATCH", "DELETE"}
+            and response.status_code < 400
+        ):
+            stamp = f"{time.time():.3f}"
+            # Header for the cross-origin SPA (echoed back as X-Last-Write),
+            # cookie for same-origin callers
+            response.headers[db_session.LAST_WRITE_HEADER] = stamp
+            response.set_cookie(
+                db_session.LAST_WRITE_COOKIE,
+                stamp,
+                max_age=db_session.REPLICA_MAX_LAG_SECONDS + db_session.READ_YOUR_WRITES_MARGIN_SECONDS + 1,
+                httponly=True,
+                samesite="lax",
+            )
+        return response
+
+
 app.add_middleware(SecurityHeadersMiddleware)
+app.add_middleware(ReadYourWritesMiddleware)
 app.add_middleware(RequestIDMiddleware)
 app.add_middleware(MetricsMiddleware)
 
@@ -123,6 +156,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, db_session.LAST_WRITE_HEADER],
 )
 
 def _validate_config() -> None:
@@ -171,12 +205,32 @@ async def on_startup():
         print(f"⚠️ Veritabanı bağlantı hatası: {e}")
         print("⚠️ Not: API yine de çalışacak, ama veritabanı işlemleri başarısız olacak.")
 
+    register_pool_metrics(collector)
+    try:
+        opened = await prewarm_pool()
+        if opened:
+            print(f"✅ Veritabanı havuzu ısıtıldı: {opened} bağlantı")
+    except Exception as e:
+        print(f"⚠️ Veritabanı havuzu ısıtılamadı: {e}")
+
+    db_session.start_replica_monitor()
     await _cache.connect()
+    await sse_bus.start()
+    _jobs.start_worker()
+    _eq_poller.poller.start()
+    _kpi_rollup.roller.start()
 
 
 @app.on_event("shutdown")
 async def on_shutdown():
+    await _kpi_rollup.roller.stop()
+    await _eq_poller.poller.stop()
+    await _jobs.stop_worker()
+    await sse.inventory_updates.flush()
+    await sse_bus.stop()
     await _cache.disconnect()
+    await db_session.stop_replica_monitor()
+    push_delivery.shutdown()
 
 app.include_router(auth.router, prefix="/api/v1/auth", tags=["auth"])
 app.include_router(warehouses.router, prefix="/api/v1/warehouses", tags=["warehouses"])
@@ -205,6 +259,7 @@ app.include_router(admin_import.router, prefix="/api/v1/admin/import", tags=["ad
 app.include_router(geofence.router, prefix="/api/v1/geofence", tags=["geofence"])
 app.include_router(channels.router, prefix="/api/v1/channels", tags=["channels"])
 app.include_router(missing_persons.router, prefix="/api/v1/missing-persons", tags=["missing-persons"])
+app.include_router(jobs.router, prefix="/api/v1/jobs", tags=["jobs"])
 
 
 @app.exception_handler(HTTPException)
@@ -19,7 +19,7 @@ class Announcement(Base):
     status = Column(String(50), nullable=False, server_default="draft")     # draft|published|archived
     created_by = Column(Integer, nullable=True)     # user id, intentionally no FK constraint
     published_at = Column(DateTime, nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self) -> str:
@@ -20,4 +20,4 @@ class AuditLog(Base):
     new_value = Column(JSON, nullable=True)
     request_id = Column(String(36), nullable=True)
     ip_address = Column(String(45), nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
@@ -0,0 +1,37 @@
+"""
+DispatchJob model — arka plan bildirim işleri kuyruğu.
+
+Push yayını, deprem bildirim taraması ve geofence alarmı gibi fan-out işleri
+HTTP isteği içinde değil, bu tablodan iş çeken worker tarafından yürütülür.
+status: queued → running → succeeded | failed (hata sonrası yeniden queued).
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String, Text
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class DispatchJob(Base):
+    __tablename__ = "dispatch_jobs"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)          # push_broadcast | earthquake_dispatch | geofence_alert
+    status = Column(String(20), nullable=False, default="queued", index=True)
+    payload = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    progress_done = Column(Integer, nullable=False, default=0)
+    progress_total = Column(Integer, nullable=False, default=0)
+
+    run_after = Column(DateTime, server_default=func.now(), nullable=False)
+    created_at = Column(DateTime, server_default=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<DispatchJob id={self.id} kind='{self.kind}' status='{self.status}'>"
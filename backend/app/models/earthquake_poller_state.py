@@ -0,0 +1,25 @@
+"""
+EarthquakePollerState model — deprem feed yoklayıcısının paylaşılan durumu.
+
+Tek satır (id = 1): görülen en yeni `earthquake_key` (yüksek su işareti) ve
+geç gelme penceresi içindeki anahtarlar. Her yoklama turu advisory kilidi
+altında bu satırı okur ve günceller; hangi worker'ın kilidi aldığından
+bağımsız olarak aynı deprem iki kez kuyruğa girmez.
+"""
+
+from sqlalchemy import JSON, Column, DateTime, Integer, String
+from sqlalchemy.sql import func
+
+from .base import Base
+
+
+class EarthquakePollerState(Base):
+    __tablename__ = "earthquake_poller_state"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    high_water = Column(String(255), nullable=True)
+    recent = Column(JSON, nullable=True)          # list[str] — pencere içindeki anahtarlar
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self) -> str:
+        return f"<EarthquakePollerState high_water={self.high_water!r}>"
@@ -22,7 +22,26 @@ class EmergencyReport(Base):
     aciklama = Column(Text, nullable=True)
     status = Column(String(50), default="new", nullable=False)
     image_url = Column(String(500), nullable=True)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
 
     def __repr__(self) -> str:
         return f"<EmergencyReport id={self.id} durum='{self.durum}' status='{self.status}'>"
+
+
+class EmergencyReportArchive(Base):
+    """Toplu temizlikte arşive taşınan raporlar (emergency_purge işi, archive=true)."""
+
+    __tablename__ = "emergency_reports_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    durum = Column(String, nullable=False)
+    saat = Column(String, nullable=False)
+    harita_link = Column(String, nullable=True)
+    enlem = Column(Float, nullable=False)
+    boylam = Column(Float, nullable=False)
+    kategori = Column(String(100), nullable=True)
+    aciklama = Column(Text, nullable=True)
+    status = Column(String(50), nullable=False)
+    image_url = Column(String(500), nullable=True)
+    created_at = Column(DateTime, nullable=True)
+    archived_at = Column(DateTime, server_default=func.now(), nullable=False)
@@ -27,7 +27,8 @@ class GeofenceSubscription(Base):
     radius_km = Column(Float, default=5.0, nullable=False)
 
     created_at = Column(DateTime, server_default=func.now())
-    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
+    # Izgara indeksinin artımlı tazelemesi bu kolonla ilerler (app/core/geofence_index)
+    updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), index=True)
 
     def __repr__(self) -> str:
         return (
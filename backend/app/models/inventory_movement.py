@@ -26,7 +26,7 @@ class InventoryMovement(Base):
     note = Column(String(500), nullable=True)
     data = Column(JSON, nullable=True)
 
-    timestamp = Column(DateTime, server_default=func.now())
+    timestamp = Column(DateTime, nullable=False, server_default=func.now())
 
     def __repr__(self):
         return f"<InventoryMovement id={self.id} type='{self.movement_type}' qty={self.quantity}>"
@@ -0,0 +1,34 @@
+"""
+KPI rollup modelleri — kovalanmış (dakika/saat/gün) sayaçlar.
+
+Her satır bir metrik + kova + boyut için kovadaki olay sayısını (ve stok
+hareketlerinde toplam miktarı) tutar. Satırları app/core/kpi_rollup.py yazar;
+GET /kpi/timeseries ham tablolara hiç dokunmadan yalnızca buradan okur.
+"""
+
+from sqlalchemy import BigInteger, Column, DateTime, String
+
+from .base import Base
+
+
+class KpiRollup(Base):
+    __tablename__ = "kpi_rollups"
+
+    metric = Column(String(50), primary_key=True)        # emergency_status | checkins | stock_in | ...
+    bucket = Column(String(10), primary_key=True)        # minute | hour | day
+    bucket_start = Column(DateTime, primary_key=True)
+    dimension = Column(String(100), primary_key=True, default="")  # durum, kategori, depo id …
+    count = Column(BigInteger, nullable=False, default=0)
+    amount = Column(BigInteger, nullable=False, default=0)
+
+    def __repr__(self) -> str:
+        return f"<KpiRollup {self.metric}/{self.bucket} {self.bucket_start} '{self.dimension}'={self.count}>"
+
+
+class KpiRollupWatermark(Base):
+    """Metrik başına: ham tablonun hangi ana kadar kovalara işlendiği."""
+
+    __tablename__ = "kpi_rollup_watermarks"
+
+    metric = Column(String(50), primary_key=True)
+    rolled_until = Column(DateTime, nullable=False)
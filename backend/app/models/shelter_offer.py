@@ -27,7 +27,7 @@ class ShelterOffer(Base):
     suitability_notes = Column(String(500), nullable=True)
     status = Column(String(50), default="pending", nullable=False)
 
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self) -> str:
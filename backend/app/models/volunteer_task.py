@@ -18,7 +18,7 @@ class VolunteerTask(Base):
     status = Column(String(20), nullable=False, default="open")
     assigned_to_id = Column(Integer, nullable=True)
     created_by_id = Column(Integer, nullable=False)
-    created_at = Column(DateTime, server_default=func.now())
+    created_at = Column(DateTime, nullable=False, server_default=func.now())
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now())
 
     def __repr__(self) -> str:
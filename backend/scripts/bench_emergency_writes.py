@@ -0,0 +1,136 @@
+"""
+GeoSafe acil bildirim yazma benchmark'ı — flush/commit/re-select vs. INSERT ... RETURNING.
+Kullanim: PYTHONPATH=. python scripts/bench_emergency_writes.py [yazma_sayisi] [eşzamanlılık]
+  ör. python scripts/bench_emergency_writes.py 2000 20
+DATABASE_URL'deki PostgreSQL'e yazar (migration'lar uygulanmış olmalı); benchmark satırları
+sonunda silinir. Üç senaryo ölçülür:
+  eski      : POST /emergency'nin önceki yazma yolu (add → flush → commit → SELECT)
+  returning : app.db.writes.insert_returning (INSERT ... RETURNING → commit)
+  endpoint  : gerçek POST /api/v1/emergency (ASGI içi, rate limit/dedup devre dışı)
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from sqlalchemy import delete, select
+
+from app.api import rate_limit
+from app.db.instrumentation import query_budget
+from app.db.session import AsyncSessionLocal, engine
+from app.db.writes import insert_returning
+from app.main import app
+from app.models.emergency_report import EmergencyReport
+
+# Windows terminal UTF-8 uyumu
+if sys.platform == "win32":
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+
+_MARKER = "bench-write"
+_PAYLOAD = {
+    "durum": _MARKER,
+    "saat": "2026-05-06 10:00",
+    "harita_link": "https://maps.example.com",
+    "enlem": 41.01,
+    "boylam": 29.01,
+}
+
+
+def _report() -> EmergencyReport:
+    return EmergencyReport(**_PAYLOAD, status="new")
+
+
+async def _legacy_write() -> None:
+    async with AsyncSessionLocal() as db:
+        report = _report()
+        db.add(report)
+        await db.flush()
+        report_id = report.id
+        await db.commit()
+        result = await db.execute(select(EmergencyReport).where(EmergencyReport.id == report_id))
+        result.scalar_one()
+
+
+async def _returning_write() -> None:
+    async with AsyncSessionLocal() as db:
+        await insert_returning(db, _report())
+
+
+async def _run(write, n_writes: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            t0 = time.perf_counter()
+            await write()
+            latencies.append((time.perf_counter() - t0) * 1000)
+
+    # Süreç geneli sayaç: endpoint senaryosunda istek kendi track_queries'ini açar
+    with query_budget(sys.maxsize) as stats:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(n_writes)))
+        elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "rps": n_writes / elapsed,
+        "stmts": stats.count / n_writes,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+    }
+
+
+async def _main(n_writes: int, concurrency: int) -> None:
+    async def _allow(*_args, **_kwargs) -> None:
+        return None
+
+    rate_limit.emergency_limiter.check = _allow
+    rate_limit.public_form_dedup.check = _allow
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def _endpoint_write() -> None:
+            response = await client.post("/api/v1/emergency", json=_PAYLOAD)
+            response.raise_for_status()
+
+        scenarios = [
+            ("eski", _legacy_write),
+            ("returning", _returning_write),
+            ("endpoint", _endpoint_write),
+        ]
+        # Isınma: havuz bağlantıları ve statement cache hazır olsun
+        await _run(_returning_write, concurrency, concurrency)
+
+        print(f"  {'Senaryo':<10}  {'yazma/s':>9}  {'ifade/yazma':>11}  {'p50':>9}  {'p95':>9}")
+        try:
+            for name, write in scenarios:
+                r = await _run(write, n_writes, concurrency)
+                print(
+                    f"  {name:<10}  {r['rps']:>9.0f}  {r['stmts']:>11.1f}"
+                    f"  {r['p50_ms']:>6.2f} ms  {r['p95_ms']:>6.2f} ms"
+                )
+        finally:
+            async with AsyncSessionLocal() as db:
+                await db.execute(delete(EmergencyReport).where(EmergencyReport.durum == _MARKER))
+                await db.commit()
+            await engine.dispose()
+
+
+def main() -> None:
+    n_writes = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print("\n" + "═" * 72)
+    print("  GeoSafe acil bildirim yazma benchmark'ı")
+    print(f"  Yazma: {n_writes}  Eşzamanlılık: {concurrency}")
+    print("═" * 72)
+    asyncio.run(_main(n_writes, concurrency))
+    print("═" * 72)
+    print("  ifade/yazma: istek başına çalışan SQL ifadesi (BEGIN/COMMIT hariç)\n")
+
+
+if __name__ == "__main__":
+    main()
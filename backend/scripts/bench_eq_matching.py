@@ -0,0 +1,88 @@
+"""
+GeoSafe deprem eşleştirme benchmark'ı — skaler vs. toplu (NumPy) yol.
+Kullanim: PYTHONPATH=. python scripts/bench_eq_matching.py [tercih_sayisi] [deprem_sayisi]
+Veritabanı gerektirmez; sentetik tercih/deprem popülasyonu üretir.
+"""
+
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+from app.core.eq_bulk_matching import PreferenceColumns, find_matches_bulk
+from app.core.eq_notify import find_matches
+
+# Windows terminal UTF-8 uyumu
+if sys.platform == "win32":
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+
+
+def _population(n_prefs: int, n_quakes: int, seed: int = 42):
+    rng = random.Random(seed)
+    prefs = []
+    for uid in range(n_prefs):
+        has_radius = rng.random() < 0.7
+        quiet = rng.random() < 0.2
+        prefs.append(SimpleNamespace(
+            user_id=uid,
+            enabled=rng.random() < 0.95,
+            min_magnitude=round(rng.uniform(3.0, 5.5), 1),
+            max_depth_km=rng.uniform(10, 70) if rng.random() < 0.3 else None,
+            reference_lat=rng.uniform(36, 42) if has_radius else None,
+            reference_lon=rng.uniform(26, 44) if has_radius else None,
+            radius_km=rng.uniform(20, 300) if has_radius else None,
+            quiet_hours_start=23 if quiet else None,
+            quiet_hours_end=7 if quiet else None,
+            critical_override_magnitude=6.0 if quiet else None,
+        ))
+    quakes = [
+        {
+            "mag": round(rng.uniform(3.5, 6.5), 1),
+            "title": f"EQ {i}",
+            "date": f"2026-05-29 10:{i % 60:02d}:00",
+            "depth": rng.uniform(2, 40),
+            "lat": rng.uniform(36, 42),
+            "lon": rng.uniform(26, 44),
+        }
+        for i in range(n_quakes)
+    ]
+    return prefs, quakes
+
+
+def _timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - t0) * 1000
+
+
+def main() -> None:
+    n_prefs = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_quakes = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    print("\n" + "═" * 60)
+    print("  GeoSafe deprem eşleştirme benchmark'ı")
+    print(f"  Tercih: {n_prefs:,}   Deprem: {n_quakes:,}   Çift: {n_prefs * n_quakes:,}")
+    print("═" * 60)
+
+    prefs, quakes = _population(n_prefs, n_quakes)
+
+    scalar, scalar_ms = _timed(find_matches, quakes, prefs)
+    cols, pack_ms = _timed(PreferenceColumns, prefs)
+    bulk, bulk_ms = _timed(find_matches_bulk, quakes, cols)
+
+    same = [(id(p), id(e)) for p, e in scalar] == [(id(p), id(e)) for p, e in bulk]
+
+    print(f"  Skaler find_matches     : {scalar_ms:10.1f} ms")
+    print(f"  Sütun paketleme         : {pack_ms:10.1f} ms")
+    print(f"  Toplu find_matches_bulk : {bulk_ms:10.1f} ms")
+    print(f"  Toplam (paket + toplu)  : {pack_ms + bulk_ms:10.1f} ms")
+    speedup = scalar_ms / (pack_ms + bulk_ms) if pack_ms + bulk_ms > 0 else 0
+    print(f"  Hızlanma                : {speedup:10.1f}x")
+    print(f"  Eşleşme sayısı          : {len(bulk):,}")
+    print(f"  Sonuçlar aynı mı        : {'✅ evet' if same else '❌ HAYIR'}")
+    print("═" * 60 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+GeoSafe SSE soak benchmark'ı — bağlantı başına bellek ve yayın gecikmesi.
+Kullanim: PYTHONPATH=. python scripts/bench_sse_soak.py [istemci_sayilari] [yayin_sayisi]
+  ör. python scripts/bench_sse_soak.py 1000,10000,50000 20
+Ağ/Redis gerektirmez; her istemci gerçek `_event_stream` üreticisini tüketen bir görevdir
+(yanıt gövdesi yazımı hariç — ölçülen sunucu tarafı bağlantı yüküdür).
+"""
+
+import asyncio
+import gc
+import statistics
+import sys
+import time
+import tracemalloc
+
+from app.api import sse
+
+# Windows terminal UTF-8 uyumu
+if sys.platform == "win32":
+    import io
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding="utf-8", errors="replace")
+
+
+async def _consume(stream, received: list[float], counter: dict) -> None:
+    async for _ in stream:
+        received.append(time.perf_counter())
+        counter["left"] -= 1
+        if counter["left"] == 0:
+            counter["done"].set()
+
+
+async def _run(n_clients: int, n_broadcasts: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+
+    received: list[float] = []
+    counter = {"left": 0, "done": asyncio.Event()}
+    tasks = []
+    for _ in range(n_clients):
+        stream = sse._event_stream(sse._register())
+        tasks.append(asyncio.ensure_future(_consume(stream, received, counter)))
+    await asyncio.sleep(0)  # tüm akışlar ilk get() üzerinde beklesin
+
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_conn = (held - base) / n_clients
+
+    latencies = []
+    for i in range(n_broadcasts):
+        received.clear()
+        counter["left"] = n_clients
+        counter["done"] = asyncio.Event()
+        t0 = time.perf_counter()
+        await sse.broadcast_announcement({"id": i, "title": "Soak"})
+        publish_ms = (time.perf_counter() - t0) * 1000
+        await counter["done"].wait()
+        latencies.append(((max(received) - t0) * 1000, publish_ms))
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    fanout = sorted(last for last, _ in latencies)
+    return {
+        "per_conn": per_conn,
+        "publish_ms": statistics.median(p for _, p in latencies),
+        "p50_ms": statistics.median(fanout),
+        "p95_ms": fanout[min(len(fanout) - 1, int(len(fanout) * 0.95))],
+    }
+
+
+def main() -> None:
+    sizes = [int(x) for x in (sys.argv[1] if len(sys.argv) > 1 else "1000,10000,50000").split(",")]
+    n_broadcasts = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    print("\n" + "═" * 72)
+    print("  GeoSafe SSE soak benchmark'ı (memory bus, tek worker)")
+    print(f"  Yayın sayısı: {n_broadcasts}")
+    print("═" * 72)
+    print(f"  {'İstemci':>8}  {'Bellek/bağlantı':>16}  {'publish p50':>12}  {'teslim p50':>11}  {'teslim p95':>11}")
+    for n in sizes:
+        r = asyncio.run(_run(n, n_broadcasts))
+        print(
+            f"  {n:>8,}  {r['per_conn'] / 1024:>13.2f} KB  {r['publish_ms']:>9.2f} ms"
+            f"  {r['p50_ms']:>8.2f} ms  {r['p95_ms']:>8.2f} ms"
+        )
+    print("═" * 72)
+    print("  publish: yayın çağrısının dönmesi (tüm kuyruklara frame konması)")
+    print("  teslim : yayından son istemcinin frame'i almasına kadar geçen süre\n")
+
+
+if __name__ == "__main__":
+    main()
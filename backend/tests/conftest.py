@@ -67,8 +67,15 @@ SYNC_DATABASE_URL = _to_sync_url(ASYNC_DATABASE_URL)
 # Ensure app imports and dependencies use async test URL.
 os.environ["DATABASE_URL"] = ASYNC_DATABASE_URL
 os.environ.setdefault("JWT_SECRET", "test-suite-random-secret-32-chars-min")
+# Background dispatch jobs run inline so endpoint tests can assert on their result.
+os.environ.setdefault("JOBS_EAGER", "true")
+# Inventory SSE deltas go out immediately instead of after the batching window.
+os.environ.setdefault("SSE_INVENTORY_WINDOW_MS", "0")
+# KPI summary is read fresh on every request instead of from the short-TTL snapshot.
+os.environ.setdefault("KPI_SUMMARY_TTL_SECONDS", "0")
 
 from app.api.auth import get_current_user  # noqa: E402
+from app.core import cache  # noqa: E402
 from app.db import get_db  # noqa: E402
 from app.main import app  # noqa: E402
 from app.models.base import Base  # noqa: E402
@@ -150,6 +157,7 @@ def clean_database(setup_test_database):
     volunteer_limiter._buckets.clear()
     shelter_limiter._buckets.clear()
     nearest_depot_limiter._buckets.clear()
+    cache.clear_local()
     _truncate_all_tables()
     _seed_admin_user()
 
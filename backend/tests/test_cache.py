@@ -0,0 +1,234 @@
+"""İki katmanlı önbellek — yerel LRU, Redis katmanı, invalidation ve stampede koruması testleri."""
+
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.api.observability import collector
+from app.core import cache
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, key):
+        self.ops.append(("get", key))
+
+    def pttl(self, key):
+        self.ops.append(("pttl", key))
+
+    async def execute(self):
+        self.redis.round_trips += 1
+        out = []
+        for op, key in self.ops:
+            if op == "get":
+                out.append(self.redis.store.get(key))
+            else:
+                out.append(30_000 if key in self.redis.store else -2)
+        return out
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.store = {}
+        self.published = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    async def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(cache, "_client", redis)
+    monkeypatch.setattr(cache, "_connected", True)
+    cache.clear_local()
+    yield redis
+    cache.clear_local()
+
+
+@pytest.fixture
+def no_redis(monkeypatch):
+    monkeypatch.setattr(cache, "_client", None)
+    monkeypatch.setattr(cache, "_connected", False)
+    cache.clear_local()
+    yield
+    cache.clear_local()
+
+
+# ── LocalLRU ──────────────────────────────────────────────────────────────────
+
+def test_lru_evicts_least_recently_used():
+    lru = cache.LocalLRU(max_entries=2)
+    lru.set("a", 1, 60)
+    lru.set("b", 2, 60)
+    assert lru.get("a") == (True, 1)  # a artık en yeni
+    lru.set("c", 3, 60)
+    assert lru.get("b") == (False, None)
+    assert lru.get("a") == (True, 1)
+    assert len(lru) == 2
+
+
+def test_lru_entry_expires(monkeypatch):
+    lru = cache.LocalLRU(max_entries=4)
+    lru.set("a", 1, 5)
+    real = time.monotonic()
+    monkeypatch.setattr(cache.time, "monotonic", lambda: real + 6)
+    assert lru.get("a") == (False, None)
+    assert len(lru) == 0
+
+
+# ── get / set / delete ────────────────────────────────────────────────────────
+
+async def test_local_tier_works_without_redis(no_redis):
+    await cache.set("k", {"v": 1}, ttl=60)
+    assert await cache.get("k") == {"v": 1}
+    await cache.delete("k")
+    assert await cache.get("k") is None
+
+
+async def test_local_value_matches_redis_encoding(no_redis):
+    from datetime import datetime
+
+    await cache.set("k", {"at": datetime(2026, 5, 29, 10, 0)}, ttl=60)
+    assert await cache.get("k") == {"at": "2026-05-29 10:00:00"}
+
+
+async def test_redis_hit_is_promoted_to_local_tier(fake_redis):
+    fake_redis.store["k"] = json.dumps([1, 2, 3])
+
+    before_local = collector._cache_tier_misses["local"]
+    before_redis = collector._cache_tier_hits["redis"]
+    assert await cache.get("k") == [1, 2, 3]
+    assert await cache.get("k") == [1, 2, 3]
+
+    assert fake_redis.round_trips == 1
+    assert collector._cache_tier_misses["local"] == before_local + 1
+    assert collector._cache_tier_hits["redis"] == before_redis + 1
+
+
+async def test_writes_publish_invalidation(fake_redis):
+    await cache.set("k", 1, ttl=60)
+    await cache.delete("k", "j")
+
+    assert [msg["keys"] for _, msg in fake_redis.published] == [["k"], ["k", "j"]]
+    assert all(channel == cache.INVALIDATION_CHANNEL for channel, _ in fake_redis.published)
+    assert all(msg["origin"] == cache._INSTANCE_ID for _, msg in fake_redis.published)
+
+
+async def test_invalidation_from_other_worker_drops_local_entry(no_redis):
+    await cache.set("k", 1, ttl=60)
+
+    cache._apply_invalidation(json.dumps({"origin": cache._INSTANCE_ID, "keys": ["k"]}))
+    assert await cache.get("k") == 1
+
+    cache._apply_invalidation(json.dumps({"origin": "other-worker", "keys": ["k"]}))
+    assert await cache.get("k") is None
+
+
+# ── single-flight / erken süre dolumu ─────────────────────────────────────────
+
+def _counting_loader(value="v", delay=0.02):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+async def test_single_flight_coalesces_concurrent_loads():
+    loader, calls = _counting_loader()
+    results = await asyncio.gather(*(cache.single_flight("k", loader) for _ in range(50)))
+    assert results == ["v"] * 50
+    assert len(calls) == 1
+    assert "k" not in cache._inflight
+
+
+async def test_single_flight_propagates_errors_and_recovers():
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(
+        *(cache.single_flight("k", failing) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+    loader, calls = _counting_loader()
+    assert await cache.single_flight("k", loader) == "v"
+
+
+async def test_single_flight_follower_takes_over_when_leader_cancelled():
+    loader, calls = _counting_loader()
+    leader = asyncio.ensure_future(cache.single_flight("k", loader))
+    await asyncio.sleep(0)
+    follower = asyncio.ensure_future(cache.single_flight("k", loader))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == "v"
+    assert len(calls) == 2
+
+
+async def test_get_or_load_caches_and_coalesces(no_redis):
+    loader, calls = _counting_loader(value=[1, 2])
+    results = await asyncio.gather(*(cache.get_or_load("k", loader, ttl=60) for _ in range(20)))
+    assert results == [[1, 2]] * 20
+    assert await cache.get_or_load("k", loader, ttl=60) == [1, 2]
+    assert len(calls) == 1
+
+
+async def test_get_or_load_skips_store_when_deleted_during_load(no_redis):
+    async def loader():
+        await cache.delete("k")  # yükleme sürerken yazma/invalidation
+        return "old"
+
+    assert await cache.get_or_load("k", loader, ttl=60) == "old"
+    assert await cache.get("k") is None
+
+
+def test_early_expiry_probability_grows_near_expiry():
+    now = 1_000.0
+    envelope = {"v": 1, "delta": 1.0, "exp": now + 60}
+    assert not any(cache._should_refresh_early(envelope, 1.0, now) for _ in range(1000))
+
+    near = {"v": 1, "delta": 1.0, "exp": now + 0.5}
+    hits = sum(cache._should_refresh_early(near, 1.0, now) for _ in range(1000))
+    assert 0 < hits < 1000
+
+    assert cache._should_refresh_early({"v": 1, "delta": 0.0, "exp": now}, 1.0, now)
+
+
+async def test_early_refresh_serves_old_value_to_concurrent_readers(no_redis, monkeypatch):
+    await cache.set("k", {"v": "old", "delta": 0.1, "exp": time.time() + 60}, ttl=60)
+    monkeypatch.setattr(cache, "_should_refresh_early", lambda *a: True)
+    loader, calls = _counting_loader(value="new")
+
+    results = await asyncio.gather(*(cache.get_or_load("k", loader, ttl=60) for _ in range(5)))
+    assert results[0] == "new"
+    assert results[1:] == ["old"] * 4
+    assert len(calls) == 1
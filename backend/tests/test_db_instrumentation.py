@@ -0,0 +1,84 @@
+"""SQL enstrümantasyonu — istek başına sorgu sayımı, sorgu bütçesi ve /metrics histogramları testleri."""
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, text
+
+from app.api.observability import MetricsCollector, MetricsMiddleware
+from app.db import instrumentation
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://")
+    yield eng
+    eng.dispose()
+
+
+def _run(engine, n):
+    with engine.connect() as conn:
+        for i in range(n):
+            conn.execute(text("SELECT :i"), {"i": i})
+
+
+def test_track_queries_counts_statements_in_context(engine):
+    with instrumentation.track_queries() as stats:
+        _run(engine, 3)
+    _run(engine, 2)  # bağlam dışında — sayılmaz
+
+    assert stats.count == 3
+    assert stats.total_seconds >= stats.slowest_seconds > 0
+    assert stats.slowest_statement == "SELECT ?"
+
+
+def test_query_budget_passes_within_budget(engine):
+    with instrumentation.query_budget(3) as stats:
+        _run(engine, 3)
+    assert stats.count == 3
+
+
+def test_query_budget_fails_and_lists_statements(engine):
+    with pytest.raises(instrumentation.QueryBudgetExceeded) as excinfo:
+        with instrumentation.query_budget(2):
+            _run(engine, 4)
+    assert "4 queries executed, budget is 2" in str(excinfo.value)
+    assert "4. SELECT ?" in str(excinfo.value)
+
+
+def test_failed_statement_does_not_leak_start_time(engine):
+    with engine.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM yok_boyle_tablo"))
+        assert conn.info.get("_query_started", []) == []
+
+        with instrumentation.track_queries() as stats:
+            conn.execute(text("SELECT 1"))
+        assert stats.count == 1
+        assert conn.info["_query_started"] == []
+
+
+async def test_middleware_reports_headers_and_histograms(engine, monkeypatch):
+    collector = MetricsCollector()
+    monkeypatch.setattr("app.api.observability.collector", collector)
+    monkeypatch.setattr(instrumentation, "STATS_HEADERS", True)
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/items/{item_id}")
+    async def read_item(item_id: int):
+        _run(engine, 4)
+        return {"id": item_id}
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/items/7")
+
+    assert response.headers["X-DB-Query-Count"] == "4"
+    assert float(response.headers["X-DB-Time-Ms"]) >= float(response.headers["X-DB-Slowest-Ms"])
+    text_out = collector.prometheus_text()
+    assert 'db_queries_per_request_bucket{method="GET",path="/items/{id}",le="5"} 1' in text_out
+    assert 'db_queries_per_request_count{method="GET",path="/items/{id}"} 1' in text_out
+    assert "# TYPE db_time_per_request_seconds histogram" in text_out
@@ -0,0 +1,68 @@
+"""Veritabanı bağlantı havuzu — pooler modu algılama, asyncpg ayarları ve havuz metrikleri testleri."""
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.util import greenlet_spawn
+
+from app.api.observability import MetricsCollector
+from app.db import session
+
+
+@pytest.mark.parametrize(
+    ("mode", "url", "expected"),
+    [
+        ("auto", "postgresql+asyncpg://u:p@aws-1.pooler.supabase.com:6543/postgres", True),
+        ("auto", "postgresql+asyncpg://u:p@db:5432/geosafe", False),
+        ("transaction", "postgresql+asyncpg://u:p@pgbouncer:5432/geosafe", True),
+        ("off", "postgresql+asyncpg://u:p@aws-1.pooler.supabase.com:6543/postgres", False),
+    ],
+)
+def test_pooler_mode_detection(monkeypatch, mode, url, expected):
+    monkeypatch.setenv("DB_POOLER_MODE", mode)
+    assert session._is_pooler_mode(url) is expected
+
+
+def test_pooler_mode_disables_statement_caches():
+    args = session._postgres_connect_args(True)
+    assert args["statement_cache_size"] == 0
+    assert args["prepared_statement_cache_size"] == 0
+    names = {args["prepared_statement_name_func"]() for _ in range(3)}
+    assert len(names) == 3
+
+    direct = session._postgres_connect_args(False)
+    assert direct["statement_cache_size"] == session.STATEMENT_CACHE_SIZE
+    assert "prepared_statement_name_func" not in direct
+
+
+async def test_pool_records_checkout_wait_and_timeouts(monkeypatch):
+    collector = MetricsCollector()
+    monkeypatch.setattr(session, "_metrics", collector)
+
+    def exhaust():
+        pool = session.TimedQueuePool(MagicMock, pool_size=1, max_overflow=0, timeout=0.01)
+        held = pool.connect()
+        try:
+            with pytest.raises(exc.TimeoutError):
+                pool.connect()
+        finally:
+            held.close()
+            pool.dispose()
+
+    await greenlet_spawn(exhaust)
+
+    text = collector.prometheus_text()
+    assert "db_pool_checkout_wait_seconds_count 2" in text
+    assert 'db_pool_checkout_wait_seconds_bucket{le="0.001"} 1' in text
+    assert "db_pool_timeouts_total 1" in text
+
+
+def test_pool_gauges_registered_for_queue_pool(monkeypatch):
+    monkeypatch.setattr(session, "_metrics", None)
+    collector = MetricsCollector()
+    session.register_pool_metrics(collector)
+
+    text = collector.prometheus_text()
+    assert f"db_pool_size {session.POOL_SIZE}" in text
+    assert "db_pool_checked_out 0" in text
@@ -0,0 +1,169 @@
+"""Deprem feed'i — paralel gün çekimi, mühürlü gün önbelleği ve stale-while-revalidate testleri."""
+
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api import earthquakes
+from app.core import cache
+
+
+def _raw(date_time, mag=4.5):
+    return {
+        "mag": mag,
+        "title": "T",
+        "date_time": date_time,
+        "depth": 7.0,
+        "geojson": {"coordinates": [29.0, 41.0]},
+    }
+
+
+@pytest.fixture(autouse=True)
+def _reset_day_cache():
+    earthquakes._sealed_days.clear()
+    earthquakes._cached_entry = None
+    cache.clear_local()
+    yield
+    earthquakes._sealed_days.clear()
+    earthquakes._cached_entry = None
+    cache.clear_local()
+
+
+def _fake_upstream(monkeypatch, *, fail=(), delay=0.05):
+    calls = []
+    in_flight = {"now": 0, "peak": 0}
+
+    async def fake_fetch_day(client, date):
+        calls.append(date)
+        in_flight["now"] += 1
+        in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        try:
+            await asyncio.sleep(delay)
+            if date in fail:
+                raise asyncio.TimeoutError()
+            return [_raw(f"{date} 12:00:00")]
+        finally:
+            in_flight["now"] -= 1
+
+    monkeypatch.setattr(earthquakes, "_fetch_day", fake_fetch_day)
+    return calls, in_flight
+
+
+def _dates():
+    now = datetime.now()
+    return [(now - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(earthquakes.LOOKBACK_DAYS)]
+
+
+async def test_cold_fetch_requests_days_concurrently(monkeypatch):
+    calls, in_flight = _fake_upstream(monkeypatch)
+    feed = await earthquakes._fetch_fresh()
+
+    assert sorted(calls) == sorted(_dates())
+    assert in_flight["peak"] == earthquakes.LOOKBACK_DAYS
+    assert feed["partial_errors"] == []
+
+
+async def test_sealed_past_days_are_not_downloaded_again(monkeypatch):
+    calls, _ = _fake_upstream(monkeypatch)
+    await earthquakes._fetch_fresh()
+    calls.clear()
+
+    await earthquakes._fetch_fresh()
+    today = _dates()[0]
+    assert today in calls
+    # En eski gün her zaman mühürlü; yeniden istenmemeli.
+    assert _dates()[-1] not in calls
+
+
+async def test_failed_day_is_reported_and_others_merged(monkeypatch):
+    oldest = _dates()[-1]
+    _fake_upstream(monkeypatch, fail={oldest})
+    feed = await earthquakes._fetch_fresh()
+
+    assert len(feed["partial_errors"]) == 1
+    assert feed["partial_errors"][0].startswith(oldest)
+    assert oldest not in earthquakes._sealed_days
+
+
+def test_is_sealed_respects_grace_period():
+    day = "2026-05-29"
+    assert not earthquakes._is_sealed(day, datetime(2026, 5, 29, 23, 59))
+    assert not earthquakes._is_sealed(day, datetime(2026, 5, 30, 0, 10))
+    assert earthquakes._is_sealed(day, datetime(2026, 5, 30, 1, 0))
+
+
+# ── stale-while-revalidate ────────────────────────────────────────────────────
+
+def _fake_fetch_fresh(monkeypatch, *, delay=0.0, fail=False):
+    calls = []
+
+    async def fake():
+        calls.append(time.time())
+        await asyncio.sleep(delay)
+        if fail:
+            raise RuntimeError("kandilli down")
+        return {"result": [{"mag": 4.0}], "partial_errors": []}
+
+    monkeypatch.setattr(earthquakes, "_fetch_fresh", fake)
+    return calls
+
+
+def _seed(age_seconds):
+    earthquakes._cached_entry = {
+        "payload": {"result": [{"mag": 3.9}], "partial_errors": []},
+        "fetched_at": time.time() - age_seconds,
+    }
+
+
+async def test_fresh_entry_served_without_upstream(monkeypatch):
+    calls = _fake_fetch_fresh(monkeypatch)
+    _seed(10)
+
+    res = await earthquakes.get_earthquakes()
+    assert res["data"]["stale"] is False
+    assert res["data"]["age_seconds"] >= 10
+    assert calls == []
+
+
+async def test_soft_expired_entry_served_immediately_and_refreshed_once(monkeypatch):
+    calls = _fake_fetch_fresh(monkeypatch, delay=0.05)
+    _seed(earthquakes._SOFT_TTL_SECONDS + 1)
+
+    responses = await asyncio.gather(*(earthquakes.get_earthquakes() for _ in range(20)))
+    assert all(r["data"]["stale"] is True for r in responses)
+    assert all(r["data"]["result"] == [{"mag": 3.9}] for r in responses)
+
+    await earthquakes._refresh_task
+    assert len(calls) == 1
+    res = await earthquakes.get_earthquakes()
+    assert res["data"]["stale"] is False
+    assert res["data"]["result"] == [{"mag": 4.0}]
+
+
+async def test_hard_expired_entry_waits_for_upstream(monkeypatch):
+    calls = _fake_fetch_fresh(monkeypatch)
+    _seed(earthquakes._HARD_TTL_SECONDS + 1)
+
+    res = await earthquakes.get_earthquakes()
+    assert len(calls) == 1
+    assert res["data"]["cached"] is False
+    assert res["data"]["age_seconds"] == 0
+
+
+async def test_upstream_error_serves_last_payload(monkeypatch):
+    _fake_fetch_fresh(monkeypatch, fail=True)
+    _seed(earthquakes._HARD_TTL_SECONDS + 1)
+
+    res = await earthquakes.get_earthquakes()
+    assert res["data"]["stale"] is True
+    assert res["data"]["result"] == [{"mag": 3.9}]
+
+
+async def test_concurrent_cold_misses_share_one_upstream_fetch(monkeypatch):
+    calls = _fake_fetch_fresh(monkeypatch, delay=0.05)
+
+    responses = await asyncio.gather(*(earthquakes.get_earthquakes() for _ in range(20)))
+    assert len(calls) == 1
+    assert all(r["data"]["result"] == [{"mag": 4.0}] for r in responses)
@@ -6,6 +6,7 @@ Sprint 3A (status field, status filter, status update, admin-only enforcement).
 
 from app.api.auth import get_current_user
 from app.api.rate_limit import emergency_limiter, public_form_dedup
+from app.db.instrumentation import query_budget
 from app.main import app
 from app.models.user import User
 
@@ -206,3 +207,174 @@ def test_emergency_admin_status_update_not_found(client):
         json={"status": "resolved"},
     )
     assert patch_res.status_code == 404
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Single-round-trip writes — INSERT/UPDATE ... RETURNING, no re-select
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_emergency_writes_cost_one_statement(client):
+    """Create and status update each run a single statement (plus COMMIT)."""
+    emergency_limiter._buckets.clear()
+    public_form_dedup._seen.clear()
+    with query_budget(1):
+        create_res = client.post("/api/v1/emergency", json={**_PAYLOAD, "durum": "Budget"})
+    assert create_res.status_code == 201
+    em_id = create_res.json()["data"]["id"]
+
+    with query_budget(1):
+        patch_res = client.patch(
+            f"/api/v1/emergency/admin/{em_id}/status",
+            json={"status": "reviewing"},
+        )
+    assert patch_res.status_code == 200
+    data = patch_res.json()["data"]
+    assert data["status"] == "reviewing"
+    assert data["created_at"] is not None
+
+
+def test_emergency_admin_list_keyset_pages_cover_all_rows(client):
+    """Cursor pages are newest first, disjoint, and the last page has no X-Next-Cursor."""
+    emergency_limiter._buckets.clear()
+    public_form_dedup._seen.clear()
+    for i in range(5):
+        client.post("/api/v1/emergency", json={**_PAYLOAD, "durum": f"Page {i}"})
+
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        res = client.get("/api/v1/emergency/admin", params=params)
+        assert res.status_code == 200
+        page = res.json()["data"]
+        assert len(page) <= 2
+        seen.extend(r["id"] for r in page)
+        cursor = res.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert len(seen) == len(set(seen)) >= 5
+    assert seen == sorted(seen, reverse=True)
+
+
+def test_emergency_admin_list_rejects_bad_cursor(client):
+    res = client.get("/api/v1/emergency/admin", params={"cursor": "bozuk!"})
+    assert res.status_code == 400
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Bulk clear / archive (emergency_purge job)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _create_reports(client, n, prefix="Purge"):
+    emergency_limiter._buckets.clear()
+    public_form_dedup._seen.clear()
+    return [
+        client.post("/api/v1/emergency", json={**_PAYLOAD, "durum": f"{prefix} {i}"}).json()["data"]["id"]
+        for i in range(n)
+    ]
+
+
+def test_emergency_bulk_clear_runs_as_chunked_job(client, monkeypatch):
+    from app.api import emergency
+
+    monkeypatch.setattr(emergency, "PURGE_CHUNK_SIZE", 2)
+    _create_reports(client, 5)
+
+    with query_budget(20) as stats:
+        res = client.delete("/api/v1/emergency")
+    assert res.status_code == 202
+    job = res.json()["data"]
+    assert job["kind"] == "emergency_purge"
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"deleted": 5, "archived": 0}
+    assert job["progress"] == {"done": 5, "total": 5}
+    # Set-based: one DELETE per chunk (3 chunks + the empty one), never per row
+    deletes = [s for s in stats.statements if s.lstrip().upper().startswith("DELETE")]
+    assert len(deletes) == 4
+
+    assert client.get("/api/v1/emergency/admin").json()["data"] == []
+
+
+def test_emergency_bulk_archive_filtered_by_status(client):
+    import os
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+
+    spam_id, keep_id = _create_reports(client, 2, prefix="Archive")
+    client.patch(f"/api/v1/emergency/admin/{spam_id}/status", json={"status": "spam"})
+
+    res = client.delete("/api/v1/emergency", params={"status": "spam", "archive": "true"})
+    assert res.status_code == 202
+    assert res.json()["data"]["result"] == {"deleted": 1, "archived": 1}
+
+    remaining = [r["id"] for r in client.get("/api/v1/emergency/admin").json()["data"]]
+    assert remaining == [keep_id]
+
+    engine = create_engine(
+        os.environ["DATABASE_URL"].replace("postgresql+asyncpg://", "postgresql://", 1), poolclass=NullPool
+    )
+    with engine.connect() as conn:
+        archived = conn.execute(
+            text("SELECT id, status, archived_at FROM emergency_reports_archive")
+        ).all()
+    engine.dispose()
+    assert [(r.id, r.status) for r in archived] == [(spam_id, "spam")]
+    assert archived[0].archived_at is not None
+
+
+def test_emergency_bulk_clear_filtered_by_date(client):
+    _create_reports(client, 3)
+    res = client.delete("/api/v1/emergency", params={"before": "2000-01-01T00:00:00"})
+    assert res.json()["data"]["result"] == {"deleted": 0, "archived": 0}
+    assert len(client.get("/api/v1/emergency/admin").json()["data"]) == 3
+
+
+def test_emergency_bulk_clear_keeps_reports_submitted_while_running(client, monkeypatch):
+    import os
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+
+    from app.api import emergency
+    from app.core import jobs
+
+    monkeypatch.setattr(emergency, "PURGE_CHUNK_SIZE", 2)
+    _create_reports(client, 4)
+
+    engine = create_engine(
+        os.environ["DATABASE_URL"].replace("postgresql+asyncpg://", "postgresql://", 1), poolclass=NullPool
+    )
+    late_ids = []
+    report = jobs.JobContext.report
+
+    def _report_and_insert(self, done, total):
+        # İlk parçadan sonra, iş sürerken yeni bir bildirim gelir
+        if done and not late_ids:
+            with engine.begin() as conn:
+                late_ids.append(
+                    conn.execute(
+                        text(
+                            "INSERT INTO emergency_reports (durum, saat, enlem, boylam, status) "
+                            "VALUES ('Late', '2026-05-06 10:00', 41.0, 29.0, 'new') RETURNING id"
+                        )
+                    ).scalar()
+                )
+        return report(self, done, total)
+
+    monkeypatch.setattr(jobs.JobContext, "report", _report_and_insert)
+    res = client.delete("/api/v1/emergency")
+    engine.dispose()
+
+    assert res.json()["data"]["result"] == {"deleted": 4, "archived": 0}
+    assert [r["id"] for r in client.get("/api/v1/emergency/admin").json()["data"]] == late_ids
+
+
+def test_emergency_bulk_clear_before_honours_utc_offset(client):
+    from datetime import datetime, timedelta, timezone
+
+    _create_reports(client, 3)
+    # Bir saat sonrası, -03:00 ile yazılmış: yerel saat kısmı "şimdi - 2 saat"
+    before = (datetime.now(timezone.utc) + timedelta(hours=1)).astimezone(timezone(timedelta(hours=-3)))
+    res = client.delete("/api/v1/emergency", params={"before": before.isoformat()})
+    assert res.json()["data"]["result"] == {"deleted": 3, "archived": 0}
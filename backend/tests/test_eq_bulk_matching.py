@@ -0,0 +1,124 @@
+"""Toplu (NumPy) eşleştirici — skaler `find_matches` ile birebir eşdeğerlik testleri."""
+
+import random
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+from app.core.eq_bulk_matching import PreferenceColumns, find_matches_bulk
+from app.core.eq_notify import find_matches
+
+
+def _pref(user_id, **overrides):
+    base = dict(
+        user_id=user_id,
+        enabled=True,
+        min_magnitude=4.0,
+        max_depth_km=None,
+        reference_lat=None,
+        reference_lon=None,
+        radius_km=None,
+        quiet_hours_start=None,
+        quiet_hours_end=None,
+        critical_override_magnitude=None,
+    )
+    base.update(overrides)
+    return SimpleNamespace(**base)
+
+
+def _eq(mag=5.0, depth=7.0, lat=41.0, lon=29.0, date="2026-05-29 10:00:00"):
+    return {"mag": mag, "title": "Test", "date": date, "depth": depth, "lat": lat, "lon": lon}
+
+
+def _pairs(matches):
+    return [(p.user_id, e["date"]) for p, e in matches]
+
+
+def _now_hour() -> int:
+    return datetime.now(timezone.utc).hour
+
+
+def test_bulk_matches_magnitude_and_disabled():
+    prefs = [
+        _pref(1, min_magnitude=4.0),
+        _pref(2, min_magnitude=9.0),
+        _pref(3, enabled=False),
+    ]
+    matches = find_matches_bulk([_eq(mag=5.0)], prefs)
+    assert [p.user_id for p, _ in matches] == [1]
+
+
+def test_bulk_depth_filter_skipped_when_depth_missing():
+    prefs = [_pref(1, max_depth_km=10.0)]
+    quakes = [_eq(depth=30.0, date="a"), _eq(depth=None, date="b"), _eq(depth=5.0, date="c")]
+    assert _pairs(find_matches_bulk(quakes, prefs)) == [(1, "b"), (1, "c")]
+
+
+def test_bulk_radius_requires_coordinates():
+    prefs = [_pref(1, reference_lat=41.0, reference_lon=29.0, radius_km=50.0)]
+    quakes = [
+        _eq(lat=41.1, lon=29.1, date="near"),
+        _eq(lat=39.0, lon=35.0, date="far"),
+        _eq(lat=None, lon=None, date="no-coords"),
+    ]
+    assert _pairs(find_matches_bulk(quakes, prefs)) == [(1, "near")]
+
+
+def test_bulk_quiet_hours_with_critical_override():
+    prefs = [
+        _pref(1, quiet_hours_start=22, quiet_hours_end=6, critical_override_magnitude=6.0),
+    ]
+    quakes = [_eq(mag=5.0, date="minor"), _eq(mag=6.5, date="critical")]
+    assert _pairs(find_matches_bulk(quakes, prefs, now_hour=23)) == [(1, "critical")]
+    assert _pairs(find_matches_bulk(quakes, prefs, now_hour=12)) == [
+        (1, "minor"),
+        (1, "critical"),
+    ]
+
+
+def test_bulk_skips_unreadable_magnitude():
+    assert find_matches_bulk([{"mag": "n/a", "title": "X", "date": "d"}], [_pref(1)]) == []
+
+
+def test_bulk_accepts_prepacked_columns():
+    cols = PreferenceColumns([_pref(1), _pref(2, min_magnitude=6.0)])
+    assert [p.user_id for p, _ in find_matches_bulk([_eq(mag=5.0)], cols)] == [1]
+
+
+def test_bulk_equivalent_to_scalar_on_random_population(monkeypatch):
+    monkeypatch.setattr("app.core.eq_bulk_matching._MAX_CELLS_PER_CHUNK", 64)
+    rng = random.Random(20260529)
+
+    def maybe(value, p=0.5):
+        return value if rng.random() < p else None
+
+    prefs = []
+    for uid in range(300):
+        has_ref = rng.random() < 0.6
+        start = maybe(rng.randrange(24), 0.3)
+        prefs.append(
+            _pref(
+                uid,
+                enabled=rng.random() < 0.9,
+                min_magnitude=round(rng.uniform(2.0, 6.0), 1),
+                max_depth_km=maybe(rng.uniform(5, 50)),
+                reference_lat=rng.uniform(36, 42) if has_ref else None,
+                reference_lon=rng.uniform(26, 44) if has_ref else None,
+                radius_km=maybe(rng.uniform(10, 400), 0.7),
+                quiet_hours_start=start,
+                quiet_hours_end=rng.randrange(24) if start is not None else None,
+                critical_override_magnitude=maybe(rng.uniform(4.0, 7.0)),
+            )
+        )
+    quakes = [
+        _eq(
+            mag=maybe(round(rng.uniform(2.0, 7.5), 1), 0.95),
+            depth=maybe(rng.uniform(1, 60), 0.9),
+            lat=maybe(rng.uniform(36, 42), 0.9),
+            lon=rng.uniform(26, 44),
+            date=f"eq-{i}",
+        )
+        for i in range(40)
+    ]
+
+    expected = _pairs(find_matches(quakes, prefs))
+    assert _pairs(find_matches_bulk(quakes, prefs, now_hour=_now_hour())) == expected
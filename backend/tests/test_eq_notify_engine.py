@@ -1,9 +1,10 @@
 """GS-101 — eşleştirme motoru, sevkiyat, dedup ve dispatch endpoint testleri."""
 
+import asyncio
 import os
 from types import SimpleNamespace
 
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.pool import NullPool
 
@@ -149,6 +150,78 @@ async def test_dispatch_matched_but_no_subscription_records_nothing():
     assert len(rows) == 0
 
 
+async def test_overlapping_dispatches_send_each_pair_once():
+    await _add(_real_pref(1), _sub(1, "https://push/1"))
+    calls = []
+
+    async def slow_sender(sub, payload):
+        calls.append(sub.user_id)
+        await asyncio.sleep(0.05)
+        return True
+
+    async def run():
+        async with AsyncSessionLocal() as db:
+            return await eq_notify.dispatch_earthquake_notifications(
+                db, [_eq(mag=5.0)], sender=slow_sender
+            )
+
+    first, second = await asyncio.gather(run(), run())
+
+    assert calls == [1]
+    assert first["push_sent"] + second["push_sent"] == 1
+    assert first["skipped_already_sent"] + second["skipped_already_sent"] == 1
+
+
+async def test_dispatch_releases_reservation_when_every_send_fails():
+    await _add(_real_pref(1), _sub(1, "https://push/1"))
+
+    async def failing_sender(sub, payload):
+        return False
+
+    async with AsyncSessionLocal() as db:
+        summary = await eq_notify.dispatch_earthquake_notifications(
+            db, [_eq(mag=5.0)], sender=failing_sender
+        )
+    assert summary["push_failed"] == 1
+    assert summary["users_notified"] == 0
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(EarthquakeNotificationSent))).scalars().all()
+    assert rows == []
+
+
+async def test_dispatch_query_count_independent_of_match_count():
+    users = range(1, 41)
+    await _add(*[_real_pref(u) for u in users], *[_sub(u, f"https://push/{u}") for u in users])
+
+    statements = []
+
+    def _count(conn, cursor, statement, params, context, executemany):
+        statements.append(statement)
+
+    async def fake_sender(sub, payload):
+        return True
+
+    event.listen(_engine.sync_engine, "before_cursor_execute", _count)
+    try:
+        async with AsyncSessionLocal() as db:
+            summary = await eq_notify.dispatch_earthquake_notifications(
+                db, [_eq(mag=5.0)], sender=fake_sender
+            )
+    finally:
+        event.remove(_engine.sync_engine, "before_cursor_execute", _count)
+
+    assert summary["users_notified"] == 40
+    push_selects = [s for s in statements if "FROM push_subscriptions" in s]
+    sent_inserts = [s for s in statements if "INSERT INTO earthquake_notifications_sent" in s]
+    assert len(push_selects) == 1
+    assert len(sent_inserts) == 1
+
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(select(EarthquakeNotificationSent))).scalars().all()
+    assert len(rows) == 40
+
+
 # ── endpoint ──────────────────────────────────────────────────────────────────
 
 def test_dispatch_endpoint_returns_summary(client, monkeypatch):
@@ -170,10 +243,16 @@ def test_dispatch_endpoint_returns_summary(client, monkeypatch):
     monkeypatch.setattr("app.api.push._send_one", fake_send)
 
     res = client.post("/api/v1/earthquakes/dispatch-notifications")
-    assert res.status_code == 200
-    data = res.json()["data"]
-    assert data["push_sent"] == 1
-    assert data["users_notified"] == 1
+    assert res.status_code == 202
+    job = res.json()["data"]
+    assert job["kind"] == "earthquake_dispatch"
+    assert job["status"] == "succeeded"
+    assert job["result"]["push_sent"] == 1
+    assert job["result"]["users_notified"] == 1
+
+    status = client.get(f"/api/v1/jobs/{job['job_id']}").json()["data"]
+    assert status["status"] == "succeeded"
+    assert status["progress"] == {"done": 1, "total": 1}
 
 
 def test_dispatch_endpoint_503_when_vapid_unconfigured(client, monkeypatch):
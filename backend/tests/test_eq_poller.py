@@ -0,0 +1,129 @@
+"""Deprem feed yoklayıcısı — yüksek su işareti farkı ve koşullu istek testleri."""
+
+import os
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import jobs
+from app.core.eq_poller import EarthquakePoller
+
+_engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+AsyncSessionLocal = async_sessionmaker(_engine, expire_on_commit=False)
+
+
+def _eq(date, mag=4.0, lat=41.0, lon=29.0):
+    return {"mag": mag, "title": "T", "date": date, "depth": 7.0, "lat": lat, "lon": lon}
+
+
+def _raw(date, mag=4.0):
+    return {
+        "mag": mag,
+        "title": "T",
+        "date_time": date,
+        "depth": 7.0,
+        "geojson": {"coordinates": [29.0, 41.0]},
+    }
+
+
+# ── diff ──────────────────────────────────────────────────────────────────────
+
+def test_first_diff_returns_everything_and_sets_high_water():
+    poller = EarthquakePoller()
+    quakes = [_eq("2026-05-29 10:05:00"), _eq("2026-05-29 10:00:00")]
+    assert poller.diff(quakes) == quakes
+    assert poller.high_water.startswith("2026-05-29 10:05:00")
+
+
+def test_diff_returns_only_new_quakes():
+    poller = EarthquakePoller()
+    old = [_eq("2026-05-29 10:00:00")]
+    poller.diff(old)
+    new = _eq("2026-05-29 10:07:00", mag=5.1)
+    assert poller.diff([new, *old]) == [new]
+    assert poller.diff([new, *old]) == []
+
+
+def test_diff_accepts_late_arrivals_within_window_only():
+    poller = EarthquakePoller()
+    poller.diff([_eq("2026-05-29 12:00:00")])
+    late = _eq("2026-05-29 11:50:00", mag=3.9)
+    too_old = _eq("2026-05-29 09:00:00", mag=3.9)
+    assert poller.diff([late, too_old]) == [late]
+
+
+# ── koşullu istek ─────────────────────────────────────────────────────────────
+
+async def test_fetch_feed_uses_conditional_requests():
+    now = datetime.now().replace(microsecond=0)
+    first = (now - timedelta(minutes=10)).strftime("%Y-%m-%d %H:%M:%S")
+    second = (now - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S")
+    pages = {"body": [_raw(first)], "etag": '"v1"'}
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == pages["etag"]:
+            return httpx.Response(304)
+        today = datetime.now().strftime("%Y-%m-%d")
+        body = pages["body"] if f"date={today}" in str(request.url) else []
+        return httpx.Response(200, json={"result": body}, headers={"ETag": pages["etag"]})
+
+    poller = EarthquakePoller(transport=httpx.MockTransport(handler))
+
+    assert [q["date"] for q in await poller.fetch_feed()] == [first]
+    assert seen_headers == [None, None]
+
+    # Değişiklik yok → 304, önbellekteki gövde döner
+    assert [q["date"] for q in await poller.fetch_feed()] == [first]
+    assert seen_headers[-2:] == ['"v1"', '"v1"']
+
+    pages["body"] = [_raw(second), _raw(first)]
+    pages["etag"] = '"v2"'
+    assert [q["date"] for q in await poller.fetch_feed()] == [second, first]
+
+
+# ── tick (DB, paylaşılan durum) ───────────────────────────────────────────────
+
+async def test_tick_state_is_shared_between_workers():
+    from app.models.earthquake_poller_state import EarthquakePollerState
+
+    now = datetime.now().replace(microsecond=0)
+    old = (now - timedelta(minutes=10)).strftime("%Y-%m-%d %H:%M:%S")
+    new = (now - timedelta(minutes=1)).strftime("%Y-%m-%d %H:%M:%S")
+    feed = {"body": [_raw(old)]}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        today = datetime.now().strftime("%Y-%m-%d")
+        body = feed["body"] if f"date={today}" in str(request.url) else []
+        return httpx.Response(200, json={"result": body})
+
+    # İki ayrı worker: bellekte hiçbir şey paylaşmazlar
+    worker_a = EarthquakePoller(transport=httpx.MockTransport(handler))
+    worker_b = EarthquakePoller(transport=httpx.MockTransport(handler))
+
+    async def fake_enqueue(db, kind, payload):
+        await db.commit()  # gerçek enqueue gibi durumla birlikte commit eder
+
+    enqueue = AsyncMock(side_effect=fake_enqueue)
+
+    with patch("app.api.push._vapid_configured", return_value=True), patch.object(
+        jobs, "_session_factory", AsyncSessionLocal
+    ), patch.object(jobs, "enqueue", new=enqueue):
+        # İlk tur yalnızca işareti kaydeder, sevkiyat yok
+        assert await worker_a.tick() == 0
+        # Başka worker aynı feed'i görür: işaret DB'den gelir, yeni deprem yok
+        assert await worker_b.tick() == 0
+
+        feed["body"] = [_raw(new), _raw(old)]
+        assert await worker_b.tick() == 1
+        assert await worker_a.tick() == 0
+
+    enqueue.assert_awaited_once()
+    assert [q["date"] for q in enqueue.await_args.args[2]["earthquakes"]] == [new]
+    async with AsyncSessionLocal() as db:
+        state = await db.get(EarthquakePollerState, 1)
+    assert state.high_water.startswith(new)
@@ -5,16 +5,20 @@ Covers the pure matching predicate, subscription CRUD, dispatch (admin),
 and best-effort auto-dispatch when an emergency report is created.
 """
 
+from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import AsyncMock, patch
 
 from app.core.geofence import subscription_matches_incident
+from app.core.geofence_index import GeofenceGridIndex
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Pure matching predicate
 # ─────────────────────────────────────────────────────────────────────────────
 
 class _Sub:
-    def __init__(self, enabled=True, lat=41.0, lon=29.0, radius=5.0):
+    def __init__(self, enabled=True, lat=41.0, lon=29.0, radius=5.0, id=1):
+        self.id = id
         self.enabled = enabled
         self.center_lat = lat
         self.center_lon = lon
@@ -48,6 +52,93 @@ def test_no_match_when_zero_radius():
     assert subscription_matches_incident(sub, 41.0, 29.0) is False
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Grid index
+# ─────────────────────────────────────────────────────────────────────────────
+
+def test_index_returns_only_containing_circles():
+    idx = GeofenceGridIndex(cell_deg=0.25)
+    idx.upsert(_Sub(id=1, lat=41.0082, lon=28.9784, radius=5.0))
+    idx.upsert(_Sub(id=2, lat=39.9, lon=32.8, radius=5.0))  # Ankara
+    assert idx.candidates(41.0150, 28.9784) == [1]
+    assert idx.candidates(41.27, 28.97) == []
+
+
+def test_index_matches_predicate_across_cell_borders():
+    idx = GeofenceGridIndex(cell_deg=0.1)
+    subs = [
+        _Sub(id=i, lat=40.0 + i * 0.037, lon=29.0 - i * 0.041, radius=3.0 + i % 7)
+        for i in range(1, 60)
+    ]
+    for sub in subs:
+        idx.upsert(sub)
+    for lat, lon in [(40.5, 28.5), (41.05, 27.0), (40.0, 29.0), (41.9, 26.6)]:
+        expected = [s.id for s in subs if subscription_matches_incident(s, lat, lon)]
+        assert idx.candidates(lat, lon) == expected
+
+
+def test_index_wraps_antimeridian_and_handles_wide_circles():
+    idx = GeofenceGridIndex(cell_deg=0.25)
+    idx.upsert(_Sub(id=1, lat=0.0, lon=179.99, radius=20.0))
+    idx.upsert(_Sub(id=2, lat=41.0, lon=29.0, radius=500.0))
+    assert idx.candidates(0.0, -179.95) == [1]
+    assert idx.candidates(39.9, 32.8) == [2]
+
+
+def test_index_upsert_moves_and_disable_removes():
+    idx = GeofenceGridIndex()
+    idx.upsert(_Sub(id=1, lat=41.0, lon=29.0, radius=5.0))
+    idx.upsert(_Sub(id=1, lat=39.9, lon=32.8, radius=5.0))
+    assert idx.candidates(41.0, 29.0) == []
+    assert idx.candidates(39.9, 32.8) == [1]
+
+    idx.upsert(_Sub(id=1, enabled=False, lat=39.9, lon=32.8))
+    assert idx.candidates(39.9, 32.8) == []
+    assert len(idx) == 0
+
+
+class _RowsDB:
+    """refresh() için sahte oturum: her execute sıradaki satır listesini döndürür."""
+
+    def __init__(self, *batches):
+        self.batches = list(batches)
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        rows = self.batches.pop(0)
+        return SimpleNamespace(all=lambda: rows)
+
+
+def _row(id, lat, lon, updated_at, enabled=True, radius=5.0):
+    return SimpleNamespace(
+        id=id, enabled=enabled, center_lat=lat, center_lon=lon, radius_km=radius, updated_at=updated_at
+    )
+
+
+async def test_index_refresh_picks_up_writes_from_other_workers():
+    t0 = datetime(2026, 10, 17, 12, 0, 0)
+    idx = GeofenceGridIndex()
+    db = _RowsDB(
+        [_row(1, 41.0, 29.0, t0)],
+        [_row(1, 39.9, 32.8, t0 + timedelta(seconds=5)), _row(2, 38.4, 27.1, t0 + timedelta(seconds=7))],
+        [_row(2, 38.4, 27.1, t0 + timedelta(seconds=9), enabled=False)],
+    )
+
+    await idx.refresh(db)  # işaret yok → tüm satırlar
+    assert idx.candidates(41.0, 29.0) == [1]
+
+    await idx.refresh(db)
+    assert idx.candidates(41.0, 29.0) == []
+    assert idx.candidates(39.9, 32.8) == [1]
+    assert idx.candidates(38.4, 27.1) == [2]
+
+    await idx.refresh(db)
+    assert idx.candidates(38.4, 27.1) == []
+    # Sonraki tazelemeler işaretin (− örtüşme payı) gerisini okumaz
+    assert "updated_at >=" in str(db.statements[-1])
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Subscription CRUD
 # ─────────────────────────────────────────────────────────────────────────────
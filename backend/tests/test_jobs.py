@@ -0,0 +1,131 @@
+"""Arka plan bildirim iş kuyruğu — enqueue, durum endpoint'i ve yeniden deneme testleri."""
+
+import os
+from unittest.mock import AsyncMock, patch
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import jobs
+
+_engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+AsyncSessionLocal = async_sessionmaker(_engine, expire_on_commit=False)
+
+
+def test_push_send_returns_job(client):
+    client.post(
+        "/api/v1/push/subscribe",
+        json={"endpoint": "https://push.example/job-1", "keys": {"auth": "a", "p256dh": "b"}},
+    )
+    sender = AsyncMock(return_value=True)
+    with patch("app.api.push._vapid_configured", return_value=True), patch(
+        "app.api.push._send_one", new=sender
+    ):
+        res = client.post("/api/v1/push/send", json={"title": "Tatbikat", "body": "Test"})
+
+    assert res.status_code == 202
+    job = res.json()["data"]
+    assert job["kind"] == "push_broadcast"
+    assert job["status"] == "succeeded"
+    assert job["attempts"] == 1
+    assert job["result"] == {"sent": 1, "failed": 0, "removed_stale": 0}
+    sender.assert_awaited_once()
+
+
+def test_job_status_endpoint(client):
+    with patch("app.api.push._vapid_configured", return_value=True):
+        job_id = client.post(
+            "/api/v1/push/send", json={"title": "T", "body": "B"}
+        ).json()["data"]["job_id"]
+
+    res = client.get(f"/api/v1/jobs/{job_id}")
+    assert res.status_code == 200
+    data = res.json()["data"]
+    assert data["job_id"] == job_id
+    assert data["status"] == "succeeded"
+    assert data["result"] == {"sent": 0, "failed": 0, "removed_stale": 0}
+
+
+def test_job_status_404(client):
+    assert client.get("/api/v1/jobs/999999").status_code == 404
+
+
+async def test_failed_job_is_requeued_then_marked_failed():
+    calls = []
+
+    @jobs.handler("test_always_fails")
+    async def _boom(db, payload, ctx):
+        calls.append(payload)
+        raise RuntimeError("upstream down")
+
+    try:
+        async with AsyncSessionLocal() as db:
+            retrying = await jobs.enqueue(db, "test_always_fails", {"n": 1}, max_attempts=2)
+            terminal = await jobs.enqueue(db, "test_always_fails", {"n": 2}, max_attempts=1)
+    finally:
+        jobs._handlers.pop("test_always_fails", None)
+
+    assert len(calls) == 2
+    assert retrying.status == "queued"
+    assert retrying.attempts == 1
+    assert "upstream down" in retrying.error
+    assert terminal.status == "failed"
+    assert terminal.finished_at is not None
+
+
+async def test_enqueue_rejects_unknown_kind():
+    async with AsyncSessionLocal() as db:
+        try:
+            await jobs.enqueue(db, "no_such_job")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("bilinmeyen iş türü reddedilmeliydi")
+
+
+async def _stale_running_job(attempts: int, max_attempts: int) -> int:
+    from datetime import datetime, timedelta
+
+    from app.models.dispatch_job import DispatchJob
+
+    async with AsyncSessionLocal() as db:
+        job = DispatchJob(
+            kind="push_broadcast",
+            status="running",
+            payload={"title": "T", "body": "B"},
+            attempts=attempts,
+            max_attempts=max_attempts,
+            updated_at=datetime.utcnow() - timedelta(seconds=jobs.STALE_SECONDS + 3600),
+        )
+        db.add(job)
+        await db.commit()
+        return job.id
+
+
+async def test_stale_job_without_attempts_left_is_failed_not_reclaimed():
+    job_id = await _stale_running_job(attempts=3, max_attempts=3)
+    broadcast = AsyncMock(return_value={"sent": 0})
+    with patch.object(jobs, "_session_factory", AsyncSessionLocal), patch.dict(
+        jobs._handlers, {"push_broadcast": broadcast}
+    ):
+        assert await jobs.run_next() is False
+    broadcast.assert_not_awaited()
+
+    async with AsyncSessionLocal() as db:
+        job = await jobs.get_job(db, job_id)
+    assert job.status == "failed"
+    assert job.attempts == 3
+    assert "Worker lost" in job.error
+
+
+async def test_stale_job_with_attempts_left_is_reclaimed():
+    job_id = await _stale_running_job(attempts=1, max_attempts=3)
+    with patch.object(jobs, "_session_factory", AsyncSessionLocal), patch.dict(
+        jobs._handlers, {"push_broadcast": AsyncMock(return_value={"sent": 0})}
+    ):
+        assert await jobs.run_next() is True
+
+    async with AsyncSessionLocal() as db:
+        job = await jobs.get_job(db, job_id)
+    assert job.status == "succeeded"
+    assert job.attempts == 2
@@ -53,3 +53,159 @@ def test_kpi_zero_state(client):
     assert data["emergencies"]["total"] >= 0
     assert data["tasks"]["total"] >= 0
     assert data["critical_stock_count"] >= 0
+
+
+def test_kpi_summary_is_a_single_statement(client):
+    from app.db.instrumentation import query_budget
+
+    with query_budget(1):
+        res = client.get("/api/v1/kpi/summary")
+    assert res.status_code == 200
+
+
+def test_kpi_summary_snapshot_serves_polls_without_db(client, data_factory, monkeypatch):
+    from app.api import kpi
+    from app.db.instrumentation import query_budget
+
+    monkeypatch.setattr(kpi, "SUMMARY_TTL_SECONDS", 10)
+    first = client.get("/api/v1/kpi/summary").json()["data"]
+
+    data_factory["create_warehouse"](name="KPI Snapshot Depot", lon=29.0, lat=41.0)
+    with query_budget(0):
+        for _ in range(5):
+            polled = client.get("/api/v1/kpi/summary").json()["data"]
+    # Snapshot TTL dolana kadar aynı değer döner
+    assert polled == first
+
+
+# ── Zaman serisi (kpi_rollups) ────────────────────────────────────────────────
+
+def _seed_reports(rows):
+    """rows: (kaç dakika önce, status, kategori)"""
+    import os
+
+    from sqlalchemy import create_engine, text
+    from sqlalchemy.pool import NullPool
+
+    engine = create_engine(
+        os.environ["DATABASE_URL"].replace("postgresql+asyncpg://", "postgresql://", 1), poolclass=NullPool
+    )
+    with engine.begin() as conn:
+        for minutes_ago, status, kategori in rows:
+            conn.execute(
+                text(
+                    "INSERT INTO emergency_reports (durum, saat, enlem, boylam, status, kategori, created_at) "
+                    "VALUES ('Tohum', '10:00', 41.0, 29.0, :status, :kategori, "
+                    "localtimestamp - make_interval(mins => :m))"
+                ),
+                {"status": status, "kategori": kategori, "m": minutes_ago},
+            )
+    engine.dispose()
+
+
+def _roll_up(**kwargs):
+    import asyncio
+    import os
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from sqlalchemy.pool import NullPool
+
+    from app.core.kpi_rollup import roll_up
+
+    async def run():
+        engine = create_async_engine(os.environ["DATABASE_URL"], poolclass=NullPool)
+        async with async_sessionmaker(engine)() as db:
+            result = await roll_up(db, **kwargs)
+            await db.commit()
+        await engine.dispose()
+        return result
+
+    return asyncio.run(run())
+
+
+def _series(client, **params):
+    res = client.get("/api/v1/kpi/timeseries", params=params)
+    assert res.status_code == 200, res.text
+    data = res.json()["data"]
+    return data, {s["dimension"]: s for s in data["series"]}
+
+
+def test_kpi_timeseries_before_first_rollup_is_empty(client):
+    data, series = _series(client, metric="emergency_status")
+    assert data["as_of"] is None
+    assert series == {}
+
+
+def test_kpi_timeseries_buckets_reports_by_status_and_category(client):
+    _seed_reports([(5, "new", "enkaz"), (6, "new", "enkaz"), (130, "resolved", None)])
+    _roll_up()
+
+    data, series = _series(client, metric="emergency_status", bucket="hour", days=1)
+    assert len(data["buckets"]) == 24
+    assert series["new"]["total"] == 2
+    assert series["resolved"]["total"] == 1
+    # Son kova "şimdi"nin saati; 130 dakika önceki rapor iki ya da üç kova geride
+    assert series["new"]["counts"][-1] + series["new"]["counts"][-2] == 2
+    assert sum(series["resolved"]["counts"][-4:-2]) == 1
+
+    _, daily = _series(client, metric="emergency_category", bucket="day", days=7)
+    assert daily["enkaz"]["total"] == 2
+    assert daily[""]["total"] == 1
+
+
+def test_kpi_rollup_is_incremental_and_idempotent(client):
+    _seed_reports([(3, "new", None)])
+    _roll_up()
+    _roll_up()
+    _, series = _series(client, metric="emergency_status", bucket="minute", days=1)
+    assert series["new"]["total"] == 1
+
+    _seed_reports([(1, "new", None)])
+    _roll_up()
+    _, series = _series(client, metric="emergency_status", bucket="day", days=30)
+    assert series["new"]["total"] == 2
+
+
+def test_kpi_timeseries_reads_only_rollups(client):
+    from app.db.instrumentation import query_budget
+
+    _seed_reports([(5, "new", None)])
+    _roll_up()
+    with query_budget(2) as stats:
+        res = client.get("/api/v1/kpi/timeseries", params={"metric": "emergency_status", "days": 30})
+    assert res.status_code == 200
+    assert all("kpi_rollup" in s and "emergency_reports" not in s for s in stats.statements)
+
+
+def test_kpi_timeseries_validates_metric_and_range(client):
+    assert client.get("/api/v1/kpi/timeseries", params={"metric": "nope"}).status_code == 422
+    res = client.get("/api/v1/kpi/timeseries", params={"metric": "checkins", "bucket": "minute", "days": 30})
+    assert res.status_code == 400
+
+
+def test_kpi_rollup_rebuild_job(client):
+    _seed_reports([(60 * 24 * 45, "resolved", None)])  # backfill penceresinden eski
+    _roll_up()
+    _, series = _series(client, metric="emergency_status", bucket="day", days=60)
+    assert "resolved" not in series
+
+    res = client.post("/api/v1/kpi/rollups/rebuild", json={"since": "2000-01-01T00:00:00"})
+    assert res.status_code == 202
+    job = res.json()["data"]
+    assert job["kind"] == "kpi_rollup_rebuild"
+    assert job["status"] == "succeeded"
+
+    _, series = _series(client, metric="emergency_status", bucket="day", days=60)
+    assert series["resolved"]["total"] == 1
+
+
+def test_task_completions_predicate_matches_partial_index():
+    # 'done' literal kalmalı; bind parametresi generic planda 034'teki kısmi indeksi devre dışı bırakır
+    from sqlalchemy.dialects import postgresql
+
+    from app.core.kpi_rollup import SOURCES
+
+    (where,) = SOURCES["task_completions"].where
+    compiled = where.compile(dialect=postgresql.dialect())
+    assert str(compiled) == "volunteer_tasks.status = 'done'"
+    assert not compiled.params
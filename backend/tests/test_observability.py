@@ -52,6 +52,18 @@ def test_collector_sums_duration():
     assert match and abs(float(match.group(1)) - 0.04) < 1e-9
 
 
+def test_collector_cache_tier_counters():
+    c = MetricsCollector()
+    c.record_cache_tier("local", hit=True)
+    c.record_cache_tier("local", hit=False)
+    c.record_cache_tier("redis", hit=True)
+
+    text = c.prometheus_text()
+    assert 'cache_tier_hits_total{tier="local"} 1' in text
+    assert 'cache_tier_misses_total{tier="local"} 1' in text
+    assert 'cache_tier_hits_total{tier="redis"} 1' in text
+
+
 def test_collector_prometheus_text_has_required_headers():
     c = MetricsCollector()
     c.record("GET", "/health", 200, 0.001)
@@ -142,3 +154,16 @@ def test_health_returns_200_without_db(client):
             app.dependency_overrides.pop(get_db, None)
         else:
             app.dependency_overrides[get_db] = original
+
+
+def test_collector_sse_counters_and_gauges():
+    c = MetricsCollector()
+    c.record_sse_drop("chat_message", "drop_oldest")
+    c.record_sse_eviction("announcement")
+    c.register_gauge("sse_connected_clients", "Connected SSE clients", lambda: 3)
+
+    text = c.prometheus_text()
+    assert 'sse_events_dropped_total{type="chat_message",policy="drop_oldest"} 1' in text
+    assert 'sse_clients_evicted_total{type="announcement"} 1' in text
+    assert "# TYPE sse_connected_clients gauge" in text
+    assert "sse_connected_clients 3" in text
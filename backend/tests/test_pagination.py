@@ -0,0 +1,117 @@
+"""Keyset (cursor) sayfalama — cursor kodlama, WHERE/ORDER BY üretimi ve X-Next-Cursor testleri."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException, Response
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    PageParams,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+)
+from app.models.emergency_report import EmergencyReport
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self._rows
+
+
+class _FakeDB:
+    def __init__(self, rows):
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return _FakeResult(self.rows[: stmt._limit_clause.value])
+
+
+def _sql(stmt) -> str:
+    return str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def _rows(n):
+    return [
+        SimpleNamespace(id=100 - i, created_at=datetime(2026, 5, 6, 10, 0, 59 - i))
+        for i in range(n)
+    ]
+
+
+def test_cursor_round_trip_is_opaque():
+    ts = datetime(2026, 5, 6, 10, 0, 0, 123456)
+    cursor = encode_cursor(ts, 42)
+    assert "|" not in cursor and "=" not in cursor
+    assert decode_cursor(cursor) == (ts, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", "Zm9v", encode_cursor(datetime(2026, 1, 1), 1)[:-3]])
+def test_invalid_cursor_is_400(cursor):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+async def test_first_page_sets_next_cursor_from_last_row():
+    db = _FakeDB(_rows(5))
+    response = Response()
+    page = await keyset_page(
+        db, select(EmergencyReport), PageParams(cursor=None, limit=3), response,
+        created_col=EmergencyReport.created_at, id_col=EmergencyReport.id,
+    )
+
+    assert [r.id for r in page] == [100, 99, 98]
+    assert decode_cursor(response.headers[NEXT_CURSOR_HEADER]) == (page[-1].created_at, 98)
+    sql = _sql(db.statements[0])
+    assert "ORDER BY emergency_reports.created_at DESC, emergency_reports.id DESC" in sql
+    assert "LIMIT 4" in sql
+    assert "OFFSET" not in sql
+
+
+async def test_next_page_filters_by_tuple_and_last_page_has_no_cursor():
+    cursor = encode_cursor(datetime(2026, 5, 6, 10, 0, 57), 98)
+    db = _FakeDB(_rows(2))
+    response = Response()
+    page = await keyset_page(
+        db, select(EmergencyReport), PageParams(cursor=cursor, limit=3), response,
+        created_col=EmergencyReport.created_at, id_col=EmergencyReport.id,
+    )
+
+    assert len(page) == 2
+    assert NEXT_CURSOR_HEADER not in response.headers
+    assert "(emergency_reports.created_at, emergency_reports.id) < ('2026-05-06 10:00:57', 98)" in _sql(
+        db.statements[0]
+    )
+
+
+def test_paginated_timestamp_columns_are_not_null():
+    from app.models.announcement import Announcement
+    from app.models.audit_log import AuditLog
+    from app.models.inventory_movement import InventoryMovement
+    from app.models.shelter_offer import ShelterOffer
+    from app.models.volunteer_application import VolunteerApplication
+    from app.models.volunteer_task import VolunteerTask
+
+    # NULL, DESC sıralamada başa gelir ve tuple karşılaştırmasını hiç sağlamaz
+    for column in (
+        Announcement.created_at,
+        AuditLog.created_at,
+        EmergencyReport.created_at,
+        InventoryMovement.timestamp,
+        ShelterOffer.created_at,
+        VolunteerApplication.created_at,
+        VolunteerTask.created_at,
+    ):
+        assert column.nullable is False, column
@@ -0,0 +1,122 @@
+"""Web Push teslim motoru — sınırlı eşzamanlı fan-out ve thread havuzu testleri."""
+
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from app.core import push_delivery
+
+
+def _sub(endpoint="https://fcm.googleapis.com/fcm/send/abc"):
+    return SimpleNamespace(endpoint=endpoint, keys={"auth": "a", "p256dh": "b"})
+
+
+async def test_fan_out_preserves_order_and_results():
+    async def sender(sub, payload):
+        await asyncio.sleep(0)
+        return payload["n"] % 3 != 0
+
+    jobs = [(_sub(), {"n": n}) for n in range(20)]
+    results = await push_delivery.fan_out(jobs, sender, concurrency=4)
+    assert results == [n % 3 != 0 for n in range(20)]
+
+
+async def test_fan_out_respects_concurrency_limit():
+    in_flight = 0
+    peak = 0
+
+    async def sender(sub, payload):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return True
+
+    results = await push_delivery.fan_out([(_sub(), {})] * 50, sender, concurrency=5)
+    assert all(results)
+    assert peak == 5
+
+
+async def test_fan_out_empty_jobs():
+    async def sender(sub, payload):
+        raise AssertionError("çağrılmamalı")
+
+    assert await push_delivery.fan_out([], sender) == []
+
+
+async def test_fan_out_reports_progress():
+    seen = []
+
+    async def sender(sub, payload):
+        return True
+
+    await push_delivery.fan_out(
+        [(_sub(), {})] * 5, sender, concurrency=2, on_progress=lambda d, t: seen.append((d, t))
+    )
+    assert seen == [(n, 5) for n in range(1, 6)]
+
+
+async def test_send_runs_off_the_event_loop_thread(monkeypatch):
+    loop_thread = threading.get_ident()
+    seen = {}
+
+    def fake_blocking(endpoint, keys, data):
+        seen["thread"] = threading.get_ident()
+        seen["endpoint"] = endpoint
+
+    monkeypatch.setattr(push_delivery, "_send_blocking", fake_blocking)
+    assert await push_delivery.send(_sub(), {"title": "x"}) is True
+    assert seen["thread"] != loop_thread
+    assert seen["endpoint"].startswith("https://fcm.googleapis.com")
+
+
+async def test_send_returns_false_on_failure(monkeypatch):
+    def failing(endpoint, keys, data):
+        raise RuntimeError("410 Gone")
+
+    monkeypatch.setattr(push_delivery, "_send_blocking", failing)
+    assert await push_delivery.send(_sub(), {}) is False
+
+
+def test_session_is_shared_per_origin():
+    a = push_delivery._session_for("https://fcm.googleapis.com/fcm/send/1")
+    b = push_delivery._session_for("https://fcm.googleapis.com/fcm/send/2")
+    c = push_delivery._session_for("https://updates.push.services.mozilla.com/wpush/v2/x")
+    assert a is b
+    assert a is not c
+    push_delivery.shutdown()
+
+
+class _FakeResult:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def scalars(self):
+        return iter(self._rows)
+
+
+class _FakeDB:
+    """`execute` çağrılarını sayan, IN listesindeki kullanıcıların aboneliklerini dönen sahte oturum."""
+
+    def __init__(self, subs):
+        self.subs = subs
+        self.chunks = []
+
+    async def execute(self, stmt):
+        ids = stmt.whereclause.right.value
+        self.chunks.append(list(ids))
+        return _FakeResult([s for s in self.subs if s.user_id in ids])
+
+
+async def test_subscriptions_by_user_groups_in_chunks():
+    subs = [
+        SimpleNamespace(id=i, user_id=i % 7, endpoint=f"https://push/{i}", keys={})
+        for i in range(1, 30)
+    ]
+    db = _FakeDB(subs)
+    grouped = await push_delivery.subscriptions_by_user(db, [1, 2, 3, 3, 4, 5, 99], chunk_size=2)
+
+    assert db.chunks == [[1, 2], [3, 4], [5, 99]]
+    assert sorted(grouped) == [1, 2, 3, 4, 5]
+    assert [s.id for s in grouped[3]] == [3, 10, 17, 24]
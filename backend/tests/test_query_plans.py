@@ -0,0 +1,170 @@
+"""
+Sıcak sorgu planı regresyon testleri (migration 033 indeksleri).
+
+Büyük tablolar sunucu tarafında generate_series ile doldurulur, VACUUM ANALYZE edilir ve
+uygulamanın ürettiği sorgu şekilleri EXPLAIN (FORMAT JSON) ile planlanır. Tohumlanan
+tablolardan herhangi birinde Seq Scan görülürse test başarısız olur — bir indeksin
+silinmesi ya da sorgunun indeksi kullanamayacak biçimde değişmesi burada yakalanır.
+"""
+
+import os
+from datetime import datetime, timedelta
+
+import pytest
+from geoalchemy2 import Geography, Geometry
+from sqlalchemy import cast, create_engine, func, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.pool import NullPool
+
+from app.models.audit_log import AuditLog
+from app.models.emergency_report import EmergencyReport
+from app.models.inventory_movement import InventoryMovement
+from app.models.missing_person import MissingPerson
+from app.models.safe_checkin import SafeCheckin
+from app.models.volunteer_task import VolunteerTask
+from app.models.warehouse import Warehouse
+from app.models.zone_need import ZoneNeed
+
+_engine = create_engine(
+    os.environ["DATABASE_URL"].replace("postgresql+asyncpg://", "postgresql://", 1),
+    poolclass=NullPool,
+)
+
+ROWS = 50_000
+
+# Statüler gerçekçi biçimde çarpık: çoğu kayıt kapanmış, açık olanlar azınlık
+_SEED = [
+    f"""INSERT INTO emergency_reports (durum, saat, enlem, boylam, status, created_at)
+        SELECT 'Tohum', '10:00', 36 + random() * 6, 26 + random() * 18,
+               (ARRAY['resolved','resolved','resolved','resolved','dismissed','spam','new','reviewing'])[1 + g % 8],
+               now() - (g % 365) * interval '1 day' - (g % 1440) * interval '1 minute'
+        FROM generate_series(1, {ROWS}) g""",
+    f"""INSERT INTO safe_checkins (lat, lon, source, created_at)
+        SELECT 36 + random() * 6, 26 + random() * 18, 'online', now() - (g % 365) * interval '1 day'
+        FROM generate_series(1, {ROWS}) g""",
+    "INSERT INTO items (id, sku, name) VALUES (1, 'TOHUM-1', 'Battaniye')",
+    f"""INSERT INTO inventory_movements (item_id, quantity, movement_type, "timestamp")
+        SELECT 1, 1, 'in', now() - g * interval '1 minute' FROM generate_series(1, {ROWS}) g""",
+    f"""INSERT INTO audit_logs (action, resource_type, created_at)
+        SELECT 'update', (ARRAY['warehouse','inventory','transfer','zone_need','task'])[1 + g % 5],
+               now() - g * interval '1 minute'
+        FROM generate_series(1, {ROWS}) g""",
+    f"""INSERT INTO volunteer_tasks (title, urgency, status, created_by_id, created_at)
+        SELECT 'Görev', 'medium', CASE WHEN g % 50 = 0 THEN 'open' ELSE 'done' END, 1,
+               now() - g * interval '1 minute'
+        FROM generate_series(1, {ROWS}) g""",
+    f"""INSERT INTO zone_needs (safe_zone_id, quantity_needed, priority, status, created_at)
+        SELECT g % 500, 10, 'normal', CASE WHEN g % 50 = 0 THEN 'open' ELSE 'fulfilled' END,
+               now() - g * interval '1 minute'
+        FROM generate_series(1, {ROWS}) g""",
+    f"""INSERT INTO missing_persons (name, last_seen_district, status, created_at)
+        SELECT 'Kişi', 'Merkez', CASE WHEN g % 50 = 0 THEN 'active' ELSE 'found' END,
+               now() - g * interval '1 minute'
+        FROM generate_series(1, {ROWS}) g""",
+    f"""INSERT INTO warehouses (name, location, status)
+        SELECT 'Depo ' || g, ST_SetSRID(ST_MakePoint(26 + random() * 18, 36 + random() * 6), 4326), 'active'
+        FROM generate_series(1, {ROWS}) g""",
+]
+_TABLES = [
+    "emergency_reports", "safe_checkins", "inventory_movements", "audit_logs",
+    "volunteer_tasks", "zone_needs", "missing_persons", "warehouses",
+]
+
+
+@pytest.fixture
+def seeded():
+    with _engine.begin() as conn:
+        for stmt in _SEED:
+            conn.execute(text(stmt))
+    # VACUUM görünürlük haritasını da doldurur; index-only scan planlanabilsin
+    with _engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in _TABLES:
+            conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+
+def _seq_scans(stmt) -> list[str]:
+    sql = str(stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+    with _engine.connect() as conn:
+        plan = conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar_one()
+
+    found = []
+
+    def walk(node: dict) -> None:
+        if node.get("Node Type") == "Seq Scan" and node.get("Relation Name") in _TABLES:
+            found.append(node["Relation Name"])
+        for child in node.get("Plans", []):
+            walk(child)
+
+    walk(plan[0]["Plan"])
+    return found
+
+
+def _keyset(stmt, created_col, id_col, limit=101, cursor=None):
+    if cursor is not None:
+        stmt = stmt.where(tuple_(created_col, id_col) < tuple_(*cursor))
+    return stmt.order_by(created_col.desc(), id_col.desc()).limit(limit)
+
+
+_DEEP = (datetime.utcnow() - timedelta(days=200), 10)
+_SINCE = datetime.utcnow() - timedelta(days=30)
+_USER_GEOG = cast(
+    func.ST_SetSRID(func.ST_MakePoint(29.01, 41.01), 4326), Geography(geometry_type="POINT", srid=4326)
+)
+
+
+def _geog(col):
+    """spatial.py'deki CAST zinciri — migration 033'teki ifade indeksiyle birebir aynı."""
+    return cast(cast(col, Geometry(geometry_type="POINT", srid=4326)), Geography(geometry_type="POINT", srid=4326))
+
+
+HOT_QUERIES = {
+    "emergency_admin_first_page": lambda: _keyset(
+        select(EmergencyReport), EmergencyReport.created_at, EmergencyReport.id
+    ),
+    "emergency_admin_deep_page_by_status": lambda: _keyset(
+        select(EmergencyReport).where(EmergencyReport.status == "new"),
+        EmergencyReport.created_at, EmergencyReport.id, cursor=_DEEP,
+    ),
+    "emergency_heatmap": lambda: select(
+        EmergencyReport.enlem, EmergencyReport.boylam, EmergencyReport.status
+    ).where(EmergencyReport.created_at >= _SINCE).where(
+        EmergencyReport.status.notin_(["spam", "dismissed"])
+    ),
+    "checkin_heatmap": lambda: select(SafeCheckin.lat, SafeCheckin.lon)
+    .where(SafeCheckin.created_at >= _SINCE)
+    .where(SafeCheckin.lat.isnot(None))
+    .where(SafeCheckin.lon.isnot(None)),
+    "inventory_movements_page": lambda: _keyset(
+        select(InventoryMovement), InventoryMovement.timestamp, InventoryMovement.id, cursor=_DEEP
+    ),
+    "audit_log_by_resource_type": lambda: _keyset(
+        select(AuditLog).where(AuditLog.resource_type == "transfer"),
+        AuditLog.created_at, AuditLog.id, cursor=_DEEP,
+    ),
+    "volunteer_tasks_by_status": lambda: _keyset(
+        select(VolunteerTask).where(VolunteerTask.status == "open"),
+        VolunteerTask.created_at, VolunteerTask.id,
+    ),
+    "kpi_open_task_count": lambda: select(func.count(VolunteerTask.id)).where(
+        VolunteerTask.status == "open"
+    ),
+    "zone_needs_open": lambda: select(ZoneNeed)
+    .where(ZoneNeed.status == "open")
+    .order_by(ZoneNeed.created_at.desc())
+    .limit(100),
+    "zone_needs_for_zone": lambda: select(ZoneNeed).where(
+        ZoneNeed.safe_zone_id == 42, ZoneNeed.status == "open"
+    ),
+    "missing_persons_active": lambda: select(MissingPerson)
+    .where(MissingPerson.status == "active")
+    .order_by(MissingPerson.created_at.desc())
+    .limit(50),
+    "nearest_depot_dwithin": lambda: select(
+        Warehouse.id, func.ST_Distance(_geog(Warehouse.location), _USER_GEOG)
+    ).where(func.ST_DWithin(_geog(Warehouse.location), _USER_GEOG, 10_000.0)),
+}
+
+
+@pytest.mark.parametrize("name", sorted(HOT_QUERIES))
+def test_hot_query_avoids_sequential_scan(seeded, name):
+    assert _seq_scans(HOT_QUERIES[name]()) == []
@@ -0,0 +1,103 @@
+"""Okuma replikası yönlendirmesi — gecikme eşiği, read-your-writes sabitleme ve birincile geri düşme testleri."""
+
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.db import session
+
+
+def _request(cookies=None, headers=None):
+    headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    if cookies:
+        cookie = "; ".join(f"{k}={v}" for k, v in cookies.items())
+        headers.append((b"cookie", cookie.encode()))
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.fixture
+def replica(monkeypatch):
+    opened = []
+
+    class _FakeSession:
+        async def __aenter__(self):
+            opened.append(self)
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(session, "read_engine", object())
+    monkeypatch.setattr(session, "AsyncReadSessionLocal", _FakeSession)
+    monkeypatch.setattr(session, "_replica_lag", 0.2)
+    return opened
+
+
+def test_no_replica_means_primary(monkeypatch):
+    monkeypatch.setattr(session, "read_engine", None)
+    assert session.use_replica() is False
+
+
+def test_replica_used_when_caught_up(replica):
+    assert session.use_replica() is True
+
+
+def test_lagging_or_unmeasured_replica_skipped(replica, monkeypatch):
+    monkeypatch.setattr(session, "_replica_lag", session.REPLICA_MAX_LAG_SECONDS + 1)
+    assert session.use_replica() is False
+    monkeypatch.setattr(session, "_replica_lag", None)
+    assert session.use_replica() is False
+
+
+def test_recent_writer_pinned_to_primary_for_lag_plus_margin(replica):
+    now = 1_000.0
+    window = 0.2 + session.READ_YOUR_WRITES_MARGIN_SECONDS
+    assert session.use_replica(last_write=now - window + 0.1, now=now) is False
+    assert session.use_replica(last_write=now - window - 0.1, now=now) is True
+
+
+async def test_get_read_db_routes_by_cookie(replica):
+    primary = object()
+
+    gen = session.get_read_db(_request(), primary)
+    chosen = await gen.__anext__()
+    assert chosen is not primary and chosen is replica[0]
+    await gen.aclose()
+
+    gen = session.get_read_db(_request({session.LAST_WRITE_COOKIE: f"{time.time():.3f}"}), primary)
+    assert await gen.__anext__() is primary
+    await gen.aclose()
+
+
+async def test_get_read_db_routes_by_echoed_header(replica):
+    primary = object()
+
+    fresh = {session.LAST_WRITE_HEADER: f"{time.time():.3f}"}
+    gen = session.get_read_db(_request(headers=fresh), primary)
+    assert await gen.__anext__() is primary
+    await gen.aclose()
+
+    # Bozuk ya da eski işaret replikayı engellemez
+    stale = {session.LAST_WRITE_HEADER: f"{time.time() - 3600:.3f}"}
+    for headers in (stale, {session.LAST_WRITE_HEADER: "x"}):
+        gen = session.get_read_db(_request(headers=headers), primary)
+        assert await gen.__anext__() is not primary
+        await gen.aclose()
+
+
+async def test_get_read_db_falls_back_without_replica(monkeypatch):
+    monkeypatch.setattr(session, "read_engine", None)
+    primary = object()
+    gen = session.get_read_db(_request(), primary)
+    assert await gen.__anext__() is primary
+    await gen.aclose()
+
+
+@pytest.mark.parametrize("module, endpoint", [("warehouses", "list_warehouses"), ("safe_zones", "list_safe_zones")])
+def test_cached_lists_load_from_primary(module, endpoint):
+    import importlib
+    import inspect
+
+    handler = getattr(importlib.import_module(f"app.api.{module}"), endpoint)
+    assert inspect.signature(handler).parameters["db"].default.dependency is session.get_db
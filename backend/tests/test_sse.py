@@ -0,0 +1,443 @@
+"""SSE — yayın veriyolu (yerel / Redis), konu filtreli abonelik ve Last-Event-ID yeniden oynatma testleri."""
+
+import asyncio
+import json
+
+import pytest
+
+from app.api import sse
+from app.api.observability import collector
+from app.core import sse_bus
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zadd(self, key, mapping):
+        self.redis.buffers.setdefault(key, {}).update(mapping)
+
+    def zremrangebyrank(self, key, start, stop):
+        pass
+
+    def sadd(self, key, member):
+        self.redis.indexes.setdefault(key, set()).add(member)
+
+    def publish(self, channel, message):
+        self.redis.published.append((channel, message))
+
+    async def execute(self):
+        return []
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.published = []
+        self.buffers = {}
+        self.indexes = {}
+        self.counter = 100
+
+    def pipeline(self, transaction=False):
+        return _FakePipeline(self)
+
+    async def incr(self, key):
+        self.counter += 1
+        return self.counter
+
+
+@pytest.fixture(autouse=True)
+def _reset_replay_buffers():
+    sse_bus._local_buffers.clear()
+    sse_bus._local_families.clear()
+    yield
+    sse_bus._local_buffers.clear()
+    sse_bus._local_families.clear()
+
+
+@pytest.fixture(autouse=True)
+def _unbatched_inventory_updates(monkeypatch):
+    # Toplama penceresini ayrıca test eden testler dışında olaylar hemen gitsin
+    monkeypatch.setattr(sse.inventory_updates, "window", 0)
+
+
+def _decode(frame):
+    return json.loads(frame.decode().split("data: ", 1)[1])
+
+
+def _event(item):
+    _, frame = item
+    return _decode(frame)
+
+
+@pytest.fixture
+def queue():
+    q = sse._register()
+    yield q
+    sse._unregister(q)
+
+
+@pytest.fixture
+def redis_bus(monkeypatch):
+    redis = _FakeRedis()
+    monkeypatch.setattr(sse_bus, "_redis", redis)
+    return redis
+
+
+async def test_broadcast_reaches_local_clients_in_process(queue):
+    await sse.broadcast_announcement({"id": 1, "title": "Tatbikat"})
+    event = _event(queue.get_nowait())
+    assert event == {"type": "announcement", "data": {"id": 1, "title": "Tatbikat"}}
+    assert sse_bus.backend() == "memory"
+
+
+async def test_redis_backend_delivers_locally_and_publishes(queue, redis_bus):
+    await sse.broadcast_low_stock_alert({"warehouse_id": 3})
+
+    assert _event(queue.get_nowait())["type"] == "low_stock_alert"
+    [(channel, message)] = redis_bus.published
+    assert channel == sse_bus.CHANNEL
+    assert message.startswith(sse_bus._INSTANCE_ID)
+    route, _, payload = message[len(sse_bus._INSTANCE_ID):].partition("\n")
+    assert route == "101|low_stock_alert|3"
+    assert json.loads(payload)["data"] == {"warehouse_id": 3}
+    [buffered] = redis_bus.buffers[sse_bus._REPLAY_PREFIX + "low_stock_alert|3"].items()
+    assert buffered == (f"{route}\n{payload}", 101)
+    assert redis_bus.indexes == {sse_bus._REPLAY_INDEX_PREFIX + "low_stock_alert": {"low_stock_alert|3"}}
+
+
+async def test_redis_id_failure_publishes_without_id_or_replay(queue, redis_bus, monkeypatch):
+    async def _broken_incr(key):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(redis_bus, "incr", _broken_incr)
+    await sse.broadcast_announcement({"id": 1})
+
+    # Yerel sayaca (ms-epoch) geçilmez: olay id'siz gider, tampona yazılmaz
+    event_id, frame = queue.get_nowait()
+    assert event_id is None
+    assert frame.startswith(b"data: ")
+    [(_, message)] = redis_bus.published
+    assert message[len(sse_bus._INSTANCE_ID):].startswith("|announcement|*\n")
+    assert redis_bus.buffers == {}
+
+
+def test_subscriber_relays_other_workers_events_only(queue):
+    payload = json.dumps({"type": "chat_message", "data": {"room": "ops"}})
+    message = f"42|chat_message|ops\n{payload}"
+
+    sse_bus._on_message(sse_bus._INSTANCE_ID + message)
+    assert queue.empty()
+
+    sse_bus._on_message("f" * len(sse_bus._INSTANCE_ID) + message)
+    assert queue.get_nowait() == (42, f"id: 42\ndata: {payload}\n\n".encode())
+
+
+# ── konu filtreleri ───────────────────────────────────────────────────────────
+
+@pytest.fixture
+def register():
+    queues = []
+
+    def _make(**filters):
+        q = sse._register(**filters)
+        queues.append(q)
+        return q
+
+    yield _make
+    for q in queues:
+        sse._unregister(q)
+
+
+def _types(q):
+    out = []
+    while not q.empty():
+        out.append(_event(q.get_nowait())["type"])
+    return out
+
+
+async def test_type_filter_limits_event_types(register):
+    announcements = register(types=["announcement"])
+    firehose = register()
+
+    await sse.broadcast_announcement({"id": 1})
+    await sse.broadcast_chat_message({"room": "ops", "body": "x"})
+
+    assert _types(announcements) == ["announcement"]
+    assert _types(firehose) == ["announcement", "chat_message"]
+
+
+async def test_room_filter_scopes_chat_but_not_announcements(register):
+    ops = register(rooms=["ops"])
+    general_chat = register(types=["chat_message"], rooms=["general"])
+
+    await sse.broadcast_chat_message({"room": "ops", "body": "x"})
+    await sse.broadcast_presence_update({"room": "general", "online": []})
+    await sse.broadcast_announcement({"id": 1})
+
+    assert _types(ops) == ["chat_message", "announcement"]
+    assert _types(general_chat) == []
+
+
+async def test_warehouse_filter_scopes_inventory_events(register):
+    depot = register(types=["inventory_update", "low_stock_alert"], warehouses=["7"])
+
+    await sse.broadcast_inventory_update({"warehouse_id": 7, "quantity": 1})
+    await sse.broadcast_inventory_update({"warehouse_id": 8, "quantity": 1})
+    await sse.broadcast_low_stock_alert({"warehouse_id": 7})
+
+    assert _types(depot) == ["inventory_update", "low_stock_alert"]
+
+
+def test_unregister_cleans_routing_index():
+    q = sse._register(types=["chat_message"], rooms=["ops"])
+    assert ("chat_message", "ops") in sse._routes
+    sse._unregister(q)
+    assert ("chat_message", "ops") not in sse._routes
+    assert q not in sse._clients
+
+
+def test_unknown_event_type_rejected(client):
+    res = client.get("/api/v1/sse/announcements?types=announcement,bogus")
+    assert res.status_code == 400
+
+
+# ── Last-Event-ID yeniden oynatma ─────────────────────────────────────────────
+
+async def _collect(stream, n):
+    return [await stream.__anext__() for _ in range(n)]
+
+
+async def test_replay_returns_only_events_after_last_id(register):
+    q = register()
+    await sse.broadcast_announcement({"id": 1})
+    seen, _ = q.get_nowait()
+    await sse.broadcast_announcement({"id": 2})
+    await sse.broadcast_chat_message({"room": "ops", "body": "x"})
+
+    frames = await sse._replay_frames(q, seen)
+    assert [_decode(f)["data"] for _, f in frames] == [
+        {"id": 2},
+        {"room": "ops", "body": "x"},
+    ]
+    assert [event_id for event_id, _ in frames] == sorted(event_id for event_id, _ in frames)
+    assert all(event_id > seen for event_id, _ in frames)
+
+
+async def test_replay_respects_topic_filters(register):
+    ops = register(types=["chat_message"], rooms=["ops"])
+    await sse.broadcast_chat_message({"room": "general", "body": "a"})
+    await sse.broadcast_chat_message({"room": "ops", "body": "b"})
+    await sse.broadcast_announcement({"id": 1})
+
+    frames = await sse._replay_frames(ops, 0)
+    assert [_decode(f)["data"]["body"] for _, f in frames] == ["b"]
+
+
+async def test_replay_gap_sends_resync_hint(register, monkeypatch):
+    monkeypatch.setattr(sse_bus, "REPLAY_BUFFER_SIZE", 2)
+    q = register(types=["announcement"])
+    await sse.broadcast_announcement({"id": 1})
+    first, _ = q.get_nowait()
+    for i in range(2, 5):
+        await sse.broadcast_announcement({"id": i})
+
+    assert len(sse_bus._local_buffers["announcement|*"]) == 2
+    frames = await sse._replay_frames(q, first)
+    events = [_decode(f) for _, f in frames]
+    assert events[0]["type"] == "resync"
+    assert [e["data"]["id"] for e in events[1:]] == [3, 4]
+
+
+async def test_busy_room_does_not_evict_other_rooms_history(register, monkeypatch):
+    monkeypatch.setattr(sse_bus, "REPLAY_BUFFER_SIZE", 2)
+    ops = register(types=["chat_message"], rooms=["ops"])
+    everyone = register(types=["chat_message"])
+    await sse.broadcast_chat_message({"room": "ops", "body": "kept"})
+    for i in range(5):
+        await sse.broadcast_chat_message({"room": "general", "body": str(i)})
+
+    frames = await sse._replay_frames(ops, 0)
+    assert [_decode(f)["data"]["body"] for _, f in frames] == ["kept"]
+
+    # Kapsamsız abone türün tüm konularını alır; taşan "general" için resync ipucu
+    events = [_decode(f) for _, f in await sse._replay_frames(everyone, 0)]
+    assert events[0]["type"] == "resync"
+    assert [e["data"]["body"] for e in events[1:]] == ["kept", "3", "4"]
+
+
+async def test_stream_skips_live_events_already_replayed(register):
+    q = register()
+    await sse.broadcast_announcement({"id": 1})
+    await sse.broadcast_announcement({"id": 2})
+    replay = await sse._replay_frames(q, 0)
+
+    stream = sse._event_stream(q, replay)
+    frames = await _collect(stream, 2)
+    await sse.broadcast_announcement({"id": 3})
+    [live] = await _collect(stream, 1)
+    await stream.aclose()
+
+    assert frames == [frame for _, frame in replay]
+    assert _decode(live)["data"] == {"id": 3}
+
+
+# ── yavaş tüketici politikaları ───────────────────────────────────────────────
+
+@pytest.fixture
+def small_queues(monkeypatch):
+    monkeypatch.setattr(sse, "QUEUE_SIZE", 2)
+    return monkeypatch
+
+
+def _drain(q):
+    out = []
+    while not q.empty():
+        out.append(_event(q.get_nowait()))
+    return out
+
+
+async def test_drop_oldest_keeps_newest_events(register, small_queues):
+    small_queues.setitem(sse._policies, "chat_message", "drop_oldest")
+    q = register(types=["chat_message"])
+    for body in ("a", "b", "c"):
+        await sse.broadcast_chat_message({"room": "ops", "body": body})
+
+    assert [e["data"]["body"] for e in _drain(q)] == ["b", "c"]
+    assert collector._sse_drops[("chat_message", "drop_oldest")] >= 1
+    assert q in sse._clients
+
+
+async def test_coalesce_replaces_superseded_inventory_update(register, small_queues):
+    q = register(types=["inventory_update"])
+    await sse.broadcast_inventory_update({"warehouse_id": 1, "item_id": 5, "quantity": 10})
+    await sse.broadcast_inventory_update({"warehouse_id": 1, "item_id": 6, "quantity": 3})
+    await sse.broadcast_inventory_update({"warehouse_id": 1, "item_id": 5, "quantity": 7})
+
+    events = _drain(q)
+    assert [
+        [(i["item_id"], i["quantity"]) for i in e["data"]["items"]] for e in events
+    ] == [[(6, 3)], [(5, 7)]]
+    assert q.coalesce_keys == {}
+    assert q in sse._clients
+
+
+async def test_coalesce_merges_deltas_with_different_item_sets(register, small_queues):
+    q = register(types=["inventory_update"])
+    await sse.broadcast_inventory_update({"warehouse_id": 1, "item_id": 5, "quantity": 10})
+    await sse.broadcast_inventory_update({"warehouse_id": 2, "item_id": 9, "quantity": 1})
+    await sse.broadcast_inventory_update({"warehouse_id": 1, "item_id": 6, "quantity": 3})
+    await sse.broadcast_inventory_update({"warehouse_id": 1, "item_id": 5, "quantity": 7})
+
+    events = _drain(q)
+    assert [
+        (e["data"]["warehouse_id"], [(i["item_id"], i["quantity"]) for i in e["data"]["items"]])
+        for e in events
+    ] == [(2, [(9, 1)]), (1, [(5, 7), (6, 3)])]
+    assert q in sse._clients
+
+
+async def test_overflow_without_replaceable_event_disconnects_with_resync(register, small_queues):
+    q = register(types=["inventory_update"])
+    for warehouse_id in (1, 2, 3):
+        await sse.broadcast_inventory_update({"warehouse_id": warehouse_id, "item_id": 1})
+
+    assert q not in sse._clients
+    before = collector._sse_evictions["inventory_update"]
+    assert before >= 1
+
+    stream = sse._event_stream(q)
+    frames = [frame async for frame in stream]
+    assert len(frames) == 1
+    assert _decode(frames[0]) == {
+        "type": "resync",
+        "data": {"reason": "slow_consumer"},
+    }
+
+
+def test_queue_gauges_exported(register):
+    q = register()
+    q.put_nowait((1, b"id: 1\ndata: {}\n\n"))
+    text = collector.prometheus_text()
+    assert "# TYPE sse_queue_depth_max gauge" in text
+    assert "sse_queue_depth_max 1" in text
+
+
+# ── ortak heartbeat ───────────────────────────────────────────────────────────
+
+def test_client_state_uses_slots(queue):
+    assert not hasattr(queue, "__dict__")
+
+
+def test_heartbeat_only_reaches_idle_clients(register):
+    idle, busy = register(), register()
+    busy.put_nowait((1, b"id: 1\ndata: {}\n\n"))
+
+    for client in (idle, busy):
+        client.heartbeat(b": heartbeat\n\n")
+    assert idle.get_nowait() == (None, b": heartbeat\n\n")
+    assert busy.qsize() == 1
+
+    busy.get_nowait()
+    busy.heartbeat(b": heartbeat\n\n")  # bir tik boyunca sessiz kaldı
+    assert busy.get_nowait() == (None, b": heartbeat\n\n")
+
+
+async def test_shared_ticker_wakes_waiting_streams(register, monkeypatch):
+    monkeypatch.setattr(sse, "HEARTBEAT_SECONDS", 0.01)
+    streams = [sse._event_stream(register()) for _ in range(3)]
+    sse._ensure_heartbeat()
+    task = sse._heartbeat_task
+
+    frames = await asyncio.gather(*(s.__anext__() for s in streams))
+    assert all(frame.startswith(b": heartbeat") for frame in frames)
+    for s in streams:
+        await s.aclose()
+
+    await asyncio.wait_for(task, 1)
+    assert sse._heartbeat_task is None
+
+
+# ── stok güncellemesi toplama ─────────────────────────────────────────────────
+
+@pytest.fixture
+def batching(monkeypatch):
+    monkeypatch.setattr(sse.inventory_updates, "window", 0.05)
+    yield
+    sse.inventory_updates._pending.clear()
+    sse.inventory_updates._timers.clear()
+
+
+async def test_inventory_changes_batched_per_warehouse(register, batching):
+    q = register(types=["inventory_update"])
+    for item_id, quantity in ((1, 10), (2, 5), (1, 8)):
+        await sse.broadcast_inventory_update(
+            {"warehouse_id": 7, "warehouse_name": "Merkez", "item_id": item_id, "quantity": quantity}
+        )
+    await sse.broadcast_inventory_update({"warehouse_id": 8, "item_id": 1, "quantity": 3})
+    assert q.empty()
+
+    await asyncio.sleep(0.1)
+    events = {e["data"]["warehouse_id"]: e["data"] for e in _drain(q)}
+    assert events[7] == {
+        "warehouse_id": 7,
+        "warehouse_name": "Merkez",
+        "items": [{"item_id": 1, "quantity": 8}, {"item_id": 2, "quantity": 5}],
+    }
+    assert events[8]["items"] == [{"item_id": 1, "quantity": 3}]
+    assert sse.inventory_updates.pending() == 0
+
+
+async def test_low_stock_alert_not_delayed_by_batching(register, batching):
+    q = register(types=["inventory_update", "low_stock_alert"])
+    await sse.broadcast_low_stock_alert({"warehouse_id": 7, "item_id": 1})
+    await sse.broadcast_inventory_update({"warehouse_id": 7, "item_id": 1, "quantity": 2})
+
+    assert _types(q) == ["low_stock_alert"]
+    await sse.inventory_updates.flush()
+    assert _types(q) == ["inventory_update"]
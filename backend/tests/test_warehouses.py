@@ -1,3 +1,6 @@
+from app.db.instrumentation import query_budget
+
+
 def test_create_warehouse_success(client):
     payload = {
         "name": "Merkez Depo",
@@ -95,3 +98,19 @@ def test_update_warehouse_status(client):
     body = update_response.json()
     assert body["status"] == "success"
     assert body["data"]["status"] == "inactive"
+
+
+def test_warehouse_inventory_query_count_independent_of_item_count(client, data_factory):
+    warehouse = data_factory["create_warehouse"](name="Budget Depot", lon=29.1, lat=41.1, capacity=500)
+    for index in range(6):
+        item = data_factory["create_item"](name=f"budget-item-{index}", sku=f"BUD-{index:03d}")
+        data_factory["create_warehouse_inventory"](
+            warehouse_id=warehouse["id"], item_id=item["id"], quantity=index + 1
+        )
+
+    # depo + tek JOIN sorgusu; kalem başına sorgu (N+1) bütçeyi aşar
+    with query_budget(2):
+        response = client.get(f"/api/v1/warehouses/{warehouse['id']}/inventory")
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]["items"]) == 6
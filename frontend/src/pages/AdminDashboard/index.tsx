@@ -172,6 +172,38 @@ function SectionCard({
   );
 }
 
+// Keyset-paginated admin lists: shown while the backend reports another page
+function LoadMoreButton({
+  cursor,
+  busy,
+  onClick,
+}: {
+  cursor: string | null;
+  busy: boolean;
+  onClick: () => void;
+}) {
+  if (!cursor) return null;
+  return (
+    <div style={{ textAlign: "center", marginTop: 12 }}>
+      <button
+        onClick={onClick}
+        disabled={busy}
+        style={{
+          background: "#fff",
+          border: "1px solid #c5cae9",
+          color: "#1a237e",
+          borderRadius: 6,
+          padding: "6px 16px",
+          cursor: "pointer",
+          fontWeight: 600,
+        }}
+      >
+        {busy ? "Yükleniyor..." : "Daha fazla yükle"}
+      </button>
+    </div>
+  );
+}
+
 interface Props {
   onNavigateToMap?: () => void;
 }
@@ -215,19 +247,27 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
   const [zoneSaveMsg, setZoneSaveMsg] = useState("");
 
   const [emergencies, setEmergencies] = useState<EmergencyAdminRecord[]>([]);
+  const [emergencyCursor, setEmergencyCursor] = useState<string | null>(null);
   const [emergencyLoading, setEmergencyLoading] = useState(false);
   const [emergencyFilter, setEmergencyFilter] = useState("");
   const [clearingEmergencies, setClearingEmergencies] = useState(false);
 
   const [volunteers, setVolunteers] = useState<VolunteerApplicationAdmin[]>([]);
+  const [volunteerCursor, setVolunteerCursor] = useState<string | null>(null);
   const [volunteerLoading, setVolunteerLoading] = useState(false);
   const [volunteerFilter, setVolunteerFilter] = useState("");
 
   const [shelterOffers, setShelterOffers] = useState<ShelterOfferAdmin[]>([]);
+  const [shelterCursor, setShelterCursor] = useState<string | null>(null);
   const [shelterLoading, setShelterLoading] = useState(false);
   const [shelterFilter, setShelterFilter] = useState("");
 
   const [announcements, setAnnouncements] = useState<AnnouncementAdmin[]>([]);
+  const [announcementCursor, setAnnouncementCursor] = useState<string | null>(null);
+  // Which paginated list is fetching its next page
+  const [loadingMore, setLoadingMore] = useState<"emergency" | "volunteers" | "shelters" | "announcements" | null>(
+    null
+  );
   const [announcementsLoading, setAnnouncementsLoading] = useState(false);
   const [announcementStatusFilter, setAnnouncementStatusFilter] = useState("");
   const [announcementKategoriFilter, setAnnouncementKategoriFilter] = useState("");
@@ -273,7 +313,8 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
       setSafeZoneCount(safeZonesData.length);
       setInventoryItems(items);
       setCriticalStock(critical);
-      setMovementHistory(movements);
+      // The history panel shows the newest 30 rows; the first page covers it
+      setMovementHistory(movements.items);
     } finally {
       setLoading(false);
     }
@@ -508,12 +549,25 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
   const loadEmergencies = useCallback(async () => {
     setEmergencyLoading(true);
     try {
-      setEmergencies(await geoSafeAPI.fetchEmergenciesAdmin(emergencyFilter || undefined));
+      const page = await geoSafeAPI.fetchEmergenciesAdmin(emergencyFilter || undefined);
+      setEmergencies(page.items);
+      setEmergencyCursor(page.nextCursor);
     } finally {
       setEmergencyLoading(false);
     }
   }, [emergencyFilter]);
 
+  const loadMoreEmergencies = async () => {
+    setLoadingMore("emergency");
+    try {
+      const page = await geoSafeAPI.fetchEmergenciesAdmin(emergencyFilter || undefined, emergencyCursor);
+      setEmergencies((prev) => [...prev, ...page.items]);
+      setEmergencyCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   useEffect(() => {
     if (activeTab === "emergency") {
       loadEmergencies();
@@ -538,12 +592,25 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
   const loadVolunteers = useCallback(async () => {
     setVolunteerLoading(true);
     try {
-      setVolunteers(await geoSafeAPI.fetchVolunteerApplicationsAdmin(volunteerFilter || undefined));
+      const page = await geoSafeAPI.fetchVolunteerApplicationsAdmin(volunteerFilter || undefined);
+      setVolunteers(page.items);
+      setVolunteerCursor(page.nextCursor);
     } finally {
       setVolunteerLoading(false);
     }
   }, [volunteerFilter]);
 
+  const loadMoreVolunteers = async () => {
+    setLoadingMore("volunteers");
+    try {
+      const page = await geoSafeAPI.fetchVolunteerApplicationsAdmin(volunteerFilter || undefined, volunteerCursor);
+      setVolunteers((prev) => [...prev, ...page.items]);
+      setVolunteerCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   useEffect(() => {
     if (activeTab === "volunteers") {
       loadVolunteers();
@@ -558,12 +625,25 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
   const loadShelterOffers = useCallback(async () => {
     setShelterLoading(true);
     try {
-      setShelterOffers(await geoSafeAPI.fetchShelterOffersAdmin(shelterFilter || undefined));
+      const page = await geoSafeAPI.fetchShelterOffersAdmin(shelterFilter || undefined);
+      setShelterOffers(page.items);
+      setShelterCursor(page.nextCursor);
     } finally {
       setShelterLoading(false);
     }
   }, [shelterFilter]);
 
+  const loadMoreShelterOffers = async () => {
+    setLoadingMore("shelters");
+    try {
+      const page = await geoSafeAPI.fetchShelterOffersAdmin(shelterFilter || undefined, shelterCursor);
+      setShelterOffers((prev) => [...prev, ...page.items]);
+      setShelterCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   useEffect(() => {
     if (activeTab === "shelters") {
       loadShelterOffers();
@@ -578,17 +658,32 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
   const loadAnnouncements = useCallback(async () => {
     setAnnouncementsLoading(true);
     try {
-      setAnnouncements(
-        await geoSafeAPI.fetchAnnouncementsAdmin(
-          announcementStatusFilter || undefined,
-          announcementKategoriFilter || undefined
-        )
+      const page = await geoSafeAPI.fetchAnnouncementsAdmin(
+        announcementStatusFilter || undefined,
+        announcementKategoriFilter || undefined
       );
+      setAnnouncements(page.items);
+      setAnnouncementCursor(page.nextCursor);
     } finally {
       setAnnouncementsLoading(false);
     }
   }, [announcementStatusFilter, announcementKategoriFilter]);
 
+  const loadMoreAnnouncements = async () => {
+    setLoadingMore("announcements");
+    try {
+      const page = await geoSafeAPI.fetchAnnouncementsAdmin(
+        announcementStatusFilter || undefined,
+        announcementKategoriFilter || undefined,
+        announcementCursor
+      );
+      setAnnouncements((prev) => [...prev, ...page.items]);
+      setAnnouncementCursor(page.nextCursor);
+    } finally {
+      setLoadingMore(null);
+    }
+  };
+
   useEffect(() => {
     if (activeTab === "announcements") {
       loadAnnouncements();
@@ -1376,6 +1471,11 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
                 </table>
               </div>
             )}
+            <LoadMoreButton
+              cursor={emergencyCursor}
+              busy={loadingMore === "emergency"}
+              onClick={() => void loadMoreEmergencies()}
+            />
           </SectionCard>
         )}
 
@@ -1443,6 +1543,11 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
                 </table>
               </div>
             )}
+            <LoadMoreButton
+              cursor={volunteerCursor}
+              busy={loadingMore === "volunteers"}
+              onClick={() => void loadMoreVolunteers()}
+            />
           </SectionCard>
         )}
 
@@ -1512,6 +1617,11 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
                 </table>
               </div>
             )}
+            <LoadMoreButton
+              cursor={shelterCursor}
+              busy={loadingMore === "shelters"}
+              onClick={() => void loadMoreShelterOffers()}
+            />
           </SectionCard>
         )}
 
@@ -1664,6 +1774,11 @@ export default function AdminDashboard({ onNavigateToMap }: Props) {
                 </table>
               </div>
             )}
+            <LoadMoreButton
+              cursor={announcementCursor}
+              busy={loadingMore === "announcements"}
+              onClick={() => void loadMoreAnnouncements()}
+            />
           </SectionCard>
         )}
 
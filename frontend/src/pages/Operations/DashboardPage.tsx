@@ -89,6 +89,8 @@ export default function OperationsDashboardPage() {
   const [safeZones, setSafeZones] = useState<SafeZone[]>([]);
   const [criticalStock, setCriticalStock] = useState<CriticalStockRecord[]>([]);
   const [emergencies, setEmergencies] = useState<EmergencyAdminRecord[]>([]);
+  // First page only; more "new" reports exist beyond it
+  const [emergenciesCapped, setEmergenciesCapped] = useState(false);
   const [announcements, setAnnouncements] = useState<Announcement[]>(
     cachedAnnouncements?.items.slice(0, 3) ?? []
   );
@@ -108,7 +110,9 @@ export default function OperationsDashboardPage() {
         geoSafeAPI.fetchWarehouses(),
         geoSafeAPI.fetchSafeZones(),
         role === "admin" ? geoSafeAPI.fetchCriticalStockAdmin() : Promise.resolve([]),
-        role === "admin" ? geoSafeAPI.fetchEmergenciesAdmin("new") : Promise.resolve([]),
+        role === "admin"
+          ? geoSafeAPI.fetchEmergenciesAdmin("new")
+          : Promise.resolve({ items: [], nextCursor: null }),
         geoSafeAPI.fetchAnnouncements(),
         geoSafeAPI.fetchKPISummary(),
       ]);
@@ -127,8 +131,10 @@ export default function OperationsDashboardPage() {
       if (stockResult.status === "fulfilled") setCriticalStock(stockResult.value);
       else if (role === "admin") nextErrors.push("Kritik stok verisi alınamadı.");
 
-      if (emergencyResult.status === "fulfilled") setEmergencies(emergencyResult.value);
-      else if (role === "admin") nextErrors.push("Acil bildirimler alınamadı.");
+      if (emergencyResult.status === "fulfilled") {
+        setEmergencies(emergencyResult.value.items);
+        setEmergenciesCapped(emergencyResult.value.nextCursor !== null);
+      } else if (role === "admin") nextErrors.push("Acil bildirimler alınamadı.");
 
       if (announcementResult.status === "fulfilled") {
         saveAnnouncementCache(announcementResult.value);
@@ -195,7 +201,7 @@ export default function OperationsDashboardPage() {
       ? [
           {
             label: "Yeni acil bildirim var",
-            detail: `${emergencies.length} kayıt müdahale bekliyor.`,
+            detail: `${emergencies.length}${emergenciesCapped ? "+" : ""} kayıt müdahale bekliyor.`,
             action: "Admin kuyruğunu aç",
             path: "/admin",
             tone: "critical" as const,
@@ -278,7 +284,7 @@ export default function OperationsDashboardPage() {
       <section className="situation-metrics decision-metrics" aria-label="Ana operasyon metrikleri">
         <StatusCard
           label="Acil Bildirim"
-          value={loading ? "..." : emergencies.length}
+          value={loading ? "..." : `${emergencies.length}${emergenciesCapped ? "+" : ""}`}
           detail={role === "admin" ? "Yeni kayıt kuyruğu" : "Admin görünümü"}
           tone={emergencies.length ? "critical" : "neutral"}
         />
@@ -10,6 +10,16 @@ const RECENTLY_UPDATED_TTL = 8_000;
 
 type RecentlyUpdatedKey = `${number}-${number}`;
 
+// Batched inventory_update payload: the latest state of each item changed in the window
+type InventoryDelta = {
+  warehouse_id: number;
+  warehouse_name: string;
+  items: {
+    item_id: number; item_name: string; item_sku: string; item_unit: string;
+    quantity: number; threshold: number; is_critical: boolean;
+  }[];
+};
+
 export default function OperationsLogisticsPage() {
   const { role } = useAuth();
   const [warehouses, setWarehouses] = useState<Warehouse[]>([]);
@@ -46,59 +56,59 @@ export default function OperationsLogisticsPage() {
     };
   }, [role]);
 
-  // Handle live inventory_update events
+  // Handle live inventory_update events — one delta per warehouse listing the changed items
   useEffect(() => {
     if (!lastSSEEvent || lastSSEEvent.type !== "inventory_update") return;
 
-    const { warehouse_id, item_id, quantity, threshold, is_critical,
-            item_name, item_sku, item_unit, warehouse_name } = lastSSEEvent.data as {
-      warehouse_id: number; item_id: number; quantity: number; threshold: number;
-      is_critical: boolean; item_name: string; item_sku: string;
-      item_unit: string; warehouse_name: string;
-    };
-
-    const key: RecentlyUpdatedKey = `${warehouse_id}-${item_id}`;
+    const { warehouse_id, warehouse_name, items } = lastSSEEvent.data as InventoryDelta;
+    const changed = items.map((item) => ({ ...item, key: `${warehouse_id}-${item.item_id}` as RecentlyUpdatedKey }));
 
-    // Update or insert the stock row
+    // Update or insert the stock rows
     setCriticalStock((prev) => {
-      const existing = prev.findIndex(
-        (r) => r.warehouse_id === warehouse_id && r.item_id === item_id
-      );
-      const updated: CriticalStockRecord = {
-        warehouse_id, item_id, item_name, item_sku, item_unit,
-        warehouse_name, quantity, threshold,
-        recommended_action: is_critical
-          ? `${warehouse_name} deposunda ${item_name} için ikmal planına bakın.`
-          : "",
-      };
-      if (existing !== -1) {
-        const next = [...prev];
-        if (is_critical) {
-          next[existing] = updated;
-        } else {
-          next.splice(existing, 1);
+      const next = [...prev];
+      for (const { item_id, item_name, item_sku, item_unit, quantity, threshold, is_critical } of changed) {
+        const existing = next.findIndex(
+          (r) => r.warehouse_id === warehouse_id && r.item_id === item_id
+        );
+        const updated: CriticalStockRecord = {
+          warehouse_id, item_id, item_name, item_sku, item_unit,
+          warehouse_name, quantity, threshold,
+          recommended_action: is_critical
+            ? `${warehouse_name} deposunda ${item_name} için ikmal planına bakın.`
+            : "",
+        };
+        if (existing !== -1) {
+          if (is_critical) {
+            next[existing] = updated;
+          } else {
+            next.splice(existing, 1);
+          }
+        } else if (is_critical) {
+          next.push(updated);
         }
-        return next;
       }
-      return is_critical ? [...prev, updated] : prev;
+      return next;
     });
 
     // Mark as recently updated for visual highlight
-    setRecentlyUpdated((prev) => new Set([...prev, key]));
-    setLastUpdatedAt((prev) => new Map([...prev, [key, new Date()]]));
+    const now = new Date();
+    setRecentlyUpdated((prev) => new Set([...prev, ...changed.map(({ key }) => key)]));
+    setLastUpdatedAt((prev) => new Map([...prev, ...changed.map(({ key }) => [key, now] as const)]));
 
     // Clear highlight after TTL
-    const existing = timersRef.current.get(key);
-    if (existing) clearTimeout(existing);
-    const timer = setTimeout(() => {
-      setRecentlyUpdated((prev) => {
-        const next = new Set(prev);
-        next.delete(key);
-        return next;
-      });
-      timersRef.current.delete(key);
-    }, RECENTLY_UPDATED_TTL);
-    timersRef.current.set(key, timer);
+    for (const { key } of changed) {
+      const existing = timersRef.current.get(key);
+      if (existing) clearTimeout(existing);
+      const timer = setTimeout(() => {
+        setRecentlyUpdated((prev) => {
+          const next = new Set(prev);
+          next.delete(key);
+          return next;
+        });
+        timersRef.current.delete(key);
+      }, RECENTLY_UPDATED_TTL);
+      timersRef.current.set(key, timer);
+    }
   }, [lastSSEEvent]);
 
   // Cleanup timers on unmount
@@ -176,7 +186,7 @@ export default function OperationsLogisticsPage() {
           {/* aria-live so screen readers announce incoming changes */}
           <div aria-live="polite" aria-atomic="false" className="sr-only" id="inventory-live-region">
             {lastSSEEvent?.type === "inventory_update"
-              ? `Stok güncellendi: ${(lastSSEEvent.data as { item_name: string }).item_name}`
+              ? `Stok güncellendi: ${(lastSSEEvent.data as InventoryDelta).items.map((i) => i.item_name).join(", ")}`
               : ""}
           </div>
 
@@ -116,10 +116,11 @@ export default function OperationsLayout() {
     }
 
     let mounted = true;
+    // Count from the KPI summary: the admin list is paginated and would cap the badge
     geoSafeAPI
-      .fetchEmergenciesAdmin("new")
-      .then((items) => {
-        if (mounted) setEmergencyCount(items.length);
+      .fetchKPISummary()
+      .then((summary) => {
+        if (mounted) setEmergencyCount(summary.emergencies.new);
       })
       .catch(() => {
         if (mounted) setEmergencyCount(0);
@@ -50,6 +50,9 @@ export default function TasksPage() {
 
   const [tab, setTab] = useState<Tab>("open");
   const [tasks, setTasks] = useState<VolunteerTask[]>([]);
+  // Only the coordinator "all" list is paginated (X-Next-Cursor)
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [actionMsg, setActionMsg] = useState("");
@@ -66,14 +69,18 @@ export default function TasksPage() {
     setError("");
     try {
       let data: VolunteerTask[];
+      let cursor: string | null = null;
       if (tab === "all" && isCoordinator) {
-        data = await geoSafeAPI.fetchVolunteerTasksAdmin();
+        const page = await geoSafeAPI.fetchVolunteerTasksAdmin();
+        data = page.items;
+        cursor = page.nextCursor;
       } else if (tab === "my") {
         data = await geoSafeAPI.fetchMyVolunteerTasks();
       } else {
         data = await geoSafeAPI.fetchOpenVolunteerTasks();
       }
       setTasks(data);
+      setNextCursor(cursor);
     } catch {
       setError("Görevler yüklenemedi.");
     } finally {
@@ -83,6 +90,20 @@ export default function TasksPage() {
 
   useEffect(() => { void load(); }, [load]);
 
+  const loadMore = async () => {
+    if (!nextCursor) return;
+    setLoadingMore(true);
+    try {
+      const page = await geoSafeAPI.fetchVolunteerTasksAdmin(undefined, undefined, nextCursor);
+      setTasks((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch {
+      setError("Görevler yüklenemedi.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const flash = (msg: string) => {
     setActionMsg(msg);
     setTimeout(() => setActionMsg(""), 3000);
@@ -153,7 +174,7 @@ export default function TasksPage() {
 
   return (
     <section className="ops-panel">
-      <SectionHeader eyebrow="Koordinasyon" title="Görev Panosu" meta={`${tasks.length} görev`} />
+      <SectionHeader eyebrow="Koordinasyon" title="Görev Panosu" meta={`${tasks.length}${nextCursor ? "+" : ""} görev`} />
 
       <div className="ops-announcement-toolbar">
         <div className="ops-tab-row">
@@ -328,6 +349,16 @@ export default function TasksPage() {
               </div>
             </article>
           ))}
+          {nextCursor ? (
+            <button
+              className="ops-button secondary"
+              onClick={() => void loadMore()}
+              type="button"
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Yükleniyor..." : "Daha fazla yükle"}
+            </button>
+          ) : null}
         </div>
       )}
 
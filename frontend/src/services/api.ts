@@ -1,15 +1,17 @@
-import axios, { AxiosInstance } from "axios";
+import axios, { AxiosInstance, AxiosResponse, InternalAxiosRequestConfig } from "axios";
 import {
   Announcement,
   AnnouncementAdmin,
   AnnouncementCreate,
   AnnouncementUpdate,
+  BackgroundJob,
   Channel,
   ChannelMessage,
   ChatMessage,
   ChatMessageCreate,
   ChatPresence,
   CriticalStockRecord,
+  CursorPage,
   GeofenceSubscription,
   GeofenceSubscriptionUpdate,
   EmergencyAdminRecord,
@@ -92,6 +94,31 @@ export const API_DIAGNOSTICS = {
 const TOKEN_KEY = "geosafe_token";
 const AUTH_EXPIRED_EVENT = "geosafe-auth-expired";
 const AUTH_NOTICE_KEY = "geosafe_auth_notice";
+// Read-your-writes: the backend stamps successful writes with X-Last-Write;
+// echoing it keeps this tab's reads on the primary until the replica catches up.
+const LAST_WRITE_KEY = "geosafe_last_write";
+const LAST_WRITE_HEADER = "X-Last-Write";
+// Admin lists are keyset-paginated: one page per call, the next page's cursor
+// comes back in X-Next-Cursor (absent on the last page).
+const NEXT_CURSOR_HEADER = "X-Next-Cursor";
+// Polling a background job (e.g. emergency purge) gives up after this long
+const JOB_WAIT_TIMEOUT_MS = 5 * 60 * 1000;
+
+const echoLastWrite = (config: InternalAxiosRequestConfig): InternalAxiosRequestConfig => {
+  const lastWrite = sessionStorage.getItem(LAST_WRITE_KEY);
+  if (lastWrite) {
+    config.headers[LAST_WRITE_HEADER] = lastWrite;
+  }
+  return config;
+};
+
+const rememberLastWrite = (response: AxiosResponse): AxiosResponse => {
+  const stamp = response.headers[LAST_WRITE_HEADER.toLowerCase()];
+  if (typeof stamp === "string" && stamp) {
+    sessionStorage.setItem(LAST_WRITE_KEY, stamp);
+  }
+  return response;
+};
 
 interface ApiEnvelope<T> {
   status?: string;
@@ -123,6 +150,10 @@ class GeoSafeAPI {
       return config;
     });
 
+    this.client.interceptors.request.use(echoLastWrite);
+    this.publicClient.interceptors.request.use(echoLastWrite);
+    this.publicClient.interceptors.response.use(rememberLastWrite);
+
     // Inject Bearer token from localStorage on every authenticated request
     this.client.interceptors.request.use((config) => {
       const token = localStorage.getItem(TOKEN_KEY);
@@ -134,7 +165,7 @@ class GeoSafeAPI {
     });
 
     this.client.interceptors.response.use(
-      (response) => response,
+      rememberLastWrite,
       (error) => {
         if (axios.isAxiosError(error) && error.response?.status === 401) {
           localStorage.removeItem(TOKEN_KEY);
@@ -152,6 +183,18 @@ class GeoSafeAPI {
     );
   }
 
+  private async fetchPage<T>(
+    url: string,
+    params: Record<string, string> = {},
+    cursor?: string | null
+  ): Promise<CursorPage<T>> {
+    const res = await this.client.get<ApiEnvelope<T[]>>(url, {
+      params: { ...params, ...(cursor ? { cursor } : {}) },
+    });
+    const next = res.headers[NEXT_CURSOR_HEADER.toLowerCase()];
+    return { items: this.unwrap(res.data), nextCursor: typeof next === "string" && next ? next : null };
+  }
+
   private unwrap<T>(payload: T | ApiEnvelope<T>): T {
     if (payload && typeof payload === "object" && "data" in (payload as object)) {
       return (payload as ApiEnvelope<T>).data;
@@ -287,11 +330,8 @@ class GeoSafeAPI {
     return this.unwrap(res.data);
   }
 
-  async fetchInventoryMovementsAdmin(): Promise<InventoryMovementAdminRecord[]> {
-    const res = await this.client.get<ApiEnvelope<InventoryMovementAdminRecord[]>>(
-      "/api/v1/inventory/movements/admin"
-    );
-    return this.unwrap(res.data);
+  async fetchInventoryMovementsAdmin(cursor?: string | null): Promise<CursorPage<InventoryMovementAdminRecord>> {
+    return this.fetchPage<InventoryMovementAdminRecord>("/api/v1/inventory/movements/admin", {}, cursor);
   }
 
   async fetchCriticalStockAdmin(): Promise<CriticalStockRecord[]> {
@@ -371,13 +411,8 @@ class GeoSafeAPI {
     return this.unwrap(res.data);
   }
 
-  async fetchEmergenciesAdmin(status?: string): Promise<EmergencyAdminRecord[]> {
-    const params = status ? { status } : undefined;
-    const res = await this.client.get<ApiEnvelope<EmergencyAdminRecord[]>>(
-      "/api/v1/emergency/admin",
-      { params }
-    );
-    return this.unwrap(res.data);
+  async fetchEmergenciesAdmin(status?: string, cursor?: string | null): Promise<CursorPage<EmergencyAdminRecord>> {
+    return this.fetchPage<EmergencyAdminRecord>("/api/v1/emergency/admin", status ? { status } : {}, cursor);
   }
 
   async updateEmergencyStatus(id: number, status: string): Promise<EmergencyAdminRecord> {
@@ -389,7 +424,30 @@ class GeoSafeAPI {
   }
 
   async clearEmergencies(): Promise<void> {
-    await this.client.delete("/api/v1/emergency");
+    // Toplu temizlik arka plan işi olarak çalışır (202); liste yenilenmeden önce bitmesini bekle
+    const res = await this.client.delete<ApiEnvelope<BackgroundJob>>("/api/v1/emergency");
+    await this.waitForJob(this.unwrap(res.data));
+  }
+
+  private async waitForJob(
+    job: BackgroundJob,
+    intervalMs = 500,
+    timeoutMs = JOB_WAIT_TIMEOUT_MS
+  ): Promise<BackgroundJob> {
+    const deadline = Date.now() + timeoutMs;
+    let current = job;
+    while (current.status === "queued" || current.status === "running") {
+      if (Date.now() >= deadline) {
+        throw new Error("Arka plan işi zamanında bitmedi; işlem sürüyor olabilir, listeyi daha sonra yenileyin");
+      }
+      await new Promise((resolve) => setTimeout(resolve, intervalMs));
+      const res = await this.client.get<ApiEnvelope<BackgroundJob>>(`/api/v1/jobs/${current.job_id}`);
+      current = this.unwrap(res.data);
+    }
+    if (current.status === "failed") {
+      throw new Error(current.error ?? "Arka plan işi başarısız oldu");
+    }
+    return current;
   }
 
   // ── Volunteers ─────────────────────────────────────────────────────
@@ -403,13 +461,8 @@ class GeoSafeAPI {
     return this.unwrap(res.data);
   }
 
-  async fetchVolunteerApplicationsAdmin(status?: string): Promise<VolunteerApplicationAdmin[]> {
-    const params = status ? { status } : undefined;
-    const res = await this.client.get<ApiEnvelope<VolunteerApplicationAdmin[]>>(
-      "/api/v1/volunteers/admin",
-      { params }
-    );
-    return this.unwrap(res.data);
+  async fetchVolunteerApplicationsAdmin(status?: string, cursor?: string | null): Promise<CursorPage<VolunteerApplicationAdmin>> {
+    return this.fetchPage<VolunteerApplicationAdmin>("/api/v1/volunteers/admin", status ? { status } : {}, cursor);
   }
 
   async updateVolunteerStatus(id: number, status: string): Promise<VolunteerApplicationAdmin> {
@@ -429,13 +482,8 @@ class GeoSafeAPI {
     return this.unwrap(res.data);
   }
 
-  async fetchShelterOffersAdmin(status?: string): Promise<ShelterOfferAdmin[]> {
-    const params = status ? { status } : undefined;
-    const res = await this.client.get<ApiEnvelope<ShelterOfferAdmin[]>>(
-      "/api/v1/shelter-offers/admin",
-      { params }
-    );
-    return this.unwrap(res.data);
+  async fetchShelterOffersAdmin(status?: string, cursor?: string | null): Promise<CursorPage<ShelterOfferAdmin>> {
+    return this.fetchPage<ShelterOfferAdmin>("/api/v1/shelter-offers/admin", status ? { status } : {}, cursor);
   }
 
   async updateShelterStatus(id: number, status: string): Promise<ShelterOfferAdmin> {
@@ -456,15 +504,15 @@ class GeoSafeAPI {
     return this.unwrap(res.data);
   }
 
-  async fetchAnnouncementsAdmin(status?: string, kategori?: string): Promise<AnnouncementAdmin[]> {
+  async fetchAnnouncementsAdmin(
+    status?: string,
+    kategori?: string,
+    cursor?: string | null
+  ): Promise<CursorPage<AnnouncementAdmin>> {
     const params: Record<string, string> = {};
     if (status) params.status = status;
     if (kategori) params.kategori = kategori;
-    const res = await this.client.get<ApiEnvelope<AnnouncementAdmin[]>>(
-      "/api/v1/announcements/admin",
-      { params: Object.keys(params).length ? params : undefined }
-    );
-    return this.unwrap(res.data);
+    return this.fetchPage<AnnouncementAdmin>("/api/v1/announcements/admin", params, cursor);
   }
 
   async createAnnouncement(payload: AnnouncementCreate): Promise<AnnouncementAdmin> {
@@ -499,15 +547,15 @@ class GeoSafeAPI {
   }
 
   // ── Volunteer Tasks (GS-050) ─────────────────────────────────────────
-  async fetchVolunteerTasksAdmin(status?: string, urgency?: string): Promise<VolunteerTask[]> {
+  async fetchVolunteerTasksAdmin(
+    status?: string,
+    urgency?: string,
+    cursor?: string | null
+  ): Promise<CursorPage<VolunteerTask>> {
     const params: Record<string, string> = {};
     if (status) params.status = status;
     if (urgency) params.urgency = urgency;
-    const res = await this.client.get<ApiEnvelope<VolunteerTask[]>>(
-      "/api/v1/volunteer-tasks/admin",
-      { params: Object.keys(params).length ? params : undefined }
-    );
-    return this.unwrap(res.data);
+    return this.fetchPage<VolunteerTask>("/api/v1/volunteer-tasks/admin", params, cursor);
   }
 
   async fetchOpenVolunteerTasks(): Promise<VolunteerTask[]> {
@@ -434,6 +434,30 @@ export interface ImportReport {
   errors: ImportError[];
 }
 
+// ── Pagination ────────────────────────────────────────────────────────────────
+
+/** One page of a keyset-paginated admin list; nextCursor is null on the last page. */
+export interface CursorPage<T> {
+  items: T[];
+  nextCursor: string | null;
+}
+
+// ── Background jobs ───────────────────────────────────────────────────────────
+
+export interface BackgroundJob {
+  job_id: number;
+  kind: string;
+  status: "queued" | "running" | "succeeded" | "failed";
+  attempts: number;
+  max_attempts: number;
+  progress: { done: number; total: number };
+  result: Record<string, unknown> | null;
+  error: string | null;
+  created_at: string | null;
+  started_at: string | null;
+  finished_at: string | null;
+}
+
 // ── GS-080: KPI ───────────────────────────────────────────────────────────────
 
 export interface KPISummary {